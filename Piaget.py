@@ -0,0 +1,314 @@
+import argparse
+import asyncio
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from audio_engine import create_audio_engine
+from behaviour import Behaviour, EventBus
+from capture import open_source
+from config import load_config
+from detectors import create_detector
+from lip_sync import JawAnimator
+from perception import Perception, filter_detections, make_controller, search_top_y
+from phrase_cache import PhraseCache, load_phrases
+from pyramid import ImagePyramid
+from roi_search import detect_in_region, full_region
+from servo_driver import create_servo_driver
+from startup import Startup
+
+# ---------- PIAGET RUNTIME ----------
+# Kamera, detection, kontrol, servo, ses ve telemetri tek süreçte, asyncio task'ları olarak:
+#
+#   capture ──frames(1)──▶ detect ──detections(2)──▶ control ──targets(1)──▶ servo
+#                                                        └──greetings(4)──▶ audio ──▶ jaw
+#
+# Bloklayan işler (kamera okuma, detectMultiScale, I2C yazımı) kendi executor thread'lerinde;
+# OpenCV GIL'i bıraktığı için kamera, detection ve servo gerçekten aynı anda çalışır.
+# Kuyruklar sınırlı:
+#   frames / targets: en son kazanır (eski frame / eski hedef işlenmez, atılır)
+#   detections:       dolunca detection bekler (kontrol yetişemiyorsa boşuna detection yok)
+#
+# Ctrl+C / SIGTERM: task'lar durdurulur, kafa merkeze döner, çene kapanır, donanım bırakılır.
+#
+#   python Piaget.py                 # config'teki donanım (piaget.toml / PIAGET_* env)
+#   python Piaget.py --sim           # sentetik kamera + sim servo + sessiz ses
+#   python Piaget.py --sim --duration 20
+
+
+def put_latest(queue, item):
+    """Dolu kuyrukta en eskiyi atıp yenisini koyar. Bir şey atıldıysa True."""
+    dropped = False
+    if queue.full():
+        queue.get_nowait()
+        dropped = True
+    queue.put_nowait(item)
+    return dropped
+
+
+class Runtime:
+    def __init__(self, cfg, sim=False):
+        self.cfg = cfg
+        frame_source = cfg.CAM_INDEX if cfg.FRAME_SOURCE is None else cfg.FRAME_SOURCE
+
+        # Donanım / backend'ler paralel açılır (startup.py)
+        self.startup = Startup()
+        self.neck = {cfg.NECK_YAW_CH: cfg.YAW_CENTER, cfg.NECK_TILT_CH: cfg.TILT_CENTER}
+        self.startup.start("camera", open_source, "synthetic" if sim else frame_source,
+                           cfg.WIDTH, cfg.HEIGHT)
+        self.startup.start("servos", self._init_servos, "sim" if sim else cfg.SERVO_BACKEND)
+        self.startup.start("detector", create_detector, cfg.DETECTOR_BACKEND,
+                           cascade_path=cfg.CASCADE_PATH, model_path=cfg.MODEL_PATH,
+                           scaleFactor=cfg.SCALE_FACTOR,
+                           minNeighbors=cfg.MIN_NEIGHBORS, score_threshold=cfg.YUNET_SCORE_THRESHOLD)
+        audio_files = cfg.AUDIO_FILES
+        if os.path.exists(cfg.GREETING_PHRASES):
+            audio_files = PhraseCache().files(load_phrases(cfg.GREETING_PHRASES), cfg.TTS_BACKEND) or audio_files
+        self.startup.start("audio", create_audio_engine, audio_files, "null" if sim else cfg.AUDIO_BACKEND)
+
+        self.source = self.startup.result("camera")
+        self.servos = self.startup.result("servos")
+        self.detector = self.startup.result("detector")
+        self.audio = self.startup.result("audio")
+        self.startup.close()
+        self.jaw = JawAnimator(self.servos, cfg.JAW_CH, self.audio, closed_angle=cfg.JAW_CLOSED_ANGLE,
+                               open_angle=cfg.JAW_OPEN_ANGLE) if cfg.LIP_SYNC else None
+
+        # Vision + davranış (perception.py: face_track.py ile ortak, CONTROLLER / ESTIMATOR cfg'den)
+        self.pyramid = ImagePyramid(scales=(cfg.COARSE_SCALE,))
+        self.perception = Perception(cfg)
+        self.search_top = search_top_y(cfg)
+        self.bus = EventBus()
+        self.head = Behaviour(cfg, make_controller(cfg), self.bus, cfg.YAW_CENTER, cfg.TILT_CENTER,
+                              speaking=self.audio.is_playing, now=time.time())
+        self.greet_index = 0
+
+        # Bloklayan işler için ayrı thread'ler: biri diğerini beklemesin
+        self.capture_pool = ThreadPoolExecutor(1, thread_name_prefix="capture")
+        self.detect_pool = ThreadPoolExecutor(1, thread_name_prefix="detect")
+        self.servo_pool = ThreadPoolExecutor(1, thread_name_prefix="servo")
+
+        # Sayaçlar
+        self.captured = 0
+        self.dropped_frames = 0
+        self.detected = 0
+        self.detect_time = 0.0
+        self.servo_writes = 0
+
+    def _init_servos(self, backend):
+        """Driver + kanal ayarları + merkeze gönderme; varış run() başında beklenir."""
+        cfg = self.cfg
+        servos = create_servo_driver(backend)
+        servos.settle_speed = cfg.SERVO_SETTLE_SPEED
+        for ch in [cfg.NECK_YAW_CH, cfg.NECK_TILT_CH, cfg.JAW_CH]:
+            servos.setup(ch, 500, 2500)
+        servos.set_angles(self.neck)
+        return servos
+
+    # ----- vision -----
+
+    def detect(self, frame):
+        """Executor thread'inde: tam frame detection + filtreler."""
+        t0 = time.perf_counter()
+        cfg = self.cfg
+        if self.detector.uses_color:
+            image, scale = frame, 1.0
+        else:
+            self.pyramid.update_bgr(frame)
+            image, scale = self.pyramid.level(cfg.COARSE_SCALE), cfg.COARSE_SCALE
+        boxes = detect_in_region(self.detector, image, full_region(cfg.WIDTH, cfg.HEIGHT, self.search_top),
+                                 scale=scale, min_size=(cfg.MIN_FACE_SIZE, cfg.MIN_FACE_SIZE))
+        faces = filter_detections(cfg, boxes)
+        self.detect_time += time.perf_counter() - t0
+        return faces
+
+    # ----- tasks -----
+
+    async def capture_task(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            ret, frame = await loop.run_in_executor(self.capture_pool, self.source.read)
+            if not ret:
+                print("Kaynak bitti / kamera okunamadı.")
+                self.stop.set()
+                return
+            self.captured += 1
+            if put_latest(self.frames, (time.time(), frame)):
+                self.dropped_frames += 1
+
+    async def detect_task(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            t, frame = await self.frames.get()
+            faces = await loop.run_in_executor(self.detect_pool, self.detect, frame)
+            self.detected += 1
+            await self.detections.put((t, faces))   # kontrol yetişemiyorsa burada bekler
+
+    async def control_task(self):
+        while True:
+            t, faces = await self.detections.get()
+            now = time.time()
+            # Behaviour "angles" / "greet" yayınlar, abonelikler kuyruklara bırakır
+            _, target, center = self.perception.update(faces, t, now)
+            self.head.update(now, self.perception.percept(target, center, t))
+
+    async def servo_task(self):
+        """Son hedefe SERVO_RATE_HZ'de, SERVO_MAX_SPEED ile interpolasyon (ServoActuator'ın async hali)."""
+        loop = asyncio.get_running_loop()
+        period = 1.0 / self.cfg.SERVO_RATE_HZ
+        target = dict(self.neck)
+        last = time.perf_counter()
+        while True:
+            if not self.targets.empty():
+                target = self.targets.get_nowait()
+
+            now = time.perf_counter()
+            max_delta = self.cfg.SERVO_MAX_SPEED * (now - last)
+            last = now
+            out = {}
+            for ch, goal in target.items():
+                current = self.neck[ch]
+                if abs(goal - current) <= max_delta:
+                    new = goal
+                else:
+                    new = current + max_delta if goal > current else current - max_delta
+                if new != current:
+                    out[ch] = new
+            if out:
+                self.neck.update(out)
+                await loop.run_in_executor(self.servo_pool, self.servos.set_angles, out)
+                self.servo_writes += 1
+            await asyncio.sleep(period)
+
+    async def audio_task(self):
+        while True:
+            index = await self.greetings.get()
+            self.audio.play(index)
+            print(f"Playing: {self.audio.clips[index].name}")
+
+    async def jaw_task(self):
+        """Çalan klibin zarfına göre çene (lip_sync.JawAnimator.angle_at)."""
+        loop = asyncio.get_running_loop()
+        channel = self.cfg.JAW_CH
+        while True:
+            angle = round(self.jaw.angle_at(*self.audio.playing()), 1)
+            # Değişmeyen açı driver'da atlanır
+            await loop.run_in_executor(self.servo_pool, self.servos.set_angles, {channel: angle})
+            await asyncio.sleep(self.jaw.period)
+
+    async def telemetry_task(self):
+        every = self.cfg.METRICS_EVERY
+        last_time, last_detected = time.time(), 0
+        while True:
+            await asyncio.sleep(every)
+            now = time.time()
+            fps = (self.detected - last_detected) / (now - last_time)
+            avg = 1000.0 * self.detect_time / max(1, self.detected)
+            print(f"Runtime: {fps:.1f} detection/sn, detect {avg:.1f} ms ort, "
+                  f"{self.dropped_frames}/{self.captured} frame atlandı, "
+                  f"kuyruk frames={self.frames.qsize()} detections={self.detections.qsize()}, "
+                  f"durum {self.head.name}")
+            last_time, last_detected = now, self.detected
+
+    # ----- yaşam döngüsü -----
+
+    def _on_angles(self, yaw, tilt):
+        put_latest(self.targets, {self.cfg.NECK_YAW_CH: yaw, self.cfg.NECK_TILT_CH: tilt})
+
+    def _on_greet(self, now, target):
+        if not self.audio.clips:
+            return
+        try:
+            self.greetings.put_nowait(self.greet_index)
+        except asyncio.QueueFull:
+            return
+        self.greet_index = (self.greet_index + 1) % len(self.audio.clips)
+
+    async def run(self, duration=None):
+        self.stop = asyncio.Event()
+        self.frames = asyncio.Queue(maxsize=1)
+        self.detections = asyncio.Queue(maxsize=2)
+        self.targets = asyncio.Queue(maxsize=1)
+        self.greetings = asyncio.Queue(maxsize=4)
+        self.bus.subscribe("angles", self._on_angles)
+        self.bus.subscribe("greet", self._on_greet)
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.stop.set)
+        if duration:
+            loop.call_later(duration, self.stop.set)
+
+        # Kafa merkeze varmadan detection başlamasın (sadece kalan tahmini süre)
+        settle = self.servos.settle_remaining()
+        await asyncio.sleep(settle)
+        self.startup.timings["settle"] = settle
+        print(self.startup.report())
+
+        tasks = [
+            asyncio.create_task(self.capture_task(), name="capture"),
+            asyncio.create_task(self.detect_task(), name="detect"),
+            asyncio.create_task(self.control_task(), name="control"),
+            asyncio.create_task(self.audio_task(), name="audio"),
+        ]
+        if self.cfg.METRICS:
+            tasks.append(asyncio.create_task(self.telemetry_task(), name="telemetry"))
+        if self.jaw is not None:
+            tasks.append(asyncio.create_task(self.jaw_task(), name="jaw"))
+        servo = asyncio.create_task(self.servo_task(), name="servo")
+
+        print("Piaget runtime başladı. Çıkmak için Ctrl+C.")
+        stopper = asyncio.create_task(self.stop.wait())
+        done, _ = await asyncio.wait(tasks + [servo, stopper], return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task is not stopper and task.exception() is not None:
+                print(f"Task {task.get_name()} hata verdi:", repr(task.exception()))
+
+        # Önce yeni hedef üretenler dursun, servo task merkeze dönüşü bitirsin
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.recenter(servo)
+        stopper.cancel()
+
+    async def recenter(self, servo, timeout=3.0):
+        cfg = self.cfg
+        center = {cfg.NECK_YAW_CH: cfg.YAW_CENTER, cfg.NECK_TILT_CH: cfg.TILT_CENTER}
+        put_latest(self.targets, center)
+        deadline = time.perf_counter() + timeout
+        while (not servo.done() and time.perf_counter() < deadline
+               and any(self.neck[ch] != angle for ch, angle in center.items())):
+            await asyncio.sleep(0.02)
+        servo.cancel()
+        await asyncio.gather(servo, return_exceptions=True)
+        if self.jaw is not None:
+            self.servos.set_angle(cfg.JAW_CH, cfg.JAW_CLOSED_ANGLE)
+
+    def close(self):
+        self.source.release()
+        self.audio.close()
+        for pool in (self.capture_pool, self.detect_pool, self.servo_pool):
+            pool.shutdown(wait=True)
+        self.servos.release()
+        print(f"Frames: {self.captured} yakalandı, {self.dropped_frames} atlandı, "
+              f"{self.detected} detection.")
+        print(f"Servo: {self.servos.writes} yazım / {self.servos.transactions} transaction. "
+              f"Kafa: yaw {self.neck[self.cfg.NECK_YAW_CH]:.1f}, tilt {self.neck[self.cfg.NECK_TILT_CH]:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Piaget: kamera, detection, servo ve ses tek süreçte")
+    parser.add_argument("--sim", action="store_true", help="sentetik kamera, sim servo, sessiz ses")
+    parser.add_argument("--duration", type=float, help="bu kadar saniye sonra temiz kapan")
+    args = parser.parse_args()
+
+    runtime = Runtime(load_config(), sim=args.sim)
+    try:
+        asyncio.run(runtime.run(args.duration))
+    finally:
+        runtime.close()
+
+
+if __name__ == "__main__":
+    main()
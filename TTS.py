@@ -1,4 +1,46 @@
-from gtts import gTTS
+import argparse
 
-tts = gTTS("Hello! Welcome to is tech Hour of Code festival", lang="en")
-tts.save("piaget_0.wav")
+from lip_sync import load_envelope
+from phrase_cache import BACKENDS, CACHE_DIR, PhraseCache, create_tts_backend, load_phrases
+
+# ---------- TTS BATCH ----------
+# phrases.txt'teki cümlelerden cache'te olmayanları sentezler (PCM WAV, playback rate'inde)
+# ve lip-sync zarflarını da önceden hesaplar. Sahada internet / sentez gerekmez.
+#
+#   python TTS.py                      # phrases.txt, gTTS, İngilizce
+#   python TTS.py --backend tone       # offline test sesi
+#   python TTS.py --text "Hello!"      # tek cümle
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TTS cümle cache'ini doldur")
+    parser.add_argument("phrases", nargs="?", default="phrases.txt", help="satır başına bir cümle")
+    parser.add_argument("--text", action="append", help="dosya yerine / ek olarak cümle")
+    parser.add_argument("--backend", default="gtts", choices=list(BACKENDS))
+    parser.add_argument("--lang", default="en")
+    parser.add_argument("--cache", default=CACHE_DIR)
+    parser.add_argument("--list", action="store_true", help="sadece eksikleri listele")
+    args = parser.parse_args()
+
+    phrases = list(args.text or [])
+    if not args.text or args.phrases != "phrases.txt":
+        phrases += load_phrases(args.phrases)
+
+    cache = PhraseCache(args.cache)
+    missing = cache.missing(phrases, args.backend, args.lang)
+    print(f"{len(phrases)} cümle, {len(missing)} eksik ({args.backend}, {args.lang})")
+    if args.list:
+        for text in missing:
+            print("-", text)
+        return
+
+    if missing:
+        made, failed = cache.build(missing, create_tts_backend(args.backend), args.lang)
+        print(f"{made} sentezlendi, {failed} hata.")
+
+    for path in cache.files(phrases, args.backend, args.lang):
+        load_envelope(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import threading
+import time
+
+# ---------- ASYNC SERVO ACTUATOR ----------
+# Vision döngüsü servo yazımını beklemesin: hedef açılar tek slotluk bir
+# "mailbox"a bırakılır (en son komut kazanır), ayrı bir thread sabit hızda
+# hedefe doğru interpolasyon yaparak driver'a yazar.
+
+
+class ServoActuator:
+    """driver: servo_driver.ServoDriver. rate_hz: yazım frekansı. max_speed: derece/saniye."""
+
+    def __init__(self, driver, channels, rate_hz=50, max_speed=180.0):
+        self.driver = driver
+        self.channels = list(channels)
+        self.period = 1.0 / rate_hz
+        self.max_speed = max_speed
+
+        self._lock = threading.Lock()
+        self._targets = {}     # mailbox: sadece en son hedef tutulur
+        self._current = {}
+        for ch in self.channels:
+            angle = driver.angle(ch)
+            if angle is not None:
+                self._current[ch] = angle
+                self._targets[ch] = angle
+
+        self._running = False
+        self._thread = None
+        self.ticks = 0
+        self.overruns = 0      # yazım periyottan uzun sürdü
+
+    def start(self):
+        if self._running:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="ServoActuator", daemon=True)
+        self._thread.start()
+        return self
+
+    def set_targets(self, targets):
+        """{kanal: açı}. Bloklamaz; bir önceki okunmamış hedefin üstüne yazar."""
+        with self._lock:
+            self._targets.update(targets)
+
+    def current(self, ch):
+        """Servoya en son yazılan (interpolasyonlu) açı."""
+        return self._current.get(ch)
+
+    def settled(self, tolerance=0.5):
+        with self._lock:
+            targets = dict(self._targets)
+        return all(
+            abs(self._current.get(ch, angle) - angle) <= tolerance
+            for ch, angle in targets.items()
+        )
+
+    def _step(self, dt):
+        with self._lock:
+            targets = dict(self._targets)
+
+        max_delta = self.max_speed * dt
+        out = {}
+        for ch, target in targets.items():
+            current = self._current.get(ch)
+            if current is None:
+                # İlk komut: interpolasyon için başlangıç noktası yok
+                new = target
+            elif abs(target - current) <= max_delta:
+                new = target
+            else:
+                new = current + max_delta if target > current else current - max_delta
+            self._current[ch] = new
+            out[ch] = new
+
+        if out:
+            self.driver.set_angles(out)
+
+    def _run(self):
+        next_tick = time.perf_counter()
+        last = next_tick
+        while self._running:
+            now = time.perf_counter()
+            self._step(now - last)
+            last = now
+            self.ticks += 1
+
+            next_tick += self.period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Geride kaldık: birikmiş tick'leri yakalamaya çalışma
+                self.overruns += 1
+                next_tick = time.perf_counter()
+
+    def stop(self, wait_settled=0.0):
+        """Thread'i durdurur. wait_settled > 0 ise önce hedefe varmayı o kadar saniye bekler."""
+        deadline = time.perf_counter() + wait_settled
+        while wait_settled and not self.settled() and time.perf_counter() < deadline:
+            time.sleep(self.period)
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
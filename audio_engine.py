@@ -0,0 +1,323 @@
+import fcntl
+import subprocess
+import threading
+import time
+import wave
+
+import numpy as np
+
+# ---------- AUDIO ENGINE ----------
+# Selamlama WAV'ları başlangıçta bir kere belleğe çözülür, sürekli açık bir çıkış
+# stream'inden çalınır. play() sadece bir pointer ayarlar: fork/exec yok, zombie yok,
+# vision döngüsüne maliyeti ~0.
+#
+# Sink'ler:
+#   "sounddevice": PortAudio stream (pip install sounddevice)
+#   "pwcat":       tek bir kalıcı pw-cat süreci (PipeWire, BT hoparlör), stdin'e PCM yazılır
+#   "null":        hiçbir şey çalmaz, gerçek zamanlı ilerler (test)
+#   "file":        çıkışı WAV dosyasına yazar (test)
+
+DEFAULT_RATE = 24000
+BLOCK_SIZE = 480   # 20 ms @ 24 kHz
+REOPEN_DELAY = 0.5   # çıkış koptuğunda sink'i yeniden açmadan önce bekleme (saniye)
+
+
+def resample(data, src_rate, rate):
+    """int16 mono sample'ları lineer interpolasyonla rate'e çevirir."""
+    if rate == src_rate or len(data) == 0:
+        return data
+    n_out = int(round(len(data) * rate / src_rate))
+    x_old = np.arange(len(data))
+    x_new = np.linspace(0, len(data) - 1, n_out)
+    return np.interp(x_new, x_old, data).astype(np.int16)
+
+
+def load_wav(source, rate=None):
+    """16-bit PCM WAV'ı (dosya yolu ya da file-like) mono int16 array olarak okur;
+    rate verilirse ona resample eder."""
+    with wave.open(source, "rb") as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError(f"{source}: sadece 16-bit PCM destekleniyor")
+        channels = wf.getnchannels()
+        src_rate = wf.getframerate()
+        data = np.frombuffer(wf.readframes(wf.getnframes()), dtype="<i2")
+
+    if channels > 1:
+        data = data.reshape(-1, channels).mean(axis=1).astype(np.int16)
+
+    if rate is not None and rate != src_rate:
+        data = resample(data, src_rate, rate)
+        src_rate = rate
+
+    return data, src_rate
+
+
+def write_wav(path, samples, rate):
+    """int16 mono sample'ları 16-bit PCM WAV olarak yazar."""
+    with wave.open(path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(np.asarray(samples, dtype="<i2").tobytes())
+
+
+class Clip:
+    def __init__(self, name, samples, rate):
+        self.name = name
+        self.samples = samples
+        self.rate = rate
+
+    @property
+    def duration(self):
+        return len(self.samples) / float(self.rate)
+
+
+# ---------- SINKS ----------
+
+class NullSink:
+    """Sesi atar; blokları gerçek zamanlı hızda tüketir (realtime=False ise beklemeden)."""
+
+    pull = False
+    latency = 0.0   # render edilen sample'ın hoparlörden çıkmasına kadar geçen süre (saniye)
+
+    def __init__(self, rate=DEFAULT_RATE, realtime=True):
+        self.rate = rate
+        self.realtime = realtime
+        self._next = None
+
+    def open(self):
+        self._next = time.perf_counter()
+
+    def write(self, block):
+        if not self.realtime:
+            return
+        self._next += len(block) / float(self.rate)
+        delay = self._next - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    def close(self):
+        pass
+
+
+class FileSink(NullSink):
+    """Çıkışı bir WAV dosyasına yazar (testte neyin ne zaman çaldığını görmek için)."""
+
+    def __init__(self, path, rate=DEFAULT_RATE, realtime=False):
+        super().__init__(rate, realtime)
+        self.path = path
+        self._wf = None
+
+    def open(self):
+        super().open()
+        self._wf = wave.open(self.path, "wb")
+        self._wf.setnchannels(1)
+        self._wf.setsampwidth(2)
+        self._wf.setframerate(self.rate)
+
+    def write(self, block):
+        self._wf.writeframes(block.astype("<i2").tobytes())
+        super().write(block)
+
+    def close(self):
+        if self._wf is not None:
+            self._wf.close()
+            self._wf = None
+
+
+class PwCatSink:
+    """Tek, kalıcı bir pw-cat süreci. Boşta sessizlik yazılır, stream hep açık kalır."""
+
+    pull = False
+
+    F_SETPIPE_SZ = 1031   # Linux fcntl sabiti
+
+    def __init__(self, rate=DEFAULT_RATE, latency_ms=40, pipe_bytes=4096):
+        self.rate = rate
+        self.latency_ms = latency_ms
+        self.pipe_bytes = pipe_bytes   # küçük pipe = düşük gecikme (varsayılan 64 KB ≈ 1.3 sn)
+        self.latency = (pipe_bytes / 2.0) / rate + latency_ms / 1000.0
+        self.proc = None
+        self._fallback = None   # pw-cat başlatılamazsa sessiz, gerçek zamanlı NullSink
+
+    def open(self):
+        try:
+            self.proc = subprocess.Popen(
+                ["pw-cat", "--playback", "--rate", str(self.rate), "--channels", "1",
+                 "--format", "s16", "--latency", f"{self.latency_ms}ms", "-"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as e:
+            # pw-cat kurulu değil / çalıştırılamıyor: robot sessiz de olsa açılsın
+            print(f"Audio: pw-cat başlatılamadı ({e}), ses çıkışı yok (null sink).")
+            self._fallback = NullSink(self.rate)
+            self._fallback.open()
+            return
+        self._fallback = None
+        try:
+            fcntl.fcntl(self.proc.stdin.fileno(), self.F_SETPIPE_SZ, self.pipe_bytes)
+        except OSError:
+            pass
+
+    def write(self, block):
+        if self._fallback is not None:
+            self._fallback.write(block)
+            return
+        # pipe dolunca bloklar: bu da yazıcı thread'i gerçek zamana kilitler
+        self.proc.stdin.write(block.astype("<i2").tobytes())
+
+    def close(self):
+        if self.proc is not None:
+            try:
+                self.proc.stdin.close()
+            except OSError:
+                pass
+            self.proc.terminate()
+            self.proc.wait(timeout=2.0)
+            self.proc = None
+
+
+class SoundDeviceSink:
+    """PortAudio callback stream. Engine'den blokları callback içinde çeker."""
+
+    pull = True
+
+    def __init__(self, rate=DEFAULT_RATE, device=None, latency="low"):
+        import sounddevice
+
+        self._sd = sounddevice
+        self.rate = rate
+        self.device = device
+        self.latency_hint = latency
+        self.latency = 0.0
+        self.stream = None
+
+    def open(self, render):
+        def callback(outdata, frames, time_info, status):
+            outdata[:, 0] = render(frames)
+
+        self.stream = self._sd.OutputStream(
+            samplerate=self.rate, channels=1, dtype="int16", blocksize=BLOCK_SIZE,
+            device=self.device, latency=self.latency_hint, callback=callback,
+        )
+        self.stream.start()
+        self.latency = self.stream.latency
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+
+
+def create_sink(backend="pwcat", **params):
+    sinks = {
+        "sounddevice": SoundDeviceSink,
+        "pwcat": PwCatSink,
+        "null": NullSink,
+        "file": FileSink,
+    }
+    if backend not in sinks:
+        raise ValueError(f"Bilinmeyen audio backend: {backend} (seçenekler: {', '.join(sinks)})")
+    return sinks[backend](**params)
+
+
+# ---------- ENGINE ----------
+
+class AudioEngine:
+    def __init__(self, files, sink, rate=DEFAULT_RATE):
+        self.rate = rate
+        self.sink = sink
+        self.clips = [Clip(path, *load_wav(path, rate)) for path in files]
+
+        self._lock = threading.Lock()
+        self._clip = None
+        self._pos = 0              # çalan klipte kaçıncı sample
+        self._silence = np.zeros(BLOCK_SIZE, dtype=np.int16)
+        self._running = False
+        self._thread = None
+        self.plays = 0
+
+    def start(self):
+        self._running = True
+        if self.sink.pull:
+            self.sink.open(self._render)
+        else:
+            self.sink.open()
+            self._thread = threading.Thread(target=self._run, name="AudioEngine", daemon=True)
+            self._thread.start()
+        return self
+
+    def _render(self, frames):
+        with self._lock:
+            clip = self._clip
+            if clip is None:
+                return self._silence[:frames] if frames <= BLOCK_SIZE else np.zeros(frames, np.int16)
+
+            chunk = clip.samples[self._pos:self._pos + frames]
+            self._pos += frames
+            if self._pos >= len(clip.samples):
+                self._clip = None
+
+        if len(chunk) < frames:
+            chunk = np.concatenate([chunk, np.zeros(frames - len(chunk), dtype=np.int16)])
+        return chunk
+
+    def _run(self):
+        while self._running:
+            try:
+                self.sink.write(self._render(BLOCK_SIZE))
+            except (BrokenPipeError, OSError) as e:
+                # ör. PipeWire yeniden başladı / BT hoparlör koptu: ses kalıcı olarak kesilmesin
+                print(f"Audio output error: {e} (sink yeniden açılıyor)")
+                self._reopen()
+
+    def _reopen(self):
+        try:
+            self.sink.close()
+        except OSError:
+            pass
+        time.sleep(REOPEN_DELAY)
+        if not self._running:
+            return
+        try:
+            self.sink.open()
+        except OSError as e:
+            print("Audio output error:", e)
+
+    def play(self, index):
+        """index'teki klibi baştan çalmaya başlar (çalan varsa keser). Bloklamaz."""
+        if index < 0 or index >= len(self.clips):
+            return
+        with self._lock:
+            self._clip = self.clips[index]
+            self._pos = 0
+        self.plays += 1
+
+    def stop(self):
+        with self._lock:
+            self._clip = None
+
+    def is_playing(self):
+        return self._clip is not None
+
+    def playing(self):
+        """(çalan klip index'i, klip içindeki saniye) ya da (None, 0.0)."""
+        with self._lock:
+            clip, pos = self._clip, self._pos
+        if clip is None:
+            return None, 0.0
+        return self.clips.index(clip), pos / float(self.rate)
+
+    def close(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self.sink.close()
+
+
+def create_audio_engine(files, backend="pwcat", rate=DEFAULT_RATE, **params):
+    """WAV'ları yükler, sink'i açar ve çalmaya hazır engine döndürür."""
+    return AudioEngine(files, create_sink(backend, rate=rate, **params), rate=rate).start()
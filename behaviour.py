@@ -0,0 +1,283 @@
+# ---------- BEHAVIOUR STATE MACHINE ----------
+# Kafanın ne yaptığı açık durumlarla:
+#
+#   Idle       merkezde bekliyor (yüz yeni kayboldu); NO_FACE_TIMEOUT dolunca → Scanning
+#   Scanning   sağ-sol tarama (SCAN_SEGMENT derece git, SCAN_DWELL bekle)
+#   Acquiring  taramada onaylanmamış bir yüz adayı: dur, aday onaylansın (ya da timeout)
+#   Tracking   hedef yüzü (ya da kısa kayıpta tahmini) controller ile takip
+#   Greeting   Tracking + selamlama çalıyor; her kişiye bir kere, cooldown'lı
+#   Returning  yüz kayboldu: merkeze yumuşak dönüş, varınca Idle / Scanning
+#
+# Her tick'te sadece aktif durumun işi çalışır. Durum değişiklikleri, selamlama ve
+# servo açıları EventBus üzerinden yayınlanır; ses / servo / vision tarafı abone olur:
+#
+#   bus = EventBus()
+#   bus.subscribe("greet", lambda now: audio.play(...))
+#   bus.subscribe("angles", lambda yaw, tilt: neck.set_targets(...))
+#   head = Behaviour(cfg, controller, bus, yaw, tilt)
+#   head.update(now, Percept(target, target_center, candidates, error))
+#
+# Yeni davranışlar (baş sallama, çene konuşması...) döngüye dal eklemeden takılır:
+#   head.on_tick("tracking", nod)        # nod(head, now, percept), aktif durumda her tick
+
+
+class EventBus:
+    def __init__(self):
+        self._handlers = {}
+
+    def subscribe(self, event, handler):
+        self._handlers.setdefault(event, []).append(handler)
+
+    def publish(self, event, **data):
+        for handler in self._handlers.get(event, ()):
+            handler(**data)
+
+
+class Percept:
+    """Bir tick'in vision çıktısı.
+
+    target: bu framede görülen hedef track (yoksa None), center: takip edilecek (tahmini)
+    merkez, candidates: onaylanmamış yüz adayı var mı, error: center'ın ekran merkezine farkı.
+    """
+
+    __slots__ = ("target", "center", "candidates", "error")
+
+    def __init__(self, target=None, center=None, candidates=False, error=None):
+        self.target = target
+        self.center = center
+        self.candidates = candidates
+        self.error = error
+
+
+def step_towards(current, target, max_step):
+    """current değerini target'a doğru en fazla max_step kadar yaklaştır."""
+    if abs(target - current) <= max_step:
+        return target
+    return current + max_step if target > current else current - max_step
+
+
+# ---------- STATES ----------
+
+class State:
+    name = "base"
+
+    def enter(self, head, now):
+        pass
+
+    def next(self, head, now, p):
+        """Geçilecek durumun adı; kalınacaksa None."""
+        return None
+
+    def tick(self, head, now, p):
+        pass
+
+
+class Idle(State):
+    name = "idle"
+
+    def next(self, head, now, p):
+        if p.center is not None:
+            return "tracking"
+        if not head.at_center():
+            return "returning"
+        if now - head.last_seen_time > head.cfg.NO_FACE_TIMEOUT:
+            return "scanning"
+        return None
+
+
+class Returning(State):
+    name = "returning"
+
+    def next(self, head, now, p):
+        if p.center is not None:
+            return "tracking"
+        if head.at_center():
+            return "scanning" if now - head.last_seen_time > head.cfg.NO_FACE_TIMEOUT else "idle"
+        return None
+
+    def tick(self, head, now, p):
+        head.move_to_center()
+
+
+class Scanning(State):
+    name = "scanning"
+
+    def enter(self, head, now):
+        self.travel = 0          # son beklemeden beri dönülen derece
+        self.pause_until = 0.0
+
+    def next(self, head, now, p):
+        if p.center is not None:
+            return "tracking"
+        if p.candidates and now >= head.acquire_blocked_until:
+            return "acquiring"
+        return None
+
+    def tick(self, head, now, p):
+        cfg = head.cfg
+        head.move_to_center(yaw=False)   # tilt merkezde
+        if now < self.pause_until:
+            return   # kafa duruyor (motion gate detection'ı atlayabilir)
+
+        head.yaw += head.scan_direction * cfg.SCAN_STEP
+        self.travel += cfg.SCAN_STEP
+
+        # Kenara gelince yön değiştir
+        if head.yaw >= cfg.YAW_MAX:
+            head.yaw = cfg.YAW_MAX
+            head.scan_direction = -1
+        elif head.yaw <= cfg.YAW_MIN:
+            head.yaw = cfg.YAW_MIN
+            head.scan_direction = 1
+
+        if cfg.SCAN_DWELL > 0 and self.travel >= cfg.SCAN_SEGMENT:
+            self.travel = 0
+            self.pause_until = now + cfg.SCAN_DWELL
+
+
+class Acquiring(State):
+    """Adayın onaylanması için (TRACK_MIN_HITS frame) kafa durur: hareket bulanıklığı yok."""
+
+    name = "acquiring"
+
+    def enter(self, head, now):
+        self.started = now
+
+    def next(self, head, now, p):
+        if p.center is not None:
+            return "tracking"
+        if not p.candidates or now - self.started > head.cfg.ACQUIRE_TIMEOUT:
+            # Onaylanmayan aday (poster vs.) taramayı sürekli durdurmasın
+            head.acquire_blocked_until = now + head.cfg.ACQUIRE_TIMEOUT
+            return "scanning"
+        return None
+
+
+class Tracking(State):
+    name = "tracking"
+
+    def next(self, head, now, p):
+        if p.center is None:
+            return "returning"
+        if p.target is not None and head.should_greet(now, p.target):
+            return "greeting"
+        return None
+
+    def tick(self, head, now, p):
+        head.follow(now, p)
+
+
+class Greeting(Tracking):
+    name = "greeting"
+
+    def enter(self, head, now):
+        head.greet(now, head.percept.target)
+
+    def next(self, head, now, p):
+        if p.center is None:
+            return "returning"
+        if not head.speaking():
+            return "tracking"
+        return None
+
+
+STATES = [Idle, Scanning, Acquiring, Tracking, Greeting, Returning]
+
+
+# ---------- MACHINE ----------
+
+class Behaviour:
+    """Kafa durumu + açılar. update() her kontrol tick'inde bir kere çağrılır."""
+
+    def __init__(self, cfg, controller, bus, yaw, tilt, speaking=None, now=0.0):
+        self.cfg = cfg
+        self.controller = controller
+        self.bus = bus
+        self.yaw = yaw
+        self.tilt = tilt
+        self.speaking = speaking or (lambda: False)   # selamlama hâlâ çalıyor mu
+
+        self.states = {cls.name: cls() for cls in STATES}
+        self._hooks = {}
+        self.state = self.states["idle"]
+        self.state_since = now
+        self.transitions = 0
+        self.percept = Percept()
+
+        self.last_seen_time = now
+        self.last_greet_time = -float("inf")
+        self.last_control_time = now
+        self.acquire_blocked_until = 0.0
+        self.scan_direction = 1   # +1 sağa, -1 sola
+
+    @property
+    def name(self):
+        return self.state.name
+
+    def on_tick(self, state, fn):
+        """state aktifken her tick fn(head, now, percept) çağrılır."""
+        if state not in self.states:
+            raise ValueError(f"Bilinmeyen durum: {state} (seçenekler: {', '.join(self.states)})")
+        self._hooks.setdefault(state, []).append(fn)
+
+    def transition(self, name, now):
+        old = self.state
+        if old.name in ("tracking", "greeting") and name not in ("tracking", "greeting"):
+            self.controller.reset()
+        self.state = self.states[name]
+        self.state_since = now
+        self.transitions += 1
+        self.state.enter(self, now)
+        self.bus.publish("state", old=old.name, new=name, now=now)
+
+    def update(self, now, percept):
+        """Geçişleri uygular, aktif durumun işini çalıştırır, açıları yayınlar. (yaw, tilt) döndürür."""
+        self.percept = percept
+        if percept.target is not None:
+            self.last_seen_time = now
+
+        # Aynı tick'te zincirleme geçiş (ör. Returning → Idle → Scanning), döngüsüz
+        for _ in range(len(self.states)):
+            name = self.state.next(self, now, percept)
+            if name is None:
+                break
+            self.transition(name, now)
+
+        self.state.tick(self, now, percept)
+        for fn in self._hooks.get(self.state.name, ()):
+            fn(self, now, percept)
+
+        self.last_control_time = now
+        self.bus.publish("angles", yaw=self.yaw, tilt=self.tilt)
+        return self.yaw, self.tilt
+
+    # ----- durumların ortak işleri -----
+
+    def at_center(self, tolerance=1.0):
+        return (abs(self.yaw - self.cfg.YAW_CENTER) <= tolerance
+                and abs(self.tilt - self.cfg.TILT_CENTER) <= tolerance)
+
+    def move_to_center(self, yaw=True, tilt=True):
+        """Merkeze küçük adımlarla yumuşak dönüş (her tick bir adım)."""
+        cfg = self.cfg
+        if yaw and abs(self.yaw - cfg.YAW_CENTER) > 0.5:
+            self.yaw = step_towards(self.yaw, cfg.YAW_CENTER, cfg.YAW_STEP_SMALL)
+            self.yaw = max(cfg.YAW_MIN, min(cfg.YAW_MAX, self.yaw))
+        if tilt and abs(self.tilt - cfg.TILT_CENTER) > 0.5:
+            self.tilt = step_towards(self.tilt, cfg.TILT_CENTER, cfg.TILT_STEP_SMALL)
+            self.tilt = max(cfg.TILT_MIN, min(cfg.TILT_MAX, self.tilt))
+
+    def follow(self, now, p):
+        error_x, error_y = p.error
+        self.yaw, self.tilt = self.controller.update(
+            error_x, error_y, self.yaw, self.tilt, now - self.last_control_time
+        )
+
+    def should_greet(self, now, target):
+        """Her kişiye bir kere, sesler üst üste binmesin."""
+        return not target.greeted and now - self.last_greet_time > self.cfg.GREET_COOLDOWN
+
+    def greet(self, now, target):
+        target.greeted = True
+        self.last_greet_time = now
+        self.bus.publish("greet", now=now, target=target)
@@ -1,7 +1,10 @@
 # camera_test.py
 import cv2
 
-cap = cv2.VideoCapture(0)  # gerekirse 1, 2 yaparız
+from config import load_config
+
+cfg = load_config()
+cap = cv2.VideoCapture(cfg.CAM_INDEX)  # gerekirse PIAGET_CAM_INDEX=1
 
 if not cap.isOpened():
     print("Kameraya erişilemiyor.")
@@ -0,0 +1,252 @@
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from session import SessionSource, is_session
+
+# ---------- FRAME SOURCES ----------
+# Hepsi cv2.VideoCapture gibi read(image=None) -> (ret, frame) verir.
+# image verilirse frame mümkünse o buffer'a yazılır (allocation yok).
+
+
+class CameraSource:
+    def __init__(self, index=0, width=320, height=240):
+        self.cap = cv2.VideoCapture(index)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        # Sürücü tarafında kuyruk birikmesin, en yeni frame gelsin
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self, image=None):
+        return self.cap.read(image)
+
+    def release(self):
+        self.cap.release()
+
+
+class FileSource:
+    """Video dosyası ya da frame klasörü (sıralı resimler) kaynağı.
+
+    fps verilirse kamera gibi o hızda frame verir, verilmezse olabildiğince hızlı.
+    """
+
+    IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp")
+
+    def __init__(self, path, width=None, height=None, fps=None, loop=False):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.period = 1.0 / fps if fps else 0.0
+        self.loop = loop
+        self._next_time = 0.0
+        self._index = 0
+        self.cap = None
+        self.files = None
+
+        if os.path.isdir(path):
+            self.files = sorted(
+                os.path.join(path, f) for f in os.listdir(path)
+                if f.lower().endswith(self.IMAGE_EXTS)
+            )
+        else:
+            self.cap = cv2.VideoCapture(path)
+
+    def isOpened(self):
+        if self.files is not None:
+            return len(self.files) > 0
+        return self.cap.isOpened()
+
+    def _read_raw(self, image):
+        if self.files is not None:
+            if self._index >= len(self.files):
+                if not self.loop:
+                    return False, None
+                self._index = 0
+            frame = cv2.imread(self.files[self._index])
+            self._index += 1
+            return frame is not None, frame
+
+        ret, frame = self.cap.read(image)
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read(image)
+        return ret, frame
+
+    def read(self, image=None):
+        if self.period:
+            delay = self._next_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_time = max(self._next_time, time.perf_counter()) + self.period
+
+        ret, frame = self._read_raw(image)
+        if ret and self.width and self.height and frame.shape[:2] != (self.height, self.width):
+            frame = cv2.resize(frame, (self.width, self.height))
+        return ret, frame
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+
+
+class SyntheticSource:
+    """Kamerasız test için: gri zemin üstünde dolaşan yüz benzeri bir elips."""
+
+    def __init__(self, width=320, height=240, fps=30, num_frames=None):
+        self.width = width
+        self.height = height
+        self.period = 1.0 / fps if fps else 0.0
+        self.num_frames = num_frames
+        self._count = 0
+        self._next_time = 0.0
+
+    def isOpened(self):
+        return True
+
+    def read(self, image=None):
+        if self.num_frames is not None and self._count >= self.num_frames:
+            return False, None
+
+        if self.period:
+            delay = self._next_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_time = max(self._next_time, time.perf_counter()) + self.period
+
+        if image is None or image.shape != (self.height, self.width, 3):
+            image = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        image[:] = 90
+
+        # Yavaşça sağ-sol / yukarı-aşağı gezinen "yüz"
+        t = self._count / 30.0
+        cx = int(self.width * (0.5 + 0.3 * np.sin(t * 0.8)))
+        cy = int(self.height * (0.55 + 0.15 * np.sin(t * 0.5)))
+        size = self.height // 5
+        cv2.ellipse(image, (cx, cy), (size, int(size * 1.2)), 0, 0, 360, (150, 170, 200), -1)
+        cv2.circle(image, (cx - size // 3, cy - size // 4), size // 8, (40, 40, 40), -1)
+        cv2.circle(image, (cx + size // 3, cy - size // 4), size // 8, (40, 40, 40), -1)
+
+        self._count += 1
+        return True, image
+
+    def release(self):
+        pass
+
+
+def open_source(spec, width=320, height=240, fps=None, loop=False):
+    """spec: kamera index'i (int / "0"), "synthetic", kayıtlı oturum ya da video / klasör yolu."""
+    if isinstance(spec, int) or (isinstance(spec, str) and spec.isdigit()):
+        return CameraSource(int(spec), width, height)
+    if spec == "synthetic":
+        return SyntheticSource(width, height, fps=fps or 30)
+    if is_session(spec):
+        return SessionSource(spec)
+    return FileSource(spec, width, height, fps=fps, loop=loop)
+
+
+# ---------- CAPTURE THREAD ----------
+
+class FrameGrabber:
+    """cap.read()'i ayrı bir thread'de çalıştırır, tüketiciye hep en yeni frame'i verir.
+
+    Üç slotlu ring buffer: biri yazılıyor, biri "en yeni", biri tüketicide.
+    Tüketici yetişemezse eski frame'ler kuyruğa girmez, üstüne yazılır (dropped).
+    max_fps verilirse kaynak bundan hızlı okunmaz (kamera sürücüsü fazlasını kendisi atar;
+    çalışırken değiştirilebilir, kamerayı yeniden açmak gerekmez).
+    """
+
+    NUM_SLOTS = 3
+
+    def __init__(self, source):
+        self.source = source
+        self._slots = [None] * self.NUM_SLOTS
+        self._cond = threading.Condition()
+        self._latest = -1      # en yeni dolu slot
+        self._reading = -1     # tüketicinin elindeki slot
+        self._seq = 0          # yakalanan frame sayısı
+        self._read_seq = 0     # tüketicinin en son aldığı frame
+        self._ended = False
+        self._running = False
+        self._thread = None
+
+        self.captured = 0
+        self.dropped = 0
+        self.last_capture_time = 0.0
+        self.max_fps = None
+        self._next_read = 0.0
+
+    def isOpened(self):
+        return self.source.isOpened()
+
+    def start(self):
+        if self._running:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="FrameGrabber", daemon=True)
+        self._thread.start()
+        return self
+
+    def _free_slot(self):
+        for i in range(self.NUM_SLOTS):
+            if i != self._latest and i != self._reading:
+                return i
+        return 0
+
+    def _run(self):
+        while self._running:
+            if self.max_fps:
+                delay = self._next_read - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                self._next_read = max(self._next_read, time.perf_counter()) + 1.0 / self.max_fps
+
+            with self._cond:
+                slot = self._free_slot()
+            ret, frame = self.source.read(self._slots[slot])
+            now = time.time()
+
+            with self._cond:
+                if not ret:
+                    self._ended = True
+                    self._cond.notify_all()
+                    break
+
+                self._slots[slot] = frame
+                # Önceki frame hiç okunmadıysa çöpe gitti
+                if self._seq > self._read_seq:
+                    self.dropped += 1
+                self._latest = slot
+                self._seq += 1
+                self.captured += 1
+                self.last_capture_time = now
+                self._cond.notify_all()
+
+    def read(self, timeout=2.0):
+        """Bir önceki read'den sonra gelen en yeni frame'i bekle ve döndür."""
+        with self._cond:
+            ok = self._cond.wait_for(
+                lambda: self._seq > self._read_seq or self._ended or not self._running,
+                timeout=timeout,
+            )
+            if not ok or self._seq == self._read_seq:
+                return False, None
+            self._reading = self._latest
+            self._read_seq = self._seq
+            return True, self._slots[self._reading]
+
+    def stop(self):
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def release(self):
+        self.stop()
+        self.source.release()
@@ -0,0 +1,363 @@
+import json
+import os
+import time
+
+try:
+    import tomllib
+except ImportError:   # Python < 3.11: pip install tomli, o da yoksa TOML dosyası atlanır
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+# ---------- CONFIG ----------
+# Tüm script'lerin ortak ayarları tek yerde. Öncelik sırası:
+#   DEFAULTS (aşağıda)  <  piaget.toml (ya da PIAGET_CONFIG ile verilen .toml / .json)  <  PIAGET_<AYAR> env
+# Tipler varsayılan değerden gelir; dosya / env'deki yanlış tipte ya da bilinmeyen ayar hata verir.
+#
+#   cfg = load_config()
+#   cfg.WIDTH, cfg.DEAD_ZONE_SMALL_X ...
+#   PIAGET_DISPLAY_MODE=off PIAGET_SERVO_BACKEND=sim python face_track.py
+#
+# Hot reload: döngüde cfg.poll() dosya değiştiyse yeniden okur ve değişen HOT_KEYS'i
+# uygular (kamera / cascade / servo merkezleme yeniden yapılmaz). Diğer ayarlar için
+# yeniden başlatmak gerekir, uyarı basılır.
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "piaget.toml")
+ENV_PREFIX = "PIAGET_"
+
+DEFAULTS = {
+    # --- Kamera ---
+    "CAM_INDEX": 0,
+    "WIDTH": 320,
+    "HEIGHT": 240,
+    "FRAME_SOURCE": None,        # None → CAM_INDEX; "synthetic", video / klasör / oturum yolu
+    "COARSE_SCALE": 0.6,         # yüz yokken tam frame'de yeniden yakalama (hızlı)
+    "FINE_SCALE": 1.0,           # son yüzün çevresinde doğrulama (hassas)
+
+    # --- Oturum kaydı / replay ---
+    "RECORD_SESSION": None,      # klasör verilirse oturum kaydedilir
+    "REPLAY_DETECTIONS": False,  # replay'de detector yerine kayıttaki yüzler
+
+    # --- Ses ---
+    "AUDIO_BACKEND": "pwcat",    # "pwcat", "sounddevice", "null"
+    "AUDIO_FILES": ["piaget_0.wav", "piaget_1.wav", "piaget_2.wav"],
+    "GREETING_PHRASES": "phrases.txt",
+    "TTS_BACKEND": "gtts",
+    "GREET_COOLDOWN": 5.0,       # iki selamlama arası en az (saniye)
+    "LIP_SYNC": True,
+
+    # --- Detector ---
+    "DETECTOR_BACKEND": "haar",  # "haar", "lbp" ya da "yunet"
+    "CASCADE_PATH": None,        # haar / lbp XML'i; None → bilinen klasörlerde aranır
+    "MODEL_PATH": None,          # yunet ONNX modeli; None → script klasörü / models/
+    "SCALE_FACTOR": 1.15,        # cascade: 1.1'den biraz daha seçici
+    "MIN_NEIGHBORS": 6,          # cascade: yüksek = daha az false positive
+    "YUNET_SCORE_THRESHOLD": 0.8,
+    "DETECT_WORKERS": 0,         # > 0: detection ayrı süreçlerde
+
+    # --- Motion gate (yüz yokken durağan framelerde detection atla) ---
+    "MOTION_GATE": True,
+    "MOTION_SCALE": 0.25,        # fark bu ölçekte hesaplanır (320x240 → 80x60)
+    "MOTION_THRESHOLD": 18,      # piksel farkı, altı gürültü
+    "MOTION_MIN_AREA": 0.004,    # değişen piksel oranı, üstü hareket
+    "MOTION_SETTLE": 0.3,        # servo durduktan sonra gate bu kadar saniye kapalı
+    "MOTION_MAX_SKIP": 2.0,      # en fazla bu kadar saniye üst üste atla
+
+    # --- Governor (yük / sıcaklığa göre detection ölçeği, aralığı ve kamera FPS'i) ---
+    "GOVERNOR": True,
+    "GOVERNOR_SENSORS": "system",   # "system" (/sys/class/thermal, /proc/stat) ya da "sim"
+    "GOVERNOR_TARGET_MS": 60.0,     # frame işleme süresi p95 hedefi
+    "GOVERNOR_TEMP_HIGH": 75.0,     # °C, üstünde hafiflet
+    "GOVERNOR_TEMP_LOW": 68.0,      # °C, altına inmeden ağırlaştırma
+    "GOVERNOR_CPU_HIGH": 0.9,
+    "GOVERNOR_CPU_LOW": 0.6,
+    "GOVERNOR_INTERVAL": 2.0,       # karar aralığı (saniye)
+    "GOVERNOR_HOLD": 6.0,           # ağırlaştırmadan önce en az bu kadar rahat
+    # Basamaklar, ağırdan hafife (aynı uzunlukta paralel listeler). Scale step detection
+    # ölçeğinin ne kadar küçüleceği: 0 tam ölçek, 1 MIN_FACE_SIZE'lık yüzün cascade penceresine
+    # (24 px) indiği ölçek. Pay yoksa (40 px × COARSE_SCALE 0.6 = 24 px) ölçek değişmez.
+    # Governor açıkken DETECT_EVERY yerine GOVERNOR_DETECT_EVERY geçerli.
+    "GOVERNOR_SCALE_STEPS": [0.0, 0.0, 0.5, 0.5, 1.0, 1.0],
+    "GOVERNOR_DETECT_EVERY": [3, 5, 5, 8, 10, 12],
+    "GOVERNOR_FPS": [30, 30, 20, 15, 10, 5],
+    # Profil → izin verilen (en ağır, en hafif) basamak
+    "GOVERNOR_TRACKING": (0, 3),
+    "GOVERNOR_SCANNING": (1, 4),
+    "GOVERNOR_IDLE": (3, 5),
+
+    # --- Detect-then-track ---
+    "HYBRID_DETECT": True,
+    "DETECT_EVERY": 5,           # kaç framede bir tam detection
+    "TRACK_MIN_CONFIDENCE": 0.55,
+    "TRACK_SEARCH_MARGIN": 0.5,
+    "COST_REPORT_EVERY": 10.0,
+
+    # --- Yüz filtreleri ---
+    "MIN_FACE_SIZE": 40,         # minWidth/minHeight (piksel)
+    "MIN_FACE_AREA": 40 * 40,
+    "MAX_FACE_RATIO": 0.4,       # frame alanının bu oranından büyükse yüz sayma
+    "MIN_ASPECT": 0.7,           # w/h
+    "MAX_ASPECT": 1.4,
+    "TOP_IGNORE_RATIO": 0.22,    # üst bant (flamalar)
+
+    # --- ROI arama ---
+    "ROI_SEARCH": True,
+    "ROI_EXPAND": 1.5,
+    "ROI_SIZE_CHANGE": 1.6,
+    "ROI_FULL_EVERY": 5,         # takipteyken her N. detection tam frame (yeni kişiler); 0 = hiç
+
+    # --- Servolar ---
+    "SERVO_BACKEND": "pca9685",  # donanımsız: "sim"
+    "NECK_YAW_CH": 1,
+    "NECK_TILT_CH": 0,
+    "YAW_MIN": 90,
+    "YAW_MAX": 180,
+    "YAW_CENTER": 135,
+    "TILT_MIN": 60,
+    "TILT_MAX": 120,
+    "TILT_CENTER": 90,
+    "JAW_CH": 4,
+    "JAW_CLOSED_ANGLE": 60,      # jaw_calibration.py ile bulunan güvenli aralık
+    "JAW_OPEN_ANGLE": 120,
+    "SERVO_ASYNC": True,
+    "SERVO_RATE_HZ": 50,
+    "SERVO_MAX_SPEED": 180.0,    # derece/saniye
+    "SERVO_SETTLE_SPEED": 250.0,  # derece/saniye, açılışta merkeze varış süresi tahmini
+
+    # --- Kontrol ---
+    "CONTROLLER": "rule",        # "rule" ya da "pid"
+    "DEAD_ZONE_SMALL_X": 35,     # merkez civarı, hiç hareket yok
+    "DEAD_ZONE_LARGE_X": 120,    # çok uzakta → büyük adım
+    "DEAD_ZONE_SMALL_Y": 18,
+    "DEAD_ZONE_LARGE_Y": 60,
+    "YAW_STEP_SMALL": 2,
+    "YAW_STEP_LARGE": 5,
+    "TILT_STEP_SMALL": 2,
+    "TILT_STEP_LARGE": 4,
+    "PID_YAW_GAINS": (0.6, 0.05, 0.02),
+    "PID_TILT_GAINS": (0.6, 0.05, 0.02),
+    "PID_MAX_SPEED": 150.0,
+    "UPDATE_EVERY": 1,
+
+    # --- Yüz takibi ---
+    "NO_FACE_TIMEOUT": 1.5,      # yüz yoksa bu kadar saniye sonra scan
+    "SCAN_STEP": 1,              # scan sırasında yaw adımı (derece, frame başı)
+    "SCAN_SEGMENT": 15,          # bu kadar derece döndükten sonra dur...
+    "SCAN_DWELL": 1.0,           # ...ve bu kadar saniye bekle (0: durmadan tara)
+    "ACQUIRE_TIMEOUT": 1.0,      # taramada onaylanmayan yüz adayı için en fazla bekleme
+    "ESTIMATOR": "kalman",       # "kalman" ya da "average"
+    "FACE_SMOOTH_WINDOW": 4,
+    "PREDICT_LATENCY": 0.1,
+    "MAX_COAST": 0.3,
+    "TRACK_IOU_THRESHOLD": 0.3,
+    "TRACK_MIN_HITS": 2,
+    "TRACK_MAX_AGE": 1.0,
+
+    # --- Metrics / display ---
+    "METRICS": True,
+    "METRICS_EVERY": 30.0,
+    "METRICS_FILE": "metrics.jsonl",
+    "DISPLAY_MODE": "preview",   # "off", "preview", "mjpeg", "shm"
+    "DISPLAY_FPS": 5,
+    "MJPEG_PORT": 8080,
+}
+
+# Varsayılanı None olanların tipleri
+NULLABLE = {
+    "FRAME_SOURCE": (int, str),
+    "RECORD_SESSION": (str,),
+    "CASCADE_PATH": (str,),
+    "MODEL_PATH": (str,),
+}
+
+# Dosya yolu ayarlarının beklenen uzantısı (cascade yerine model verilmesin, tersi de)
+PATH_SUFFIXES = {
+    "CASCADE_PATH": ".xml",
+    "MODEL_PATH": ".onnx",
+}
+
+# Çalışırken değiştirilebilenler (framelerin arasında uygulanır)
+HOT_KEYS = {
+    "COARSE_SCALE", "FINE_SCALE",
+    "GREET_COOLDOWN",
+    "SCALE_FACTOR", "MIN_NEIGHBORS", "YUNET_SCORE_THRESHOLD",
+    "DETECT_EVERY", "TRACK_MIN_CONFIDENCE", "TRACK_SEARCH_MARGIN", "COST_REPORT_EVERY",
+    "MIN_FACE_SIZE", "MIN_FACE_AREA", "MAX_FACE_RATIO", "MIN_ASPECT", "MAX_ASPECT", "TOP_IGNORE_RATIO",
+    "ROI_SEARCH", "ROI_EXPAND", "ROI_SIZE_CHANGE", "ROI_FULL_EVERY",
+    "JAW_CLOSED_ANGLE", "JAW_OPEN_ANGLE", "SERVO_MAX_SPEED",
+    "DEAD_ZONE_SMALL_X", "DEAD_ZONE_LARGE_X", "DEAD_ZONE_SMALL_Y", "DEAD_ZONE_LARGE_Y",
+    "YAW_STEP_SMALL", "YAW_STEP_LARGE", "TILT_STEP_SMALL", "TILT_STEP_LARGE",
+    "PID_YAW_GAINS", "PID_TILT_GAINS", "PID_MAX_SPEED", "UPDATE_EVERY",
+    "MOTION_GATE", "MOTION_SCALE", "MOTION_THRESHOLD", "MOTION_MIN_AREA", "MOTION_SETTLE",
+    "MOTION_MAX_SKIP",
+    "GOVERNOR_TARGET_MS", "GOVERNOR_TEMP_HIGH", "GOVERNOR_TEMP_LOW", "GOVERNOR_CPU_HIGH",
+    "GOVERNOR_CPU_LOW", "GOVERNOR_INTERVAL", "GOVERNOR_HOLD",
+    "NO_FACE_TIMEOUT", "SCAN_STEP", "SCAN_SEGMENT", "SCAN_DWELL", "ACQUIRE_TIMEOUT", "PREDICT_LATENCY", "MAX_COAST",
+    "TRACK_IOU_THRESHOLD", "TRACK_MIN_HITS", "TRACK_MAX_AGE",
+    "METRICS_EVERY",
+}
+
+
+def _coerce(key, value):
+    """Dosya / env değerini varsayılanın tipine çevirir, olmuyorsa ValueError."""
+    default = DEFAULTS[key]
+
+    if value is None or (isinstance(value, str) and value.lower() in ("none", "null") and default is None):
+        if default is None:
+            return None
+        raise ValueError(f"{key}: boş bırakılamaz")
+
+    if default is None:
+        types = NULLABLE[key]
+        if int in types and (isinstance(value, int) or (isinstance(value, str) and value.isdigit())):
+            return int(value)
+        if isinstance(value, str):
+            return value
+        raise ValueError(f"{key}: {value!r} geçersiz")
+
+    if isinstance(default, bool):
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.lower() in ("1", "true", "yes", "on", "0", "false", "no", "off"):
+            return value.lower() in ("1", "true", "yes", "on")
+        raise ValueError(f"{key}: true/false bekleniyor, {value!r} verildi")
+
+    if isinstance(default, (tuple, list)):
+        if isinstance(value, str):
+            value = [v.strip() for v in value.split(",") if v.strip()]
+        if not isinstance(value, (tuple, list)):
+            raise ValueError(f"{key}: liste bekleniyor, {value!r} verildi")
+        if isinstance(default, tuple):
+            if len(value) != len(default):
+                raise ValueError(f"{key}: {len(default)} elemanlı olmalı")
+            return tuple(type(d)(v) for d, v in zip(default, value))
+        item = type(default[0]) if default else str
+        try:
+            return [item(v) for v in value]
+        except (TypeError, ValueError):
+            raise ValueError(f"{key}: {item.__name__} listesi bekleniyor, {value!r} verildi")
+
+    try:
+        if isinstance(default, int) and isinstance(value, float) and not value.is_integer():
+            raise ValueError
+        return type(default)(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{key}: {type(default).__name__} bekleniyor, {value!r} verildi")
+
+
+def read_config_file(path):
+    """Dosyadaki ayarlar (düz dict). TOML tabloları sadece gruplama için: [servo] altındaki
+    YAW_MIN de YAW_MIN olarak okunur."""
+    if path.endswith(".json"):
+        with open(path) as f:
+            data = json.load(f)
+    else:
+        if tomllib is None:
+            raise ValueError("TOML için Python 3.11+ ya da tomli gerekli (ya da .json config kullan)")
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+
+    flat = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            flat.update(value)
+        else:
+            flat[key] = value
+    return flat
+
+
+def _validate(raw, source):
+    values = {}
+    for key, value in raw.items():
+        if key not in DEFAULTS:
+            raise ValueError(f"{source}: bilinmeyen ayar {key}")
+        values[key] = _coerce(key, value)
+        suffix = PATH_SUFFIXES.get(key)
+        if suffix and values[key] is not None and not values[key].lower().endswith(suffix):
+            raise ValueError(f"{source}: {key} bir {suffix} dosyası olmalı, {values[key]!r} verildi")
+    return values
+
+
+class Config:
+    def __init__(self, path=CONFIG_FILE, env=None, poll_interval=1.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._values = dict(DEFAULTS)
+        self._mtime = None
+        self._next_poll = 0.0
+
+        env = os.environ if env is None else env
+        self._env = _validate(
+            {k[len(ENV_PREFIX):]: v for k, v in env.items()
+             if k.startswith(ENV_PREFIX) and k[len(ENV_PREFIX):] in DEFAULTS},
+            "env",
+        )
+        self._values.update(self._load_file())
+        self._values.update(self._env)
+
+    def _load_file(self):
+        if not self.path or not os.path.exists(self.path):
+            self._mtime = None
+            return {}
+        self._mtime = os.stat(self.path).st_mtime_ns
+        if tomllib is None and not self.path.endswith(".json"):
+            # Eski Python'da robot yine açılsın: varsayılanlar + PIAGET_* env geçerli
+            print(f"Config: {self.path} atlandı (TOML için Python 3.11+ ya da tomli gerekli), "
+                  f"varsayılanlar ve env kullanılıyor.")
+            return {}
+        return _validate(read_config_file(self.path), self.path)
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__["_values"][name]
+        except KeyError:
+            raise AttributeError(f"Bilinmeyen ayar: {name}")
+
+    def __getitem__(self, name):
+        return self._values[name]
+
+    def as_dict(self):
+        return dict(self._values)
+
+    def poll(self, now=None):
+        """Dosya değiştiyse yeniden okur. Uygulanan (değişen HOT_KEYS) ayar isimlerini döndürür.
+
+        Hatalı dosyada eski ayarlar kalır. Env'de verilen ayarlar dosyayı ezmeye devam eder.
+        """
+        now = time.monotonic() if now is None else now
+        if now < self._next_poll or not self.path:
+            return set()
+        self._next_poll = now + self.poll_interval
+
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self._mtime:
+            return set()
+
+        try:
+            new = dict(DEFAULTS)
+            new.update(self._load_file())
+            new.update(self._env)
+        except (OSError, ValueError) as e:
+            self._mtime = mtime   # aynı hatayı her saniye basma
+            print("Config yeniden yüklenemedi, eski ayarlar geçerli:", e)
+            return set()
+
+        changed = {k for k in new if new[k] != self._values[k]}
+        applied = changed & HOT_KEYS
+        for key in sorted(changed - HOT_KEYS):
+            print(f"Config: {key} değişti, yeniden başlatınca geçerli olacak.")
+        for key in sorted(applied):
+            print(f"Config: {key} = {new[key]!r}")
+            self._values[key] = new[key]
+        return applied
+
+
+def load_config(path=None, **params):
+    """PIAGET_CONFIG env'i ya da verilen / varsayılan dosyadan config yükler."""
+    if path is None:
+        path = os.environ.get(ENV_PREFIX + "CONFIG", CONFIG_FILE)
+    return Config(path, **params)
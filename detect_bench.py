@@ -0,0 +1,270 @@
+import argparse
+import json
+import resource
+import time
+import tracemalloc
+
+import numpy as np
+
+from capture import SyntheticSource, open_source
+from detectors import create_detector
+from face_filter import iou_matrix
+from pyramid import ImagePyramid
+
+# ---------- BENCHMARK CONFIGS ----------
+# Script'lerdeki parametre setleri. Kamera / servo olmadan, kayıtlı frame'ler üzerinde
+# hangisinin ne kadara mal olduğunu ölçmek için.
+# min_size tam frame pikseli (küçültülmüş görüntüde scale ile çarpılır): face_fast.py
+# 0.5 ölçekte minSize=40 kullanır, yani tam framede 80.
+
+CONFIGS = {
+    "track":       {"backend": "haar", "scaleFactor": 1.15, "minNeighbors": 6, "scale": 1.0, "min_size": 40},
+    "track_coarse": {"backend": "haar", "scaleFactor": 1.15, "minNeighbors": 6, "scale": 0.6, "min_size": 40},
+    "plain":       {"backend": "haar", "scaleFactor": 1.1, "minNeighbors": 3, "scale": 1.0, "min_size": 40},
+    "fast":        {"backend": "haar", "scaleFactor": 1.1, "minNeighbors": 4, "scale": 0.5, "min_size": 80},
+    "detect_test": {"backend": "haar", "scaleFactor": 1.1, "minNeighbors": 5, "scale": 1.0, "min_size": 60},
+    "lbp":         {"backend": "lbp", "scaleFactor": 1.1, "minNeighbors": 4, "scale": 1.0, "min_size": 40},
+    "yunet":       {"backend": "yunet", "score_threshold": 0.8, "scale": 1.0, "min_size": 40},
+}
+
+DEFAULT_CONFIGS = ["track", "track_coarse", "plain", "fast", "detect_test"]
+
+
+def load_frames(path, max_frames=None, width=320, height=240):
+    """Video / frame klasörünü belleğe yükler (disk okuma ölçüme karışmasın)."""
+    if path == "synthetic":
+        source = SyntheticSource(width, height, fps=None, num_frames=max_frames or 300)
+    else:
+        # Video, frame klasörü ya da face_track.py'nin kaydettiği oturum
+        source = open_source(path, width, height)
+
+    if not source.isOpened():
+        raise SystemExit(f"Frame kaynağı açılamadı: {path}")
+
+    frames = []
+    while max_frames is None or len(frames) < max_frames:
+        ret, frame = source.read()
+        if not ret:
+            break
+        frames.append(frame.copy())
+    source.release()
+    return frames
+
+
+def load_annotations(path):
+    """JSON: {"<frame index>": [[x, y, w, h], ...], ...} (yazılmayan frame'de yüz yok sayılır)."""
+    with open(path) as f:
+        data = json.load(f)
+    return {int(k): np.asarray(v, dtype=np.float32).reshape(-1, 4) for k, v in data.items()}
+
+
+def match_boxes(dets, gts, iou_threshold=0.5):
+    """Greedy eşleştirme. (true positive, false positive, false negative) döndürür."""
+    if len(dets) == 0 or len(gts) == 0:
+        return 0, len(dets), len(gts)
+
+    ious = iou_matrix(dets[:, :4], gts)
+    used = np.zeros(len(gts), dtype=bool)
+    tp = 0
+    # Yüksek skorlu kutu önce, her gt en fazla bir kutuyla eşleşir
+    for i in np.argsort(-dets[:, 4]):
+        candidates = np.where(used, -1.0, ious[i])
+        j = int(np.argmax(candidates))
+        if candidates[j] >= iou_threshold:
+            used[j] = True
+            tp += 1
+    return tp, len(dets) - tp, len(gts) - tp
+
+
+def run_config(name, cfg, frames, annotations=None, iou_threshold=0.5, warmup=5):
+    params = {k: v for k, v in cfg.items() if k not in ("backend", "scale", "min_size")}
+    detector = create_detector(cfg["backend"], **params)
+    scale = cfg["scale"]
+    min_size = (int(cfg["min_size"] * scale),) * 2
+    pyramid = ImagePyramid(scales=(scale,))
+
+    def detect(frame):
+        if detector.uses_color:
+            return detector.detect(frame, min_size=(cfg["min_size"],) * 2)
+        pyramid.update_bgr(frame)
+        boxes = detector.detect(pyramid.level(scale), min_size=min_size)
+        if len(boxes) and scale != 1.0:
+            boxes = boxes.copy()
+            boxes[:, :4] /= scale
+        return boxes
+
+    # Isınma (cache / lazy init ölçüme girmesin)
+    for frame in frames[:warmup]:
+        detect(frame)
+
+    latencies = np.empty(len(frames), dtype=np.float64)
+    detections = 0
+    frames_with_face = 0
+    tp = fp = fn = 0
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    t_start = time.perf_counter()
+
+    for i, frame in enumerate(frames):
+        t0 = time.perf_counter()
+        boxes = detect(frame)
+        latencies[i] = time.perf_counter() - t0
+
+        detections += len(boxes)
+        frames_with_face += len(boxes) > 0
+        if annotations is not None:
+            gts = annotations.get(i, np.empty((0, 4), dtype=np.float32))
+            a, b, c = match_boxes(boxes, gts, iou_threshold)
+            tp += a
+            fp += b
+            fn += c
+
+    total = time.perf_counter() - t_start
+    _, py_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    result = {
+        "config": name,
+        "frames": len(frames),
+        "fps": len(frames) / total if total > 0 else 0.0,
+        "p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "p95_ms": float(np.percentile(latencies, 95) * 1000),
+        "p99_ms": float(np.percentile(latencies, 99) * 1000),
+        "max_ms": float(latencies.max() * 1000),
+        "py_peak_kb": py_peak / 1024.0,
+        "rss_growth_kb": float(rss_after - rss_before),
+        "detections": detections,
+        "frames_with_face": int(frames_with_face),
+    }
+    if annotations is not None:
+        result["precision"] = tp / (tp + fp) if tp + fp else 0.0
+        result["recall"] = tp / (tp + fn) if tp + fn else 0.0
+    return result
+
+
+def pool_result(pool):
+    result = pool.result()
+    if result is None:
+        raise RuntimeError("detection worker'ları zaman aşımına uğradı")
+    return result
+
+
+def run_pool(name, cfg, frames, workers, tiles=(1, 1), warmup=5):
+    """Aynı config'i DetectionPool ile çalıştırır: throughput ve gönderme → sonuç gecikmesi."""
+    from detect_pool import DetectionPool   # multiprocessing sadece --pool ile yüklensin
+
+    params = {k: v for k, v in cfg.items() if k not in ("backend", "scale", "min_size")}
+    scale = cfg["scale"]
+    min_size = (cfg["min_size"],) * 2
+    pool = DetectionPool(cfg["backend"], params, frames[0].shape, workers=workers, tiles=tiles)
+
+    try:
+        for frame in frames[:warmup]:
+            pool.submit(frame, time.perf_counter(), scale=scale, min_size=min_size)
+            pool_result(pool)
+
+        latencies = []
+        detections = 0
+        frames_with_face = 0
+        t_start = time.perf_counter()
+        i = 0
+        # Kuyruğu hep dolu tut; sonuçlar gönderildiği sırayla gelir
+        while len(latencies) < len(frames):
+            while i < len(frames) and not pool.full:
+                pool.submit(frames[i], time.perf_counter(), scale=scale, min_size=min_size)
+                i += 1
+            _, t_sent, boxes, _ = pool_result(pool)
+            latencies.append(time.perf_counter() - t_sent)
+            detections += len(boxes)
+            frames_with_face += len(boxes) > 0
+        total = time.perf_counter() - t_start
+    finally:
+        pool.close()
+
+    latencies = np.asarray(latencies)
+    return {
+        "config": f"{name}/w{workers}" + (f"/t{tiles[0]}x{tiles[1]}" if tiles != (1, 1) else ""),
+        "frames": len(frames),
+        "fps": len(frames) / total if total > 0 else 0.0,
+        "p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "p95_ms": float(np.percentile(latencies, 95) * 1000),
+        "p99_ms": float(np.percentile(latencies, 99) * 1000),
+        "max_ms": float(latencies.max() * 1000),
+        "py_peak_kb": 0.0,
+        "rss_growth_kb": 0.0,
+        "detections": detections,
+        "frames_with_face": int(frames_with_face),
+    }
+
+
+def print_table(results):
+    has_pr = any("precision" in r for r in results)
+    header = f"{'config':<14}{'fps':>8}{'p50':>8}{'p95':>8}{'p99':>8}{'dets':>7}{'w/face':>8}{'pyKB':>8}{'rssKB':>8}"
+    if has_pr:
+        header += f"{'prec':>7}{'rec':>7}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        line = (
+            f"{r['config']:<14}{r['fps']:>8.1f}{r['p50_ms']:>8.2f}{r['p95_ms']:>8.2f}{r['p99_ms']:>8.2f}"
+            f"{r['detections']:>7}{r['frames_with_face']:>8}{r['py_peak_kb']:>8.0f}{r['rss_growth_kb']:>8.0f}"
+        )
+        if has_pr:
+            line += f"{r.get('precision', 0.0):>7.2f}{r.get('recall', 0.0):>7.2f}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Piaget offline detection benchmark (kamera / servo gerekmez)")
+    parser.add_argument("source", help='video dosyası, frame klasörü, oturum klasörü ya da "synthetic"')
+    parser.add_argument("--configs", default=",".join(DEFAULT_CONFIGS),
+                        help=f"virgülle ayrılmış config isimleri ({', '.join(CONFIGS)})")
+    parser.add_argument("--annotations", help="precision/recall için JSON annotation dosyası")
+    parser.add_argument("--iou", type=float, default=0.5, help="eşleşme için minimum IoU")
+    parser.add_argument("--max-frames", type=int, default=None)
+    parser.add_argument("--width", type=int, default=320)
+    parser.add_argument("--height", type=int, default=240)
+    parser.add_argument("--json", help="sonuçları bu dosyaya JSON olarak yaz")
+    parser.add_argument("--pool", help="virgülle ayrılmış worker sayıları: tek süreç ile DetectionPool karşılaştırması (ör. 1,2,4)")
+    parser.add_argument("--tiles", default="1x1", help="pool'da frame'i parçalara böl (ör. 2x1)")
+    args = parser.parse_args()
+
+    frames = load_frames(args.source, args.max_frames, args.width, args.height)
+    if not frames:
+        raise SystemExit("Hiç frame okunamadı.")
+    annotations = load_annotations(args.annotations) if args.annotations else None
+    print(f"{len(frames)} frame yüklendi ({frames[0].shape[1]}x{frames[0].shape[0]}).")
+
+    results = []
+    measured = []   # tek süreçte çalışabilen config'ler: pool sadece bunları dener
+    for name in args.configs.split(","):
+        name = name.strip()
+        if name not in CONFIGS:
+            raise SystemExit(f"Bilinmeyen config: {name}")
+        try:
+            results.append(run_config(name, CONFIGS[name], frames, annotations, args.iou))
+            measured.append(name)
+        except RuntimeError as e:
+            # ör. YuNet modeli yoksa diğer config'ler yine ölçülsün
+            print(f"{name}: atlandı ({e})")
+
+    if args.pool:
+        cols, rows = (int(v) for v in args.tiles.lower().split("x"))
+        for name in measured:
+            for workers in args.pool.split(","):
+                try:
+                    results.append(run_pool(name, CONFIGS[name], frames, int(workers), (cols, rows)))
+                except RuntimeError as e:
+                    print(f"{name}/w{workers}: atlandı ({e})")
+
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
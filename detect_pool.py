@@ -0,0 +1,236 @@
+import multiprocessing as mp
+import queue
+import signal
+import time
+import traceback
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from detectors import create_detector
+from face_filter import iou_matrix
+from pyramid import ImagePyramid
+from roi_search import detect_in_region
+
+# ---------- PROCESS-PARALLEL DETECTION ----------
+# Detection birden fazla çekirdeğe dağıtılır. Frame'ler pickle edilmez: ana süreç
+# frame'i shared memory'deki boş bir slota kopyalar, worker'lara sadece küçük
+# (seq, slot, region, ...) tuple'ları gider. Sonuçlar frame sırasına göre geri verilir.
+#
+#   pool = DetectionPool("haar", {"scaleFactor": 1.15, "minNeighbors": 6}, (240, 320, 3), workers=3)
+#   pool.submit(frame, t, region, scale=0.6, min_size=(40, 40))
+#   seq, t, boxes, frame = pool.result()      # en eski gönderilen frame'in sonucu
+#
+# tiles=(cols, rows) > (1, 1) ise her frame bindirmeli parçalara bölünür ve parçalar
+# worker'lara dağıtılır (tek framenin gecikmesi düşer; throughput için frame başına
+# bir iş daha verimli).
+#
+# Worker'lar fork ile açılır (face_track.py bir script, spawn onu yeniden çalıştırırdı):
+# pool'u kamera / ses thread'leri başlamadan oluştur.
+
+
+def split_region(region, tiles=(1, 1), overlap=0):
+    """region'ı cols × rows parçaya böler; parçalar overlap piksel bindirir
+    (overlap ≥ en büyük yüz boyutu ise her yüz en az bir parçaya tam sığar)."""
+    x0, y0, x1, y1 = region
+    cols, rows = tiles
+    if cols <= 1 and rows <= 1:
+        return [region]
+
+    out = []
+    xs = np.linspace(x0, x1, cols + 1).astype(int)
+    ys = np.linspace(y0, y1, rows + 1).astype(int)
+    half = overlap // 2
+    for r in range(rows):
+        for c in range(cols):
+            out.append((
+                max(x0, xs[c] - half), max(y0, ys[r] - half),
+                min(x1, xs[c + 1] + half), min(y1, ys[r + 1] + half),
+            ))
+    return out
+
+
+def merge_boxes(boxes, iou_threshold=0.4):
+    """Parça sınırında iki kere bulunan yüzleri birleştirir (yüksek skorlu kalır)."""
+    if len(boxes) <= 1:
+        return boxes
+    order = np.argsort(-boxes[:, 4])
+    boxes = boxes[order]
+    ious = iou_matrix(boxes[:, :4], boxes[:, :4])
+    keep = np.ones(len(boxes), dtype=bool)
+    for i in range(len(boxes)):
+        if keep[i]:
+            keep[i + 1:] &= ious[i, i + 1:] < iou_threshold
+    return boxes[keep]
+
+
+def _worker(shm_name, shape, slots, backend, params, tasks, results):
+    # Ctrl+C tüm süreç grubuna gider: worker'ları ana süreç kapatır (yarım kalan frame beklenmesin)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Paralellik süreçlerden geliyor: OpenCV'nin kendi thread'leri çekirdekleri paylaşmasın
+    cv2.setNumThreads(1)
+    # Fork edilen worker ana sürecin resource_tracker'ını paylaşır; segmenti ana süreç siler
+    shm = shared_memory.SharedMemory(name=shm_name)
+    frames = np.ndarray((slots,) + tuple(shape), dtype=np.uint8, buffer=shm.buf)
+
+    try:
+        detector = create_detector(backend, **params)
+        pyramid = ImagePyramid()
+        while True:
+            job = tasks.get()
+            if job is None:
+                break
+            seq, tile, slot, region, scale, min_size, max_size = job
+            t0 = time.perf_counter()
+
+            image = frames[slot]
+            if detector.uses_color:
+                scale = 1.0
+            else:
+                pyramid.update_bgr(image)
+                image = pyramid.level(scale)
+
+            boxes = detect_in_region(detector, image, region, scale=scale,
+                                     min_size=min_size, max_size=max_size)
+            results.put((seq, tile, boxes, time.perf_counter() - t0))
+    except Exception:
+        # Exception pickle edilemeyebilir: ana süreç hatayı metin olarak alıp kendisi fırlatır
+        results.put((None, None, traceback.format_exc(), 0.0))
+    finally:
+        del frames
+        shm.close()
+
+
+class DetectionPool:
+    """shape: (height, width, 3) BGR frame boyutu. max_pending: aynı anda işlenen en fazla frame."""
+
+    def __init__(self, backend, params, shape, workers=3, max_pending=None, tiles=(1, 1),
+                 tile_overlap=96):
+        self.workers = workers
+        self.max_pending = max_pending or workers
+        self.tiles = tiles
+        self.tile_overlap = tile_overlap
+        self.shape = tuple(shape)
+
+        # +1: en son döndürülen frame, çağıran onunla işini bitirene kadar korunur
+        self.slots = self.max_pending + 1
+        frame_bytes = int(np.prod(self.shape))
+        self.shm = shared_memory.SharedMemory(create=True, size=self.slots * frame_bytes)
+        self.frames = np.ndarray((self.slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf)
+
+        ctx = mp.get_context("fork")
+        self.tasks = ctx.Queue()
+        self.results = ctx.Queue()
+        self.procs = [
+            ctx.Process(target=_worker, name=f"DetectWorker-{i}", daemon=True,
+                        args=(self.shm.name, self.shape, self.slots, backend, params,
+                              self.tasks, self.results))
+            for i in range(workers)
+        ]
+        for p in self.procs:
+            p.start()
+
+        self._free = list(range(self.slots))
+        self._next_seq = 0          # sıradaki gönderilecek frame
+        self._next_out = 0          # sıradaki döndürülecek frame
+        self._pending = {}          # seq → [slot, t, kalan parça sayısı, kutu listesi]
+        self._held_slot = None
+        self.worker_time = 0.0      # worker'larda geçen toplam detection süresi
+        self.completed = 0
+
+    @property
+    def queue_depth(self):
+        """Gönderilmiş ama sonucu henüz alınmamış frame sayısı."""
+        return len(self._pending)
+
+    @property
+    def full(self):
+        return len(self._pending) >= self.max_pending
+
+    def submit(self, frame, t=None, region=None, scale=1.0, min_size=(40, 40), max_size=None):
+        """frame'i kuyruğa ekler, seq döndürür. Kuyruk doluysa None (önce result() çağır)."""
+        if self.full:
+            return None
+        if frame.shape != self.shape:
+            raise ValueError(f"Frame boyutu {frame.shape}, pool {self.shape} için açıldı")
+
+        slot = self._free.pop()
+        np.copyto(self.frames[slot], frame)
+
+        if region is None:
+            region = (0, 0, self.shape[1], self.shape[0])
+        parts = split_region(region, self.tiles, self.tile_overlap)
+
+        seq = self._next_seq
+        self._next_seq += 1
+        self._pending[seq] = [slot, t, len(parts), []]
+        for i, part in enumerate(parts):
+            self.tasks.put((seq, i, slot, part, scale, tuple(min_size),
+                            tuple(max_size) if max_size is not None else None))
+        return seq
+
+    def _collect(self, timeout):
+        seq, _, boxes, dt = self.results.get(timeout=timeout)
+        if seq is None:
+            raise RuntimeError(f"Detection worker hata verdi:\n{boxes}")
+        entry = self._pending[seq]
+        entry[2] -= 1
+        if len(boxes):
+            entry[3].append(boxes)
+        self.worker_time += dt
+
+    def result(self, timeout=5.0, poll=0.5):
+        """Sıradaki (en eski) frame'in sonucu: (seq, t, boxes, frame).
+
+        boxes: float32 (N, 5) tam frame koordinatında. frame: shared memory'deki kopya,
+        bir sonraki result() çağrısına kadar geçerli. Kuyruk boşsa / timeout'ta None.
+        Worker hata verdiyse ya da beklenirken bir worker öldüyse RuntimeError.
+        """
+        if self._next_out not in self._pending:
+            return None
+        deadline = None if timeout is None else time.perf_counter() + timeout
+
+        # Sonraki frame'in tüm parçaları gelene kadar topla (sıra dışı gelenler bekler).
+        # Kısa aralıklarla bekle: ölen worker'ın işi hiç gelmez, sonsuza kadar beklenmesin
+        while self._pending[self._next_out][2] > 0:
+            wait = poll
+            if deadline is not None:
+                wait = min(poll, max(0.0, deadline - time.perf_counter()))
+            try:
+                self._collect(wait)
+            except queue.Empty:
+                dead = [p.name for p in self.procs if not p.is_alive()]
+                if dead:
+                    raise RuntimeError(f"Detection worker durdu: {', '.join(dead)}")
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return None
+
+        if self._held_slot is not None:
+            self._free.append(self._held_slot)
+
+        seq = self._next_out
+        slot, t, _, parts = self._pending.pop(seq)
+        self._next_out += 1
+        self._held_slot = slot
+        self.completed += 1
+
+        if not parts:
+            boxes = np.empty((0, 5), dtype=np.float32)
+        elif len(parts) == 1:
+            boxes = parts[0]
+        else:
+            boxes = merge_boxes(np.concatenate(parts))
+        return seq, t, boxes, self.frames[slot]
+
+    def close(self):
+        for _ in self.procs:
+            self.tasks.put(None)
+        for p in self.procs:
+            p.join(timeout=2.0)
+            if p.is_alive():
+                p.terminate()
+        del self.frames
+        self.shm.close()
+        self.shm.unlink()
+
@@ -0,0 +1,137 @@
+import time
+
+import cv2
+import numpy as np
+
+from face_filter import iou_matrix, largest_face
+
+# ---------- DETECT-THEN-TRACK ----------
+# Haar cascade pahalı: her N framede bir tam detection, arada son yüzün
+# template'i ile ucuz bir matchTemplate takibi.
+
+
+class TemplateTracker:
+    """Son yüz kutusunu, etrafındaki küçük bir pencerede template match ile takip eder."""
+
+    def __init__(self, search_margin=0.5):
+        self.search_margin = search_margin  # kutu boyutunun kaç katı kadar etrafa bakılsın
+        self.template = None
+        self.box = None
+
+    def init(self, gray, box):
+        x, y, w, h = box
+        self.template = gray[y:y + h, x:x + w].copy()
+        self.box = (x, y, w, h)
+
+    def reset(self):
+        self.template = None
+        self.box = None
+
+    def update(self, gray):
+        """(box, score) döndürür. score: TM_CCOEFF_NORMED, 1.0 = birebir."""
+        if self.template is None:
+            return None, 0.0
+
+        x, y, w, h = self.box
+        img_h, img_w = gray.shape[:2]
+        mx = int(w * self.search_margin)
+        my = int(h * self.search_margin)
+
+        x0 = max(0, x - mx)
+        y0 = max(0, y - my)
+        x1 = min(img_w, x + w + mx)
+        y1 = min(img_h, y + h + my)
+        if x1 - x0 < w or y1 - y0 < h:
+            return None, 0.0
+
+        result = cv2.matchTemplate(gray[y0:y1, x0:x1], self.template, cv2.TM_CCOEFF_NORMED)
+        _, score, _, loc = cv2.minMaxLoc(result)
+
+        self.box = (x0 + loc[0], y0 + loc[1], w, h)
+        return self.box, score
+
+
+class DetectThenTrack:
+    """detect_fn'i her detect_every framede bir (ya da takip güveni düşünce) çağırır.
+
+    detect_fn(gray) -> int32 (N, 6) [x, y, w, h, cx, cy] (filtrelenmiş yüzler, tam frame koordinatı)
+    update(gray, target_box) aynı formatta array döndürür; takip edilen frame'lerde tek yüz olur.
+    target_box (MultiFaceTracker'ın hedefi) verilirse arada takip edilen yüz odur, en büyüğü değil.
+    """
+
+    def __init__(self, detect_fn, detect_every=5, min_confidence=0.55, search_margin=0.5):
+        self.detect_fn = detect_fn
+        self.detect_every = max(1, detect_every)
+        self.min_confidence = min_confidence
+        self.tracker = TemplateTracker(search_margin)
+
+        self.frames_since_detect = 0
+        self.last_mode = None     # "detect" / "track"
+        self.last_score = 0.0
+
+        # Maliyet istatistikleri (saniye)
+        self.detect_time = 0.0
+        self.track_time = 0.0
+        self.detect_frames = 0
+        self.track_frames = 0
+
+    @staticmethod
+    def _pick(faces, target_box):
+        """Takip edilecek yüz: hedefle en çok örtüşen, hedef yoksa / örtüşmüyorsa en büyüğü."""
+        if target_box is not None:
+            ious = iou_matrix(faces[:, :4], np.asarray([target_box[:4]]))[:, 0]
+            best = int(np.argmax(ious))
+            if ious[best] > 0:
+                return faces[best]
+        return largest_face(faces)
+
+    def _detect(self, gray, target_box=None, spent=0.0):
+        t0 = time.perf_counter()
+        faces = self.detect_fn(gray)
+        # spent: aynı framede başarısız takip denemesi; frame bir kere, detect olarak sayılır
+        self.detect_time += time.perf_counter() - t0 + spent
+        self.detect_frames += 1
+        self.frames_since_detect = 0
+        self.last_mode = "detect"
+
+        if len(faces) > 0:
+            self.tracker.init(gray, [int(v) for v in self._pick(faces, target_box)[:4]])
+            self.last_score = 1.0
+        else:
+            self.tracker.reset()
+            self.last_score = 0.0
+        return faces
+
+    def update(self, gray, target_box=None):
+        self.frames_since_detect += 1
+
+        if self.tracker.template is None or self.frames_since_detect >= self.detect_every:
+            return self._detect(gray, target_box)
+
+        t0 = time.perf_counter()
+        box, score = self.tracker.update(gray)
+        spent = time.perf_counter() - t0
+        self.last_score = score
+
+        # Takip güveni düştü → aynı framede yeniden detection
+        if box is None or score < self.min_confidence:
+            return self._detect(gray, target_box, spent)
+
+        self.track_time += spent
+        self.track_frames += 1
+        self.last_mode = "track"
+        x, y, w, h = box
+        return np.array([[x, y, w, h, x + w // 2, y + h // 2]], dtype=np.int32)
+
+    def cost_report(self):
+        """Son rapordan beri detect / track frame başı maliyetini döndürür ve sıfırlar."""
+        total = self.detect_frames + self.track_frames
+        detect_ms = 1000.0 * self.detect_time / self.detect_frames if self.detect_frames else 0.0
+        track_ms = 1000.0 * self.track_time / self.track_frames if self.track_frames else 0.0
+        report = (
+            f"detect: {self.detect_frames}/{total} frame, {detect_ms:.1f} ms/frame | "
+            f"track: {self.track_frames}/{total} frame, {track_ms:.1f} ms/frame"
+        )
+        self.detect_time = self.track_time = 0.0
+        self.detect_frames = self.track_frames = 0
+        return report
@@ -0,0 +1,223 @@
+import os
+
+import cv2
+import numpy as np
+
+# ---------- DETECTOR BACKENDS ----------
+# Hepsi aynı şeyi döndürür: float32 (N, 5) array [x, y, w, h, score].
+# score: cascade'lerde komşu sayısı (numDetections), YuNet'te 0-1 güven skoru.
+#
+# create_detector() ortak ayarların hepsini alır, backend'in kullanmadıklarını atar:
+# çağıranlar backend'e göre dallanmaz.
+#
+#   detector = create_detector(cfg.DETECTOR_BACKEND, cascade_path=..., model_path=...,
+#                              scaleFactor=1.15, minNeighbors=6, score_threshold=0.8,
+#                              min_size=(40, 40))
+#
+# cascade_path sadece haar / lbp'ye, model_path sadece yunet'e gider (path ikisini de ezer).
+#   detector.configure(scaleFactor=1.2, score_threshold=0.7)   # çalışırken (hot reload)
+
+CASCADE_DIRS = [
+    "/usr/share/opencv4",
+    "/usr/share/opencv",
+]
+
+MODEL_DIRS = [
+    os.path.dirname(os.path.abspath(__file__)),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "models"),
+]
+
+EMPTY = np.empty((0, 5), dtype=np.float32)
+
+
+def find_cascade(filename, kind="haarcascades"):
+    """Cascade XML'ini bilinen klasörlerde arar (kind: "haarcascades" / "lbpcascades")."""
+    candidates = [os.path.join(base, kind) for base in CASCADE_DIRS]
+    # pip ile kurulan opencv-python cascade'leri kendi içinde taşır
+    if hasattr(cv2, "data"):
+        candidates.append(cv2.data.haarcascades)
+
+    for base in candidates:
+        path = os.path.join(base, filename)
+        if os.path.exists(path):
+            return path
+
+    raise RuntimeError(f"{filename} not found in known locations")
+
+
+def find_model(filename):
+    for base in MODEL_DIRS:
+        path = os.path.join(base, filename)
+        if os.path.exists(path):
+            return path
+    raise RuntimeError(f"{filename} not found (script klasörüne ya da models/ altına koy)")
+
+
+class Detector:
+    """Yüz detector arayüzü.
+
+    uses_color False ise detect() gri görüntü, True ise BGR görüntü bekler.
+    """
+
+    name = "base"
+    uses_color = False
+    params = ()                  # create_detector / configure'un bu backend'e geçirdiği ayarlar
+    path_key = None              # path'in create_detector'daki adı (cascade_path / model_path)
+    path_suffix = None
+    min_size = (40, 40)          # detect()'e min_size verilmezse
+    window = (0, 0)              # algılanabilen en küçük yüz (detect'e verilen görüntüde, piksel)
+
+    def configure(self, **params):
+        """Çalışırken değişebilen ayarları uygular; bu backend'in kullanmadıkları atlanır."""
+        for key, value in params.items():
+            if key in self.params and key != "path":
+                setattr(self, key, value)
+
+    def detect(self, image, min_size=None, max_size=None):
+        raise NotImplementedError
+
+
+class CascadeDetector(Detector):
+    """cv2.CascadeClassifier (Haar / LBP) backend."""
+
+    name = "cascade"
+    default_file = None
+    default_kind = "haarcascades"
+    params = ("path", "scaleFactor", "minNeighbors")
+    path_key = "cascade_path"
+    path_suffix = ".xml"
+    feature_type = None          # cv2: 0 = HAAR, 1 = LBP
+
+    def __init__(self, path=None, scaleFactor=1.1, minNeighbors=3):
+        if path is None:
+            path = find_cascade(self.default_file, self.default_kind)
+        self.path = path
+        self.scaleFactor = scaleFactor
+        self.minNeighbors = minNeighbors
+
+        self.cascade = cv2.CascadeClassifier(path)
+        if self.cascade.empty():
+            raise RuntimeError(f"Yüz cascade yüklenemedi: {path}")
+        if self.feature_type is not None and self.cascade.getFeatureType() != self.feature_type:
+            raise ValueError(f"{path} bir {self.name} cascade'i değil (DETECTOR_BACKEND / CASCADE_PATH)")
+        # Bundan küçük yüzler hiç bulunmaz (frontal face cascade'lerinde 24x24)
+        self.window = tuple(self.cascade.getOriginalWindowSize())
+
+    def detect(self, image, min_size=None, max_size=None):
+        min_size = min_size or self.min_size
+        kwargs = {}
+        if max_size is not None:
+            kwargs["maxSize"] = tuple(max_size)
+
+        boxes, neighbors = self.cascade.detectMultiScale2(
+            image,
+            scaleFactor=self.scaleFactor,
+            minNeighbors=self.minNeighbors,
+            minSize=tuple(min_size),
+            **kwargs
+        )
+        if len(boxes) == 0:
+            return EMPTY
+
+        out = np.empty((len(boxes), 5), dtype=np.float32)
+        out[:, :4] = boxes
+        out[:, 4] = np.asarray(neighbors).reshape(-1)
+        return out
+
+
+class HaarDetector(CascadeDetector):
+    name = "haar"
+    default_file = "haarcascade_frontalface_default.xml"
+    default_kind = "haarcascades"
+    feature_type = 0
+
+
+class LbpDetector(CascadeDetector):
+    """Haar'dan birkaç kat hızlı, biraz daha az isabetli."""
+
+    name = "lbp"
+    default_file = "lbpcascade_frontalface_improved.xml"
+    default_kind = "lbpcascades"
+    feature_type = 1
+
+
+class YuNetDetector(Detector):
+    """cv2.FaceDetectorYN (YuNet, ONNX) küçük CPU DNN detector.
+
+    Poster / flama gibi yüze benzeyen şeylerde cascade'lerden çok daha az false positive verir.
+    """
+
+    name = "yunet"
+    uses_color = True
+    default_file = "face_detection_yunet_2023mar.onnx"
+    params = ("path", "score_threshold", "nms_threshold", "top_k")
+    path_key = "model_path"
+    path_suffix = ".onnx"
+
+    def __init__(self, path=None, score_threshold=0.8, nms_threshold=0.3, top_k=50):
+        if not hasattr(cv2, "FaceDetectorYN"):
+            raise RuntimeError("Bu OpenCV sürümünde FaceDetectorYN yok (>= 4.5.4 gerekli)")
+        if path is None:
+            path = find_model(self.default_file)
+        self.path = path
+        self._input_size = (320, 240)
+        self.net = cv2.FaceDetectorYN.create(
+            path, "", self._input_size, score_threshold, nms_threshold, top_k
+        )
+
+    def configure(self, **params):
+        if "score_threshold" in params:
+            self.net.setScoreThreshold(params["score_threshold"])
+        if "nms_threshold" in params:
+            self.net.setNMSThreshold(params["nms_threshold"])
+        if "top_k" in params:
+            self.net.setTopK(params["top_k"])
+
+    def detect(self, image, min_size=None, max_size=None):
+        min_size = min_size or self.min_size
+        h, w = image.shape[:2]
+        if (w, h) != self._input_size:
+            self._input_size = (w, h)
+            self.net.setInputSize(self._input_size)
+
+        _, faces = self.net.detect(image)
+        if faces is None or len(faces) == 0:
+            return EMPTY
+
+        out = np.empty((len(faces), 5), dtype=np.float32)
+        out[:, :4] = faces[:, :4]
+        out[:, 4] = faces[:, 14]
+        # Kenardan taşan yüzler negatif koordinat verebiliyor
+        np.maximum(out[:, :2], 0, out=out[:, :2])
+
+        keep = (out[:, 2] >= min_size[0]) & (out[:, 3] >= min_size[1])
+        if max_size is not None:
+            keep &= (out[:, 2] <= max_size[0]) & (out[:, 3] <= max_size[1])
+        return out[keep]
+
+
+BACKENDS = {
+    "haar": HaarDetector,
+    "lbp": LbpDetector,
+    "yunet": YuNetDetector,
+}
+
+
+def create_detector(backend="haar", min_size=None, **params):
+    """Config'teki isimle detector oluşturur: "haar", "lbp" ya da "yunet".
+
+    params ortak ayarlardır (path, scaleFactor, minNeighbors, score_threshold...);
+    backend'in kullanmadıkları atılır. min_size detect()'in varsayılan en küçük yüzü.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Bilinmeyen detector backend: {backend} (seçenekler: {', '.join(BACKENDS)})")
+    cls = BACKENDS[backend]
+    path = params.pop("path", None) or params.get(cls.path_key)
+    if path is not None:
+        if not path.lower().endswith(cls.path_suffix):
+            raise ValueError(f"{backend} bir {cls.path_suffix} dosyası bekliyor, {path} verildi")
+        params["path"] = path
+    detector = cls(**{key: value for key, value in params.items() if key in cls.params})
+    if min_size is not None:
+        detector.min_size = tuple(min_size)
+    return detector
@@ -0,0 +1,260 @@
+import argparse
+import threading
+from multiprocessing import resource_tracker, shared_memory
+
+import cv2
+import numpy as np
+
+# ---------- DISPLAY ----------
+# Vision döngüsünün görüntü çıkışı. Modlar:
+#   "off":     hiçbir şey (üretim): wants_frame() hep False, overlay bile çizilmez
+#   "preview": cv2.imshow, fps ile sınırlı (varsayılan 5 FPS)
+#   "mjpeg":   http://<pi>:8080/ adresinden tarayıcıyla izlenir; izleyen yoksa JPEG encode edilmez
+#   "shm":     shared-memory ring; ayrı süreçte "python display.py" ile izlenir
+#
+# Döngüde kullanım:
+#   if display.wants_frame(now):
+#       ...overlay çiz...
+#       if display.show(frame): break      # preview'da 'q' basıldı
+
+
+class NullDisplay:
+    def wants_frame(self, now):
+        return False
+
+    def show(self, frame):
+        return False
+
+    def close(self):
+        pass
+
+
+class _Throttled(NullDisplay):
+    def __init__(self, fps):
+        self.period = 1.0 / fps if fps else 0.0
+        self._next = 0.0
+        self.shown = 0
+
+    def wants_frame(self, now):
+        if now < self._next:
+            return False
+        # Geç kalınırsa birikmesin: bir sonraki slot şimdiden itibaren
+        self._next = max(self._next + self.period, now)
+        return True
+
+
+class PreviewDisplay(_Throttled):
+    """Lokal pencere. waitKey sadece gösterilen framelerde çağrılır."""
+
+    def __init__(self, title="Piaget", fps=5, scale=1.5):
+        super().__init__(fps)
+        self.title = title
+        self.scale = scale
+
+    def show(self, frame):
+        if self.scale != 1.0:
+            frame = cv2.resize(frame, None, fx=self.scale, fy=self.scale)
+        cv2.imshow(self.title, frame)
+        self.shown += 1
+        return cv2.waitKey(1) & 0xFF == ord("q")
+
+    def close(self):
+        cv2.destroyAllWindows()
+
+
+class MJPEGDisplay(_Throttled):
+    """multipart/x-mixed-replace MJPEG stream. HTTP sunucusu ayrı thread'de."""
+
+    def __init__(self, port=8080, fps=10, quality=70, host="0.0.0.0"):
+        # http.server sadece bu modda yüklensin (açılışta ~20 ms)
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        super().__init__(fps)
+        self.quality = quality
+        self._cond = threading.Condition()
+        self._jpeg = None
+        self._seq = 0
+        self.clients = 0
+
+        display = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "multipart/x-mixed-replace; boundary=frame")
+                self.end_headers()
+                with display._cond:
+                    display.clients += 1
+                seq = 0
+                try:
+                    while True:
+                        with display._cond:
+                            display._cond.wait_for(lambda: display._seq != seq, timeout=5.0)
+                            seq, jpeg = display._seq, display._jpeg
+                        if jpeg is None:
+                            continue
+                        self.wfile.write(b"--frame\r\nContent-Type: image/jpeg\r\n")
+                        self.wfile.write(f"Content-Length: {len(jpeg)}\r\n\r\n".encode())
+                        self.wfile.write(jpeg)
+                        self.wfile.write(b"\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    with display._cond:
+                        display.clients -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, name="MJPEG", daemon=True)
+        self._thread.start()
+        print(f"MJPEG stream: http://{host}:{port}/")
+
+    def wants_frame(self, now):
+        # İzleyen yoksa overlay çizme / encode etme
+        return self.clients > 0 and super().wants_frame(now)
+
+    def show(self, frame):
+        ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        if ok:
+            with self._cond:
+                self._jpeg = buf.tobytes()
+                self._seq += 1
+                self._cond.notify_all()
+            self.shown += 1
+        return False
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# ---------- SHARED MEMORY RING ----------
+# Yerleşim: header int64[4] = [yazılan frame sayısı, height, width, slot sayısı],
+# slot_seq int64[slots] (her slotta hangi frame var), ardından slots × (h × w × 3) byte.
+
+SHM_NAME = "piaget_frames"
+_HEADER = 4
+
+
+class SharedMemoryDisplay(_Throttled):
+    def __init__(self, name=SHM_NAME, slots=4, fps=15):
+        super().__init__(fps)
+        self.name = name
+        self.slots = slots
+        self.shm = None
+
+    def _create(self, shape):
+        h, w = shape[:2]
+        size = (_HEADER + self.slots) * 8 + self.slots * h * w * 3
+        try:
+            # Önceki çalıştırmadan kalan segment
+            old = shared_memory.SharedMemory(name=self.name)
+            old.close()
+            old.unlink()
+        except FileNotFoundError:
+            pass
+        self.shm = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+        self.header = np.ndarray((_HEADER,), dtype=np.int64, buffer=self.shm.buf)
+        self.slot_seq = np.ndarray((self.slots,), dtype=np.int64, buffer=self.shm.buf,
+                                   offset=_HEADER * 8)
+        self.frames = np.ndarray((self.slots, h, w, 3), dtype=np.uint8, buffer=self.shm.buf,
+                                 offset=(_HEADER + self.slots) * 8)
+        self.slot_seq[:] = -1
+        self.header[:] = (0, h, w, self.slots)
+
+    def show(self, frame):
+        if self.shm is not None and self.frames.shape[1:3] != frame.shape[:2]:
+            self.close()   # çözünürlük değişti: ring'i yeniden oluştur (okuyucu yeniden bağlanır)
+        if self.shm is None:
+            self._create(frame.shape)
+        seq = int(self.header[0])
+        slot = seq % self.slots
+        self.slot_seq[slot] = -1           # okuyucu yarım frame almasın
+        self.frames[slot] = frame
+        self.slot_seq[slot] = seq
+        self.header[0] = seq + 1
+        self.shown += 1
+        return False
+
+    def close(self):
+        if self.shm is not None:
+            del self.header, self.slot_seq, self.frames
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+
+class SharedMemoryReader:
+    """Başka süreçten en son frame'i okur. read() → (seq, frame) ya da (None, None)."""
+
+    def __init__(self, name=SHM_NAME):
+        self.shm = shared_memory.SharedMemory(name=name)
+        # Python < 3.13: okuyucu çıkarken resource_tracker segmenti silmesin (sahibi yazan süreç)
+        try:
+            resource_tracker.unregister(self.shm._name, "shared_memory")
+        except Exception:
+            pass
+        header = np.ndarray((_HEADER,), dtype=np.int64, buffer=self.shm.buf)
+        _, h, w, slots = (int(v) for v in header)
+        self.header = header
+        self.slot_seq = np.ndarray((slots,), dtype=np.int64, buffer=self.shm.buf, offset=_HEADER * 8)
+        self.frames = np.ndarray((slots, h, w, 3), dtype=np.uint8, buffer=self.shm.buf,
+                                 offset=(_HEADER + slots) * 8)
+        self.slots = slots
+
+    def read(self):
+        seq = int(self.header[0]) - 1
+        if seq < 0:
+            return None, None
+        slot = seq % self.slots
+        frame = self.frames[slot].copy()
+        # Kopyalarken üstüne yazıldıysa at
+        if int(self.slot_seq[slot]) != seq:
+            return None, None
+        return seq, frame
+
+    def close(self):
+        del self.header, self.slot_seq, self.frames
+        self.shm.close()
+
+
+def create_display(mode="off", **params):
+    displays = {
+        "off": NullDisplay,
+        "preview": PreviewDisplay,
+        "mjpeg": MJPEGDisplay,
+        "shm": SharedMemoryDisplay,
+    }
+    if mode not in displays:
+        raise ValueError(f"Bilinmeyen display modu: {mode} (seçenekler: {', '.join(displays)})")
+    return displays[mode](**params)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="face_track.py'nin shared-memory çıkışını izle")
+    parser.add_argument("--name", default=SHM_NAME)
+    parser.add_argument("--scale", type=float, default=1.5)
+    args = parser.parse_args()
+
+    reader = SharedMemoryReader(args.name)
+    last = None
+    try:
+        while True:
+            seq, frame = reader.read()
+            if seq is not None and seq != last:
+                last = seq
+                if args.scale != 1.0:
+                    frame = cv2.resize(frame, None, fx=args.scale, fy=args.scale)
+                cv2.imshow("Piaget (shm)", frame)
+            if cv2.waitKey(15) & 0xFF == ord("q"):
+                break
+    finally:
+        reader.close()
+        cv2.destroyAllWindows()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,18 @@
 import cv2
-import os
 
-def find_haar_cascade():
-    # Muhtemel klasörler
-    candidates = [
-        "/usr/share/opencv4/haarcascades",
-        "/usr/share/opencv/haarcascades",
-    ]
+from config import load_config
+from detectors import create_detector
 
-    for base in candidates:
-        path = os.path.join(base, "haarcascade_frontalface_default.xml")
-        if os.path.exists(path):
-            print("Using cascade:", path)
-            return path
+# Backend ("haar", "lbp", "yunet"), cascade / model yolu ve kamera ortak config'ten
+cfg = load_config()
 
-    raise RuntimeError("haarcascade_frontalface_default.xml not found in known locations")
+face_detector = create_detector(cfg.DETECTOR_BACKEND, cascade_path=cfg.CASCADE_PATH,
+                                model_path=cfg.MODEL_PATH,
+                                scaleFactor=1.1, minNeighbors=5)
 
-cascade_path = find_haar_cascade()
+print("Using detector:", face_detector.name, getattr(face_detector, "path", ""))
 
-face_cascade = cv2.CascadeClassifier(cascade_path)
-
-cap = cv2.VideoCapture(0)  # gerekirse 1 veya 2
+cap = cv2.VideoCapture(cfg.CAM_INDEX)
 
 if not cap.isOpened():
     print("Kamera açılamadı.")
@@ -31,16 +23,15 @@ while True:
     if not ret:
         break
 
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    if face_detector.uses_color:
+        image = frame
+    else:
+        image = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
 
-    faces = face_cascade.detectMultiScale(
-        gray,
-        scaleFactor=1.1,
-        minNeighbors=5,
-        minSize=(60, 60)
-    )
+    faces = face_detector.detect(image, min_size=(60, 60))
 
-    for (x, y, w, h) in faces:
+    for (x, y, w, h, score) in faces:
+        x, y, w, h = int(x), int(y), int(w), int(h)
         cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
 
     cv2.imshow("Piaget Face Detection", frame)
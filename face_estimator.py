@@ -0,0 +1,146 @@
+from collections import deque
+
+import numpy as np
+
+# ---------- FACE STATE ESTIMATORS ----------
+# Yüz merkezinin filtrelenmiş / ileriye tahmin edilmiş konumu.
+# Ortak arayüz:
+#   update(cx, cy, t)  → ölçüm ekle
+#   predict(t)         → t anındaki tahmini (x, y) (int)
+#   has_track(t)       → t anında hâlâ güvenilir bir tahmin var mı
+#   coast(t, ahead)    → t'de yüz yok: t + ahead için tahmin edilen (x, y), takip bittiyse None
+#   reset()
+
+
+class MovingAverageEstimator:
+    """Eski davranış: son N merkezin ortalaması. Yarım pencere kadar geriden gelir,
+    tek bir kaçırılan detection'da sıfırlanır."""
+
+    name = "average"
+
+    def __init__(self, window=4):
+        self.centers = deque(maxlen=window)
+        self.last_measurement = None
+
+    def reset(self):
+        self.centers.clear()
+        self.last_measurement = None
+
+    def update(self, cx, cy, t):
+        self.centers.append((cx, cy))
+        self.last_measurement = t
+
+    def has_track(self, t):
+        return len(self.centers) > 0
+
+    def coast(self, t, ahead=0.0):
+        # Yüz yok → buffer temizle
+        self.reset()
+        return None
+
+    def predict(self, t):
+        if not self.centers:
+            return None
+        avg_x = int(sum(p[0] for p in self.centers) / len(self.centers))
+        avg_y = int(sum(p[1] for p in self.centers) / len(self.centers))
+        return (avg_x, avg_y)
+
+
+class KalmanFaceEstimator:
+    """Sabit hız modelli Kalman filtresi, durum [x, y, vx, vy] (piksel, piksel/sn).
+
+    predict(t) ileri zamana ekstrapolasyon yapar: servo komutu uygulanana kadar
+    geçen gecikme telafi edilir, kısa detection kayıplarında (max_coast) takip sürer.
+    """
+
+    name = "kalman"
+
+    H = np.array([[1.0, 0.0, 0.0, 0.0],
+                  [0.0, 1.0, 0.0, 0.0]])
+
+    def __init__(self, accel_std=800.0, measurement_std=4.0, max_coast=0.3,
+                 max_speed=1500.0, bounds=None):
+        self.accel_var = accel_std ** 2
+        self.R = np.eye(2) * measurement_std ** 2
+        self.max_coast = max_coast   # ölçümsüz en fazla kaç saniye tahminle devam edilsin
+        self.max_speed = max_speed   # saçma hız tahminlerini kırp (piksel/sn)
+        self.bounds = bounds         # (width, height): tahmin frame dışına taşmasın
+        self.reset()
+
+    def reset(self):
+        self.x = None
+        self.P = None
+        self.t = None
+        self.last_measurement = None
+
+    def _propagate(self, dt):
+        F = np.eye(4)
+        F[0, 2] = F[1, 3] = dt
+
+        dt2 = dt * dt
+        q = self.accel_var
+        Q = np.zeros((4, 4))
+        Q[0, 0] = Q[1, 1] = q * dt2 * dt2 / 4
+        Q[0, 2] = Q[2, 0] = Q[1, 3] = Q[3, 1] = q * dt2 * dt / 2
+        Q[2, 2] = Q[3, 3] = q * dt2
+
+        self.x = F @ self.x
+        self.P = F @ self.P @ F.T + Q
+
+    def update(self, cx, cy, t):
+        z = np.array([cx, cy], dtype=np.float64)
+
+        if self.x is None:
+            self.x = np.array([cx, cy, 0.0, 0.0])
+            # Hız bilinmiyor: büyük belirsizlikle başla
+            self.P = np.diag([self.R[0, 0], self.R[1, 1], 500.0 ** 2, 500.0 ** 2])
+        else:
+            dt = max(0.0, t - self.t)
+            self._propagate(dt)
+
+            S = self.H @ self.P @ self.H.T + self.R
+            K = self.P @ self.H.T @ np.linalg.inv(S)
+            self.x = self.x + K @ (z - self.H @ self.x)
+            self.P = (np.eye(4) - K @ self.H) @ self.P
+            np.clip(self.x[2:], -self.max_speed, self.max_speed, out=self.x[2:])
+
+        self.t = t
+        self.last_measurement = t
+
+    def has_track(self, t):
+        return self.last_measurement is not None and t - self.last_measurement <= self.max_coast
+
+    def coast(self, t, ahead=0.0):
+        if not self.has_track(t):
+            self.reset()
+            return None
+        return self.predict(t + ahead)
+
+    def velocity(self):
+        if self.x is None:
+            return None
+        return (float(self.x[2]), float(self.x[3]))
+
+    def predict(self, t):
+        if self.x is None:
+            return None
+        dt = t - self.t
+        px = self.x[0] + self.x[2] * dt
+        py = self.x[1] + self.x[3] * dt
+        if self.bounds is not None:
+            px = min(max(px, 0), self.bounds[0] - 1)
+            py = min(max(py, 0), self.bounds[1] - 1)
+        return (int(px), int(py))
+
+
+ESTIMATORS = {
+    "average": MovingAverageEstimator,
+    "kalman": KalmanFaceEstimator,
+}
+
+
+def create_estimator(name="kalman", **params):
+    """Config'teki isimle estimator oluşturur: "average" ya da "kalman"."""
+    if name not in ESTIMATORS:
+        raise ValueError(f"Bilinmeyen estimator: {name} (seçenekler: {', '.join(ESTIMATORS)})")
+    return ESTIMATORS[name](**params)
@@ -1,18 +1,30 @@
 import cv2
 
+from config import load_config
+from detectors import create_detector
+from pyramid import ImagePyramid
+
 # --- AYARLAR ---
-CAM_INDEX = 0   # gerekirse 1 veya 2 yaparsın
-WIDTH = 320
-HEIGHT = 240
+# Kamera, detector backend ve cascade yolu ortak config'ten (piaget.toml / PIAGET_* env)
+cfg = load_config()
+CAM_INDEX = cfg.CAM_INDEX
+WIDTH = cfg.WIDTH
+HEIGHT = cfg.HEIGHT
 DOWNSCALE = 0.5  # algılama için küçültme oranı (0.5 = %50)
 
-CASCADE_PATH = "/usr/share/opencv4/haarcascades/haarcascade_frontalface_default.xml"
-# Eğer sende bu klasör değilse, daha önce bulduğumuz yolu yaz:
-# CASCADE_PATH = "/usr/share/opencv/haarcascades/haarcascade_frontalface_default.xml"
+DETECTOR_BACKEND = cfg.DETECTOR_BACKEND   # "lbp" daha da hızlı
+CASCADE_PATH = cfg.CASCADE_PATH
+MODEL_PATH = cfg.MODEL_PATH
 
-face_cascade = cv2.CascadeClassifier(CASCADE_PATH)
-if face_cascade.empty():
-    raise RuntimeError(f"Yüz cascade yüklenemedi: {CASCADE_PATH}")
+# Daha hızlı ama hâlâ işe yarar parametreler (YuNet kullanmaz, factory atar)
+face_detector = create_detector(
+    DETECTOR_BACKEND,
+    cascade_path=CASCADE_PATH,
+    model_path=MODEL_PATH,
+    scaleFactor=1.1,    # 1.1 -> daha hızlı, 1.3 -> daha hızlı ama bazen kaçırır
+    minNeighbors=4,     # daha düşük = daha fazla/çabuk algılama
+    score_threshold=cfg.YUNET_SCORE_THRESHOLD,
+)
 
 cap = cv2.VideoCapture(CAM_INDEX)
 
@@ -24,6 +36,9 @@ if not cap.isOpened():
     print("Kamera açılamadı.")
     exit()
 
+# Gri ton ve küçültülmüş buffer'lar bir kere ayrılır, her framede üstüne yazılır
+pyramid = ImagePyramid(scales=(DOWNSCALE,))
+
 print("Face detection (fast mode) başlıyor. Kapatmak için 'q'ya bas.")
 
 while True:
@@ -31,30 +46,23 @@ while True:
     if not ret:
         break
 
-    # Gri ton ve küçültme
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-
-    small_gray = cv2.resize(
-        gray,
-        (0, 0),
-        fx=DOWNSCALE,
-        fy=DOWNSCALE
-    )
-
-    # Daha hızlı ama hâlâ işe yarar parametreler
-    faces = face_cascade.detectMultiScale(
-        small_gray,
-        scaleFactor=1.1,    # 1.1 -> daha hızlı, 1.3 -> daha hızlı ama bazen kaçırır
-        minNeighbors=4,     # daha düşük = daha fazla/çabuk algılama
-        minSize=(40, 40)
-    )
+    if face_detector.uses_color:
+        # Renkli çalışan detector (YuNet) küçültülmemiş BGR frame'i alır
+        faces = face_detector.detect(frame, min_size=(80, 80))
+        scale = 1.0
+    else:
+        # Gri ton ve küçültme
+        pyramid.update_bgr(frame)
+        small_gray = pyramid.level(DOWNSCALE)
+        faces = face_detector.detect(small_gray, min_size=(40, 40))
+        scale = DOWNSCALE
 
     # Küçük görüntüde bulduğumuz yüzleri orijinal boyuta geri ölçekle
-    for (x, y, w, h) in faces:
-        x = int(x / DOWNSCALE)
-        y = int(y / DOWNSCALE)
-        w = int(w / DOWNSCALE)
-        h = int(h / DOWNSCALE)
+    for (x, y, w, h, score) in faces:
+        x = int(x / scale)
+        y = int(y / scale)
+        w = int(w / scale)
+        h = int(h / scale)
 
         cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
 
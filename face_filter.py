@@ -0,0 +1,63 @@
+import numpy as np
+
+# ---------- VECTORIZED FACE FILTER ----------
+# detectMultiScale çıktısı üstünde alan / en-boy / üst bant filtreleri ve
+# en büyük yüz seçimi, Python döngüsü yerine tek seferde array işlemleriyle.
+
+# Dönen array sütunları
+X, Y, W, H, CX, CY = range(6)
+
+
+def filter_faces(boxes, min_area=0, max_area=None, min_aspect=0.0, max_aspect=None,
+                 top_ignore_y=0):
+    """boxes: (N, 4+) [x, y, w, h, ...] → int32 (M, 6) [x, y, w, h, cx, cy].
+
+    Alanı [min_area, max_area], en-boy oranı (w/h) [min_aspect, max_aspect] dışında
+    kalan ya da merkezi top_ignore_y'nin üstünde olan kutular atılır.
+    """
+    boxes = np.asarray(boxes)
+    if len(boxes) == 0:
+        return np.empty((0, 6), dtype=np.int32)
+
+    faces = np.empty((len(boxes), 6), dtype=np.int32)
+    faces[:, :4] = boxes[:, :4]
+    w = faces[:, W]
+    h = faces[:, H]
+    faces[:, CX] = faces[:, X] + w // 2
+    faces[:, CY] = faces[:, Y] + h // 2
+
+    area = w * h
+    keep = area >= min_area
+    if max_area is not None:
+        keep &= area <= max_area
+
+    # w/h oranını bölme yapmadan karşılaştır: min_aspect*h <= w <= max_aspect*h
+    keep &= w >= min_aspect * h
+    if max_aspect is not None:
+        keep &= w <= max_aspect * h
+
+    if top_ignore_y:
+        keep &= faces[:, CY] >= top_ignore_y
+
+    return faces[keep]
+
+
+def iou_matrix(a, b):
+    """a: (N, 4), b: (M, 4) [x, y, w, h] → (N, M) IoU."""
+    ax1, ay1 = a[:, 0:1], a[:, 1:2]
+    ax2, ay2 = ax1 + a[:, 2:3], ay1 + a[:, 3:4]
+    bx1, by1 = b[:, 0], b[:, 1]
+    bx2, by2 = bx1 + b[:, 2], by1 + b[:, 3]
+
+    iw = np.clip(np.minimum(ax2, bx2) - np.maximum(ax1, bx1), 0, None)
+    ih = np.clip(np.minimum(ay2, by2) - np.maximum(ay1, by1), 0, None)
+    inter = iw * ih
+    union = a[:, 2:3] * a[:, 3:4] + b[:, 2] * b[:, 3] - inter
+    return inter / np.maximum(union, 1e-6)
+
+
+def largest_face(faces):
+    """En büyük alanlı satırı döndürür, yüz yoksa None."""
+    if len(faces) == 0:
+        return None
+    return faces[np.argmax(faces[:, W] * faces[:, H])]
@@ -1,328 +1,556 @@
 import cv2
+import numpy as np
+import os
+import signal
+import sys
 import time
-from collections import deque
-from adafruit_servokit import ServoKit
-import subprocess  # audio
 
-# ---------- CAMERA SETTINGS ----------
-CAM_INDEX = 0
-WIDTH = 320
-HEIGHT = 240
-
-# Detection için küçültme oranı
-DOWNSCALE = 1
+from actuator import ServoActuator
+from audio_engine import create_audio_engine
+from behaviour import Behaviour, EventBus
+from capture import FrameGrabber, open_source
+from config import load_config
+from detect_track import DetectThenTrack
+from detectors import create_detector
+from display import create_display
+from governor import Governor, create_sensors, make_levels
+from metrics import create_metrics
+from motion_gate import MotionGate
+from perception import Perception, filter_detections, make_controller, search_top_y
+from phrase_cache import PhraseCache, load_phrases
+from face_filter import filter_faces
+from lip_sync import JawAnimator
+from pyramid import ImagePyramid
+from roi_search import detect_in_region, full_region, search_region
+from servo_driver import create_servo_driver
+from session import SessionRecorder, SessionSource, is_session
+from startup import Startup
+
+# ---------- CONFIG ----------
+# Tüm ayarlar config.py'de (varsayılanlar), piaget.toml'da ve PIAGET_<AYAR> env'lerinde.
+# Dead zone / adım / detector / filtre gibi ayarlar çalışırken piaget.toml'dan değiştirilebilir:
+# framelerin arasında uygulanır, kamera / cascade / servo merkezleme yeniden yapılmaz.
+cfg = load_config()
+WIDTH = cfg.WIDTH
+HEIGHT = cfg.HEIGHT
+
+# Frame kaynağı: kamera index'i, "synthetic", video dosyası / frame klasörü yolu
+# ya da kaydedilmiş oturum klasörü (replay). Komut satırından da verilebilir:
+#   python face_track.py sessions/2026-10-18_festival
+FRAME_SOURCE = cfg.CAM_INDEX if cfg.FRAME_SOURCE is None else cfg.FRAME_SOURCE
+if len(sys.argv) > 1:
+    FRAME_SOURCE = sys.argv[1]
+
+# ---------- SESSION RECORD / REPLAY ----------
+# RECORD_SESSION: klasör verilirse frame'ler, yüzler, kontrol durumu ve servo komutları kaydedilir.
+# Replay'de (FRAME_SOURCE bir oturum) donanım yok: sim servo, sessiz ses, kayıttaki saat;
+# aynı kayıt + aynı ayarlar → aynı servo komutları (python session.py diff ile karşılaştır).
+REPLAY = is_session(FRAME_SOURCE)
+
+replay_source = SessionSource(FRAME_SOURCE) if REPLAY else None
+clock = replay_source.clock if REPLAY else time.time
+
+# ---------- PARALLEL DETECTION ----------
+# DETECT_WORKERS > 0: detection her framede ayrı süreçlerde (çekirdek başına bir worker),
+# frame'ler shared memory'den geçer, sonuçlar frame sırasıyla gelir. Pipeline birkaç frame
+# gecikme ekler; estimator ölçümü frame zamanıyla alıp şimdiye tahmin ettiği için telafi edilir.
+# Bu modda detect-then-track kullanılmaz. 0 = tek süreç (HYBRID_DETECT ayarı geçerli).
+# Worker'lar detector ayarlarını açılışta alır: hot reload sadece tek süreçli detection'a uygulanır.
+#
+# Worker'lar fork ile açılır: pool, hiçbir thread (açılış işleri, ses, servo, çene, kamera)
+# başlamadan burada oluşturulmalı. Yoksa worker'lar o thread'lerin tuttuğu kilitleri ve
+# ses pipe'ının dosya tanımlayıcılarını miras alır.
+# Backend'in kullanmadığı ayarlar (YuNet'te scaleFactor, cascade'de score_threshold) atlanır
+DETECTOR_PARAMS = {
+    "cascade_path": cfg.CASCADE_PATH,
+    "model_path": cfg.MODEL_PATH,
+    "scaleFactor": cfg.SCALE_FACTOR,
+    "minNeighbors": cfg.MIN_NEIGHBORS,
+    "score_threshold": cfg.YUNET_SCORE_THRESHOLD,
+}
+
+detect_pool = None
+if cfg.DETECT_WORKERS > 0:
+    from detect_pool import DetectionPool   # multiprocessing sadece bu modda yüklensin
+    detect_pool = DetectionPool(cfg.DETECTOR_BACKEND, DETECTOR_PARAMS, (HEIGHT, WIDTH, 3),
+                                workers=cfg.DETECT_WORKERS)
+
+# ---------- STARTUP ----------
+# Ses, detector modeli, servo kartı ve kamera açılışta paralel hazırlanır (startup.py);
+# her bölüm kendi sonucunu startup.result() ile alır. Çökme sonrası yeniden başlatmada
+# robot ziyaretçilerin önünde saniyelerce ölü kalmasın.
+startup = Startup()
 
 # ---------- AUDIO SETTINGS ----------
-AUDIO_FILES = ["piaget_0.wav", "piaget_1.wav", "piaget_2.wav"]
-GREET_COOLDOWN = 5.0  # saniye
-last_greet_time = 0.0
+AUDIO_FILES = cfg.AUDIO_FILES
+
+# Geniş selamlama dağarcığı: GREETING_PHRASES'teki cümleler TTS cache'inde varsa onlar çalınır
+# (önceden "python TTS.py" ile sentezlenir, sahada internet gerekmez)
+if os.path.exists(cfg.GREETING_PHRASES):
+    AUDIO_FILES = PhraseCache().files(load_phrases(cfg.GREETING_PHRASES), cfg.TTS_BACKEND) or AUDIO_FILES
+
 greet_index = 0
 
+# Sesler başlangıçta belleğe yüklenir, tek ve kalıcı bir stream'den çalınır.
+AUDIO_BACKEND = "null" if REPLAY else cfg.AUDIO_BACKEND
+startup.start("audio", create_audio_engine, AUDIO_FILES, AUDIO_BACKEND)
+
 def play_greet(index):
     if index < 0 or index >= len(AUDIO_FILES):
         return
-    filename = AUDIO_FILES[index]
-    try:
-        subprocess.Popen(
-            ["pw-play", filename],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL
-        )
-        print(f"Playing (BT via PipeWire): {filename}")
-    except Exception as e:
-        print("Audio play error:", e)
+    audio.play(index)
+    print(f"Playing ({AUDIO_BACKEND}): {AUDIO_FILES[index]}")
 
+def on_greet(now, target):
+    """Davranış "greet" yayınlayınca sıradaki selamlamayı çal."""
+    global greet_index
+    play_greet(greet_index)
+    greet_index = (greet_index + 1) % len(AUDIO_FILES)
 
-# ---------- CASCADE PATH ----------
-CASCADE_PATH = "/usr/share/opencv4/haarcascades/haarcascade_frontalface_default.xml"
-# Gerekirse kendi yolunla değiştir:
-# CASCADE_PATH = "/usr/share/opencv/haarcascades/haarcascade_frontalface_default.xml"
 
-face_cascade = cv2.CascadeClassifier(CASCADE_PATH)
-if face_cascade.empty():
-    raise RuntimeError(f"Yüz cascade yüklenemedi: {CASCADE_PATH}")
+# ---------- DETECTOR ----------
+# Cascade XML'inin parse edilmesi (Pi'de ~0.2 s) kamera / servo açılırken arka planda
+startup.start("detector", create_detector, cfg.DETECTOR_BACKEND, **DETECTOR_PARAMS)
 
 # ---------- SERVO SETTINGS ----------
-kit = ServoKit(channels=16)
-
-NECK_YAW_CH = 1    # sağ-sol
-NECK_TILT_CH = 0   # yukarı-aşağı
-
-# YAW: 90 = sol, 135 = orta, 180 = sağ
-YAW_MIN = 90
-YAW_MAX = 180
-YAW_CENTER = 135
-
-# TILT: ayarlanabilir güvenli aralık
-TILT_MIN = 60
-TILT_MAX = 120
-TILT_CENTER = 90
-
-for ch in [NECK_YAW_CH, NECK_TILT_CH]:
-    kit.servo[ch].set_pulse_width_range(500, 2500)
-
-yaw_angle = YAW_CENTER
-tilt_angle = TILT_CENTER
-
-kit.servo[NECK_YAW_CH].angle = yaw_angle
-kit.servo[NECK_TILT_CH].angle = tilt_angle
-time.sleep(1)
+NECK_YAW_CH = cfg.NECK_YAW_CH
+NECK_TILT_CH = cfg.NECK_TILT_CH
 
-# ---------- CONTROL PARAMS (RULE-BASED) ----------
+yaw_angle = cfg.YAW_CENTER
+tilt_angle = cfg.TILT_CENTER
 
-# Hata bölgeleri:
-DEAD_ZONE_SMALL_X = 35   # merkez civarı, hiç hareket yok
-DEAD_ZONE_LARGE_X = 120  # çok uzakta → büyük adım
-
-DEAD_ZONE_SMALL_Y = 18
-DEAD_ZONE_LARGE_Y = 60
+def init_servos():
+    """Driver + kanal ayarları + merkeze gönderme. Varış beklenmez (bkz. wait_settled)."""
+    if REPLAY:
+        driver = create_servo_driver("sim", clock=clock)
+    else:
+        driver = create_servo_driver(cfg.SERVO_BACKEND)
+    driver.settle_speed = cfg.SERVO_SETTLE_SPEED
+    for ch in [NECK_YAW_CH, NECK_TILT_CH, cfg.JAW_CH]:
+        driver.setup(ch, 500, 2500)
+    driver.set_angles({NECK_YAW_CH: yaw_angle, NECK_TILT_CH: tilt_angle})
+    return driver
+
+startup.start("servos", init_servos)
+
+# Kamera da beklemeden açılmaya başlasın (V4L2 açılışı Pi'de yarım saniyeyi bulabiliyor)
+if not REPLAY:
+    startup.start("camera", open_source, FRAME_SOURCE, WIDTH, HEIGHT)
+
+audio = startup.result("audio")
+face_detector = startup.result("detector")
+servos = startup.result("servos")
+
+# Servo yazımı ayrı thread'de: vision I2C'yi beklemez, hareket detection
+# zamanlamasından bağımsız olarak SERVO_RATE_HZ'de yumuşakça interpolasyonlanır.
+# Replay'de thread zamanlaması sonucu değiştirmesin diye kapalı.
+neck = None
+if cfg.SERVO_ASYNC and not REPLAY:
+    neck = ServoActuator(servos, [NECK_YAW_CH, NECK_TILT_CH],
+                         rate_hz=cfg.SERVO_RATE_HZ, max_speed=cfg.SERVO_MAX_SPEED).start()
+
+# Lip-sync: çene, çalan selamlamanın önceden hesaplanmış zarfını takip eder
+jaw = None
+if cfg.LIP_SYNC and not REPLAY:
+    jaw = JawAnimator(servos, cfg.JAW_CH, audio,
+                      closed_angle=cfg.JAW_CLOSED_ANGLE, open_angle=cfg.JAW_OPEN_ANGLE).start()
+
+# ---------- CONTROL ----------
+last_command = (yaw_angle, tilt_angle)
+
+# Çoklu yüz takibi (kalıcı ID) + yüz merkezi tahmini (ESTIMATOR): perception.py, Piaget.py ile ortak
+perception = Perception(cfg)
+people = perception.people
+estimator = perception.estimator
+
+# Servoları her framede değil, her UPDATE_EVERY framede güncelle
+frame_count = 0
 
-# Servo adımları (derece)
-YAW_STEP_SMALL = 2
-YAW_STEP_LARGE = 5
+# ---------- FACE FILTER PARAMS ----------
+# Flamaları / posterleri elemek için ek filtreler ve üst bant (perception.filter_detections);
+# YuNet'te kapalı. Arama bandın biraz üstünden başlar:
+SEARCH_TOP_Y = search_top_y(cfg)
 
-TILT_STEP_SMALL = 2
-TILT_STEP_LARGE = 4
+# ---------- ROI SEARCH ----------
+# Önceki framede yüz varsa sadece onun çevresinde ara; kaçırınca tam frame'e dön.
+# ROI hedefin çevresine ve boyut bandına bakar: yeni gelenler de track / selam alsın diye
+# her ROI_FULL_EVERY'inci detection yine tam frame (coarse) yapılır.
+roi_searches = 0
 
-# Yüz kaybolunca merkeze dönme ve scan
-NO_FACE_TIMEOUT = 1.5  # yüz yoksa, bu kadar saniye sonra "return to neutral"
-last_seen_time = time.time()
+# ---------- MOTION GATE ----------
+# Kimse yokken (track yok) durağan framelerde detection atlanır. Kafa hareket ederken
+# gate kapalı: servo_moving son kontrol adımında komut değişti mi.
+motion_gate = MotionGate(threshold=cfg.MOTION_THRESHOLD, min_area=cfg.MOTION_MIN_AREA,
+                         settle=cfg.MOTION_SETTLE, max_skip=cfg.MOTION_MAX_SKIP)
+servo_moving = True
+EMPTY_FACES = np.empty((0, 6), dtype=np.int32)
 
-# Yüz merkezini yumuşatma
-FACE_SMOOTH_WINDOW = 4
-face_centers = deque(maxlen=FACE_SMOOTH_WINDOW)
+# Governor'ın detection ölçeği çarpanı (kapalıyken 1)
+detect_scale = 1.0
 
-# Servoları her framede değil, her N framede güncelle
-frame_count = 0
-UPDATE_EVERY = 1
+# ---------- DETECT-THEN-TRACK ----------
+# HYBRID_DETECT: cascade her framede değil, her DETECT_EVERY framede bir çalışır;
+# arada son yüz template match ile takip edilir.
+last_cost_report = clock()
 
-# Scan davranışı
-SCANNING = False
-SCAN_STEP = 1          # scan sırasında yaw adımı (derece)
-scan_direction = 1     # +1 sağa, -1 sola
 
-# ---------- FACE FILTER PARAMS ----------
-# Flamaları / posterleri elemek için ek filtreler
-
-MIN_FACE_SIZE = 40      # minWidth/minHeight (piksel)
-MIN_FACE_AREA = 40 * 40
-MAX_FACE_AREA = int(WIDTH * HEIGHT * 0.4)   # frame'in %40'ından büyükse yüz sayma
-
-MIN_ASPECT = 0.7        # w/h (çok dikdörtgen şeyleri at)
-MAX_ASPECT = 1.4
+# ---------- HELPERS ----------
 
-TOP_IGNORE_RATIO = 0.22  # frame'in üst %22'lik kısmındaki "yüzleri" yok say (flama bandı gibi)
+def draw_overlay(frame, tracks, target, target_center):
+    for tr in tracks:
+        color, thickness = ((0, 255, 0), 2) if tr is target else ((160, 160, 160), 1)
+        tx, ty, tw, th = tr.box
+        cv2.rectangle(frame, (tx, ty), (tx + tw, ty + th), color, thickness)
+        cv2.putText(frame, str(tr.id), (tx, ty - 3), cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1)
+
+    if target_center is not None:
+        # Yeşil: ölçümle güncel tahmin, sarı: yüz kaybında tahminle devam
+        color = (0, 255, 0) if target is not None else (0, 255, 255)
+        cv2.circle(frame, tuple(target_center), 4, color, -1)
+
+    cv2.circle(frame, (WIDTH // 2, HEIGHT // 2), 4, (0, 0, 255), -1)
+
+def search_params(now):
+    """Bu framede nereye / hangi ölçekte bakılacak: (region, scale, min_size, max_size)."""
+    global roi_searches
+    use_roi = cfg.ROI_SEARCH and estimator.has_track(now) and perception.last_face_size is not None
+    if use_roi:
+        roi_searches += 1
+        # Ara sıra tam frame: hedef dışındaki yüzler de görülsün
+        use_roi = cfg.ROI_FULL_EVERY <= 0 or roi_searches % cfg.ROI_FULL_EVERY != 0
+    if use_roi:
+        # Son yüzün çevresi (tahmin edilen merkez etrafında)
+        region = search_region(
+            estimator.predict(now), perception.last_face_size, WIDTH, HEIGHT,
+            expand=cfg.ROI_EXPAND, top_ignore_y=SEARCH_TOP_Y
+        )
+        last_w, last_h = perception.last_face_size
+        min_side = max(cfg.MIN_FACE_SIZE, int(min(last_w, last_h) / cfg.ROI_SIZE_CHANGE))
+        max_side = int(max(last_w, last_h) * cfg.ROI_SIZE_CHANGE)
+        return region, cfg.FINE_SCALE * detect_scale, (min_side, min_side), (max_side, max_side)
 
+    region = full_region(WIDTH, HEIGHT, SEARCH_TOP_Y)
+    return region, cfg.COARSE_SCALE * detect_scale, (cfg.MIN_FACE_SIZE, cfg.MIN_FACE_SIZE), None
 
-# ---------- HELPERS ----------
+def detect_faces(gray):
+    """Detection (yüz varsa onun çevresinde) + filtreler. int32 (N, 6) [x, y, w, h, cx, cy] döndürür.
 
-def clamp(value, lo, hi):
-    return max(lo, min(hi, value))
+    gray, pyramid'in o frame için güncellenmiş taban seviyesi olmalı.
+    Renkli çalışan detector'lar (YuNet) o anki frame'i tam ölçekte kullanır.
+    """
+    region, scale, min_size, max_size = search_params(now)
 
-def step_towards(current, target, max_step):
-    """current değerini target'a doğru en fazla max_step kadar yaklaştır."""
-    if abs(target - current) <= max_step:
-        return target
-    return current + max_step if target > current else current - max_step
+    if face_detector.uses_color:
+        image, scale = frame, 1.0
+    else:
+        image = pyramid.level(scale)
+
+    faces_raw = detect_in_region(
+        face_detector,
+        image,
+        region,
+        scale=scale,
+        min_size=min_size,
+        max_size=max_size,
+    )
+    metrics.lap("detect")
+    faces = filter_detections(cfg, faces_raw)
+    metrics.lap("filter")
+    return faces
+
+
+pyramid = ImagePyramid(scales=(cfg.FINE_SCALE, cfg.COARSE_SCALE))
+
+detector = DetectThenTrack(
+    detect_faces,
+    detect_every=cfg.DETECT_EVERY,
+    min_confidence=cfg.TRACK_MIN_CONFIDENCE,
+    search_margin=cfg.TRACK_SEARCH_MARGIN,
+)
+
+# ---------- METRICS ----------
+# Aşama süreleri (capture, gray, detect, filter, track, control, servo, display) için
+# p50/p95/max, FPS, atlanan frame. METRICS_FILE'a her raporda bir JSON satırı eklenir.
+# Kapalıyken ölçüm yapılmaz.
+metrics = create_metrics(cfg.METRICS, report_every=cfg.METRICS_EVERY, json_path=cfg.METRICS_FILE)
+
+# ---------- DISPLAY ----------
+# "off": monitörsüz üretim (GUI'ye sıfır maliyet), "preview": DISPLAY_FPS'te pencere,
+# "mjpeg": http://<pi>:MJPEG_PORT/, "shm": shared memory, "python display.py" ile izlenir
+
+if cfg.DISPLAY_MODE == "preview":
+    display = create_display("preview", title="Piaget Head Tracking (Filtered)", fps=cfg.DISPLAY_FPS)
+elif cfg.DISPLAY_MODE == "mjpeg":
+    display = create_display("mjpeg", port=cfg.MJPEG_PORT, fps=cfg.DISPLAY_FPS)
+elif cfg.DISPLAY_MODE == "shm":
+    display = create_display("shm", fps=cfg.DISPLAY_FPS)
+else:
+    display = create_display("off")
 
 # ---------- CAMERA ----------
-cap = cv2.VideoCapture(CAM_INDEX)
-cap.set(cv2.CAP_PROP_FRAME_WIDTH, WIDTH)
-cap.set(cv2.CAP_PROP_FRAME_HEIGHT, HEIGHT)
+# cap.read() ayrı thread'de: detection hep en yeni frame üzerinde çalışır.
+# Replay'de thread yok: her kayıtlı frame sırayla, atlanmadan işlenir.
+if REPLAY:
+    cap = replay_source
+else:
+    cap = FrameGrabber(startup.result("camera"))
+startup.close()
 
 if not cap.isOpened():
     print("Kamera açılamadı.")
     raise SystemExit
 
-print("Piaget head tracking (track + auto-center + scan + audio, filtered faces) başlıyor. Çıkmak için 'q'.")
-
-while True:
-    ret, frame = cap.read()
-    if not ret:
-        break
-
-    frame_count += 1
-    now = time.time()
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-
-    # Detection için küçült
-    small_gray = cv2.resize(gray, (0, 0), fx=DOWNSCALE, fy=DOWNSCALE)
-
-    # --- DAHA SERT HAAR PARAMETRELERİ ---
-    faces_raw = face_cascade.detectMultiScale(
-        small_gray,
-        scaleFactor=1.15,   # 1.1'den biraz daha seçici
-        minNeighbors=6,     # 3–5'ten daha yüksek: daha az false positive
-        minSize=(MIN_FACE_SIZE, MIN_FACE_SIZE)
+if not REPLAY:
+    cap.start()
+
+# ---------- GOVERNOR ----------
+# Takipte gecikme GOVERNOR_TARGET_MS altında kalsın, sıcakta Pi throttle'a girmesin:
+# detection ölçeği (detect_scale), detection aralığı ve kamera FPS'i profile (idle /
+# scanning / tracking) ve yüke göre config'teki GOVERNOR_* basamaklarında ayarlanır.
+# Replay'de kapalı (gerçek sensörler sonucu değiştirmesin).
+def min_detect_scale():
+    """MIN_FACE_SIZE'lık yüz küçültülmüş görüntüde detector penceresinden küçük kalmasın."""
+    window = max(face_detector.window)
+    if face_detector.uses_color or window == 0:
+        return 0.0
+    return window / (cfg.MIN_FACE_SIZE * min(cfg.COARSE_SCALE, cfg.FINE_SCALE))
+
+def governor_levels():
+    """GOVERNOR_SCALE_STEPS, detector penceresinin bıraktığı ölçek payına göre basamaklara çevrilir."""
+    min_scale = min_detect_scale()
+    if min_scale >= 1.0:
+        print(f"Governor: ölçek payı yok (MIN_FACE_SIZE {cfg.MIN_FACE_SIZE} px × ölçek "
+              f"{min(cfg.COARSE_SCALE, cfg.FINE_SCALE)} = detector penceresi {max(face_detector.window)} px): "
+              f"sadece detection aralığı ve FPS ayarlanır")
+    return make_levels(cfg.GOVERNOR_SCALE_STEPS, cfg.GOVERNOR_DETECT_EVERY, cfg.GOVERNOR_FPS,
+                       min_scale=min_scale)
+
+governor = None
+if cfg.GOVERNOR and not REPLAY:
+    governor = Governor(
+        create_sensors(cfg.GOVERNOR_SENSORS),
+        governor_levels(),
+        {"tracking": cfg.GOVERNOR_TRACKING, "scanning": cfg.GOVERNOR_SCANNING,
+         "idle": cfg.GOVERNOR_IDLE},
+        target_ms=cfg.GOVERNOR_TARGET_MS,
+        temp_high=cfg.GOVERNOR_TEMP_HIGH,
+        temp_low=cfg.GOVERNOR_TEMP_LOW,
+        cpu_high=cfg.GOVERNOR_CPU_HIGH,
+        cpu_low=cfg.GOVERNOR_CPU_LOW,
+        interval=cfg.GOVERNOR_INTERVAL,
+        hold=cfg.GOVERNOR_HOLD,
     )
 
-    # --- EK FİLTRELER UYGULA ---
-    faces = []
-    top_ignore_y = int(HEIGHT * TOP_IGNORE_RATIO)
-
-    for (x, y, w, h) in faces_raw:
-        # DOWNSCALE=1 olduğu için gerek yok ama generik kalsın
-        x = int(x / DOWNSCALE)
-        y = int(y / DOWNSCALE)
-        w = int(w / DOWNSCALE)
-        h = int(h / DOWNSCALE)
-
-        area = w * h
-        if area < MIN_FACE_AREA or area > MAX_FACE_AREA:
-            continue
+# ---------- BEHAVIOUR ----------
+# Idle / Scanning / Acquiring / Tracking / Greeting / Returning durum makinesi (behaviour.py).
+# Ses, servo ve vision tarafı olaylara abone: döngü sadece Percept verir.
+bus = EventBus()
+# Replay'de selamlama süresi gerçek saatle bitmesin: Greeting hemen Tracking'e döner
+head = Behaviour(cfg, make_controller(cfg), bus, yaw_angle, tilt_angle,
+                 speaking=None if REPLAY else audio.is_playing, now=clock())
+
+def write_neck(yaw, tilt):
+    """Kontrol tick'inin sonucu: iki boyun kanalı tick başına tek yazım; değişmeyen açı I2C'ye gitmez."""
+    global yaw_angle, tilt_angle, last_command, servo_moving
+    metrics.lap("control")
+    yaw_angle, tilt_angle = yaw, tilt
+    servo_moving = (yaw, tilt) != last_command
+    last_command = (yaw, tilt)
+    if neck is not None:
+        neck.set_targets({NECK_YAW_CH: yaw, NECK_TILT_CH: tilt})
+    else:
+        servos.set_angles({NECK_YAW_CH: yaw, NECK_TILT_CH: tilt})
+    metrics.lap("servo")
 
-        aspect = w / float(h)
-        if not (MIN_ASPECT <= aspect <= MAX_ASPECT):
-            continue
+bus.subscribe("greet", on_greet)
+bus.subscribe("angles", write_neck)
 
-        cx = x + w // 2
-        cy = y + h // 2
+# Governor profili: kimse yokken ucuz, yüz varken (aday dahil) tam kalite
+GOVERNOR_PROFILES = {
+    "idle": "idle", "returning": "idle", "scanning": "scanning",
+    "acquiring": "tracking", "tracking": "tracking", "greeting": "tracking",
+}
 
-        # Çok yukarıdaki "yüzleri" yok say (duvar bandı/flamalar)
-        if cy < top_ignore_y:
-            continue
+def apply_level(level):
+    global detect_scale
+    detect_scale = level["scale"]
+    detector.detect_every = level["detect_every"]
+    cap.max_fps = level["fps"]
 
-        faces.append((x, y, w, h, cx, cy))
 
-    target_center = None
+def apply_tuning(changed):
+    """piaget.toml'da değişen ayarları çalışan nesnelere uygular (framelerin arasında)."""
+    global SEARCH_TOP_Y
 
-    if len(faces) > 0:
-        # FACE FOUND → tracking moduna dön
-        SCANNING = False
+    if changed & {"DEAD_ZONE_SMALL_X", "DEAD_ZONE_LARGE_X", "DEAD_ZONE_SMALL_Y", "DEAD_ZONE_LARGE_Y",
+                   "YAW_STEP_SMALL", "YAW_STEP_LARGE", "TILT_STEP_SMALL", "TILT_STEP_LARGE",
+                   "PID_YAW_GAINS", "PID_TILT_GAINS", "PID_MAX_SPEED"}:
+        head.controller = make_controller(cfg)
 
-        # En büyük geçerli yüzü seç
-        largest = max(faces, key=lambda f: f[2] * f[3])
-        x, y, w, h, cx, cy = largest
+    motion_gate.threshold = cfg.MOTION_THRESHOLD
+    motion_gate.min_area = cfg.MOTION_MIN_AREA
+    motion_gate.settle = cfg.MOTION_SETTLE
+    motion_gate.max_skip = cfg.MOTION_MAX_SKIP
 
-        # Yumuşatma buffer’ına ekle
-        face_centers.append((cx, cy))
+    face_detector.configure(scaleFactor=cfg.SCALE_FACTOR, minNeighbors=cfg.MIN_NEIGHBORS,
+                            score_threshold=cfg.YUNET_SCORE_THRESHOLD)
 
-        avg_x = int(sum(p[0] for p in face_centers) / len(face_centers))
-        avg_y = int(sum(p[1] for p in face_centers) / len(face_centers))
-        target_center = (avg_x, avg_y)
+    if governor is None:
+        detector.detect_every = max(1, cfg.DETECT_EVERY)
+    else:
+        if "DETECT_EVERY" in changed:
+            print("Config: governor açıkken DETECT_EVERY kullanılmaz (GOVERNOR_DETECT_EVERY geçerli).")
+        if changed & {"MIN_FACE_SIZE", "COARSE_SCALE", "FINE_SCALE"}:
+            governor.levels_table = governor_levels()   # ölçek payı yeniden hesaplansın
+            apply_level(governor.level)
+        governor.target_ms = cfg.GOVERNOR_TARGET_MS
+        governor.temp_high, governor.temp_low = cfg.GOVERNOR_TEMP_HIGH, cfg.GOVERNOR_TEMP_LOW
+        governor.cpu_high, governor.cpu_low = cfg.GOVERNOR_CPU_HIGH, cfg.GOVERNOR_CPU_LOW
+        governor.interval, governor.hold = cfg.GOVERNOR_INTERVAL, cfg.GOVERNOR_HOLD
+    detector.min_confidence = cfg.TRACK_MIN_CONFIDENCE
+    detector.tracker.search_margin = cfg.TRACK_SEARCH_MARGIN
+
+    perception.retune()
+
+    if neck is not None:
+        neck.max_speed = cfg.SERVO_MAX_SPEED
+    if jaw is not None:
+        jaw.closed_angle = cfg.JAW_CLOSED_ANGLE
+        jaw.open_angle = cfg.JAW_OPEN_ANGLE
+    if metrics.enabled:
+        metrics.report_every = cfg.METRICS_EVERY
+
+    SEARCH_TOP_Y = search_top_y(cfg)
+
+
+recorder = None
+if cfg.RECORD_SESSION:
+    settings = dict(cfg.as_dict(), FRAME_SOURCE=FRAME_SOURCE, REPLAY=REPLAY, AUDIO_FILES=AUDIO_FILES)
+    recorder = SessionRecorder(cfg.RECORD_SESSION, meta=settings)
+
+# Monitörsüz çalışırken çıkış: Ctrl+C / SIGTERM döngüyü bitirir, temizlik yapılır
+stop_requested = False
+
+def request_stop(signum, frame):
+    global stop_requested
+    stop_requested = True
+
+signal.signal(signal.SIGINT, request_stop)
+signal.signal(signal.SIGTERM, request_stop)
+
+# Servolar merkeze varmadan vision başlamasın: sabit 1 s yerine sadece tahmini kalan süre
+if not REPLAY:
+    startup.wait_settled(servos)
+print(startup.report())
+
+print("Piaget head tracking (track + auto-center + scan + audio, filtered faces) başlıyor. "
+      "Çıkmak için 'q' (preview) ya da Ctrl+C.")
+
+while not stop_requested:
+    metrics.start_frame()
+    ret, frame = cap.read()
+    if not ret:
+        break
+    metrics.lap("capture")
+    frame_start = time.perf_counter()
 
-        cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
-        cv2.circle(frame, (avg_x, avg_y), 4, (0, 255, 0), -1)
+    # piaget.toml değiştiyse (saniyede bir bakılır) yeni ayarlar bu framede geçerli
+    changed = cfg.poll()
+    if changed:
+        apply_tuning(changed)
 
-        # Yüz gördük → zamanı güncelle
-        last_seen_time = now
+    frame_count += 1
+    now = clock()
+    frame_time = now   # yüzlerin görüldüğü an (pool'da sonuç geldiği andan önce)
+
+    if detect_pool is not None:
+        detect_pool.submit(frame, now, *search_params(now))
+        if not detect_pool.full:
+            continue   # pipeline dolana kadar
+        try:
+            result = detect_pool.result()
+        except RuntimeError as e:
+            print(e)
+            break   # worker düştü: aşağıdaki kapanış shared memory'yi de siler
+        if result is None:
+            continue   # worker'lar yavaş: durma isteğine bakıp tekrar bekle
+        _, frame_time, faces_raw, frame = result
+        metrics.lap("detect")
+        faces = filter_detections(cfg, faces_raw)
+        metrics.lap("filter")
+    elif REPLAY and cfg.REPLAY_DETECTIONS:
+        faces = filter_faces(np.asarray(replay_source.record()["faces"], dtype=np.int32).reshape(-1, 4))
+        metrics.lap("detect")
+    else:
+        gray = pyramid.update_bgr(frame)
+        metrics.lap("gray")
+        idle = not people.tracks and not estimator.has_track(now)
+        if cfg.MOTION_GATE and idle and not motion_gate.update(
+                pyramid.level(cfg.MOTION_SCALE), now, moving=servo_moving):
+            faces = EMPTY_FACES   # durağan sahne, kimse yok: cascade'e gerek yok
+            metrics.lap("gate")
+        elif cfg.HYBRID_DETECT:
+            # Arada template ile takip edilen yüz hedef kişi olsun (en büyük yüz değil)
+            faces = detector.update(gray, people.target.box if people.target is not None else None)
+        else:
+            faces = detect_faces(gray)
+
+    if now - last_cost_report >= cfg.COST_REPORT_EVERY:
+        if detect_pool is not None:
+            print(f"Detect pool: {detect_pool.workers} worker, kuyruk {detect_pool.queue_depth}, "
+                  f"{detect_pool.completed} frame")
+        elif cfg.HYBRID_DETECT:
+            print("Cost:", detector.cost_report())
+        if cfg.MOTION_GATE:
+            print("Idle:", motion_gate.report())
+        last_cost_report = now
+
+    # Kalıcı ID'li track'ler, hedef kişi ve servo gecikmesine göre tahmini merkez
+    tracks, target, target_center = perception.update(faces, frame_time, now)
+    metrics.lap("track")
+
+    # ----- BEHAVIOUR / SERVO CONTROL -----
+    if frame_count % cfg.UPDATE_EVERY == 0:
+        head.update(now, perception.percept(target, target_center, frame_time))
+
+    if recorder is not None:
+        recorder.record(
+            frame_time, frame, faces,
+            yaw=yaw_angle, tilt=tilt_angle,
+            target=target.id if target is not None else None,
+            center=target_center, scanning=head.name == "scanning", state=head.name,
+        )
 
-        # 🔊 Ses çalma mantığı:
-        if now - last_greet_time > GREET_COOLDOWN:
-            play_greet(greet_index)
-            last_greet_time = now
-            greet_index = (greet_index + 1) % len(AUDIO_FILES)
+    # Overlay sadece gösterilecek framelerde çizilir; DISPLAY_MODE="off" iken hiç
+    if display.wants_frame(now):
+        draw_overlay(frame, tracks, target, target_center)
+        if display.show(frame):
+            break
+        metrics.lap("display")
 
-    else:
-        # Yüz yok → buffer temizle
-        face_centers.clear()
-
-    # Ekran merkezi
-    center_x = WIDTH // 2
-    center_y = HEIGHT // 2
-    cv2.circle(frame, (center_x, center_y), 4, (0, 0, 255), -1)
-
-    # ----- SERVO CONTROL -----
-    if frame_count % UPDATE_EVERY == 0:
-        if target_center is not None:
-            # ========== TRACKING MODE ==========
-            face_x, face_y = target_center
-
-            error_x = face_x - center_x   # sağ +, sol -
-            error_y = face_y - center_y   # aşağı +, yukarı -
-
-            # YAW (sağ-sol) rule-based
-            abs_ex = abs(error_x)
-            if abs_ex > DEAD_ZONE_SMALL_X:
-                if abs_ex > DEAD_ZONE_LARGE_X:
-                    step = YAW_STEP_LARGE
-                else:
-                    step = YAW_STEP_SMALL
-
-                direction = 1 if error_x > 0 else -1
-                yaw_angle = clamp(
-                    yaw_angle + direction * step,
-                    YAW_MIN,
-                    YAW_MAX
-                )
-                kit.servo[NECK_YAW_CH].angle = yaw_angle
-
-            # TILT (yukarı-aşağı) rule-based
-            abs_ey = abs(error_y)
-            if abs_ey > DEAD_ZONE_SMALL_Y:
-                if abs_ey > DEAD_ZONE_LARGE_Y:
-                    step = TILT_STEP_LARGE
-                else:
-                    step = TILT_STEP_SMALL
-
-                direction = 1 if error_y > 0 else -1
-                tilt_angle = clamp(
-                    tilt_angle + direction * step,
-                    TILT_MIN,
-                    TILT_MAX
-                )
-                kit.servo[NECK_TILT_CH].angle = tilt_angle
+    if governor is not None:
+        governor.frame((time.perf_counter() - frame_start) * 1000.0)
+        level = governor.update(now, GOVERNOR_PROFILES[head.name])
+        if level is not None:
+            apply_level(level)
 
-        else:
-            # ========== NO FACE ==========
-            time_since_seen = now - last_seen_time
-
-            if time_since_seen <= NO_FACE_TIMEOUT:
-                # RETURN PHASE: önce nötre yumuşak dön
-                SCANNING = False
-                if abs(yaw_angle - YAW_CENTER) > 0.5:
-                    yaw_angle = step_towards(yaw_angle, YAW_CENTER, YAW_STEP_SMALL)
-                    yaw_angle = clamp(yaw_angle, YAW_MIN, YAW_MAX)
-                    kit.servo[NECK_YAW_CH].angle = yaw_angle
-
-                if abs(tilt_angle - TILT_CENTER) > 0.5:
-                    tilt_angle = step_towards(tilt_angle, TILT_CENTER, TILT_STEP_SMALL)
-                    tilt_angle = clamp(tilt_angle, TILT_MIN, TILT_MAX)
-                    kit.servo[NECK_TILT_CH].angle = tilt_angle
-
-            else:
-                # SCAN MODE: nötre yeterince yakınsak taramaya başla
-                if abs(yaw_angle - YAW_CENTER) <= 1.0 and abs(tilt_angle - TILT_CENTER) <= 1.0:
-                    SCANNING = True
-
-                if SCANNING:
-                    # SCAN: kafa sağ-sol yavaşça tarıyor
-                    # Tilt'i merkezde tut
-                    if abs(tilt_angle - TILT_CENTER) > 0.5:
-                        tilt_angle = step_towards(tilt_angle, TILT_CENTER, TILT_STEP_SMALL)
-                        tilt_angle = clamp(tilt_angle, TILT_MIN, TILT_MAX)
-                        kit.servo[NECK_TILT_CH].angle = tilt_angle
-
-                    # Yaw'ı tarama için hareket ettir
-                    yaw_angle += scan_direction * SCAN_STEP
-
-                    # Sınırları kontrol et, kenara gelince yön değiştir
-                    if yaw_angle >= YAW_MAX:
-                        yaw_angle = YAW_MAX
-                        scan_direction = -1
-                    elif yaw_angle <= YAW_MIN:
-                        yaw_angle = YAW_MIN
-                        scan_direction = 1
-
-                    kit.servo[NECK_YAW_CH].angle = yaw_angle
-                else:
-                    # Hâlâ nötre yaklaşma aşamasında
-                    if abs(yaw_angle - YAW_CENTER) > 0.5:
-                        yaw_angle = step_towards(yaw_angle, YAW_CENTER, YAW_STEP_SMALL)
-                        yaw_angle = clamp(yaw_angle, YAW_MIN, YAW_MAX)
-                        kit.servo[NECK_YAW_CH].angle = yaw_angle
-
-                    if abs(tilt_angle - TILT_CENTER) > 0.5:
-                        tilt_angle = step_towards(tilt_angle, TILT_CENTER, TILT_STEP_SMALL)
-                        tilt_angle = clamp(tilt_angle, TILT_MIN, TILT_MAX)
-                        kit.servo[NECK_TILT_CH].angle = tilt_angle
-
-    # Görüntüyü biraz büyüt
-    display = cv2.resize(frame, None, fx=1.5, fy=1.5)
-    cv2.imshow("Piaget Head Tracking (Filtered)", display)
-
-    if cv2.waitKey(1) & 0xFF == ord("q"):
-        break
+    metrics.end_frame(now, dropped=cap.dropped)
 
 cap.release()
-cv2.destroyAllWindows()
+if detect_pool is not None:
+    detect_pool.close()
+if neck is not None:
+    neck.stop()
+if jaw is not None:
+    jaw.stop()
+audio.close()
+display.close()
+metrics.close()
+if recorder is not None:
+    recorder.close()
+if cfg.MOTION_GATE:
+    print("Idle:", motion_gate.report())
+if governor is not None:
+    print("Governor:", governor.report())
+print(f"Frames: {cap.captured} yakalandı, {cap.dropped} atlandı (stale).")
+print(f"Servo: {servos.writes} yazım / {servos.transactions} transaction, {servos.skipped} tekrar atlandı.")
@@ -4,10 +4,16 @@ from collections import deque
 from adafruit_servokit import ServoKit
 import subprocess  # <-- audio için
 
+from config import load_config
+from detectors import create_detector
+
+# Kamera, cascade ve servo aralıkları ortak config'ten (piaget.toml / PIAGET_* env)
+cfg = load_config()
+
 # ---------- CAMERA SETTINGS ----------
-CAM_INDEX = 0
-WIDTH = 320
-HEIGHT = 240
+CAM_INDEX = cfg.CAM_INDEX
+WIDTH = cfg.WIDTH
+HEIGHT = cfg.HEIGHT
 
 # Detection için küçültme oranı
 DOWNSCALE = 1
@@ -40,30 +46,33 @@ def play_greet(index):
         print("Audio play error:", e)
 
 
-# ---------- CASCADE PATH ----------
-CASCADE_PATH = "/usr/share/opencv4/haarcascades/haarcascade_frontalface_default.xml"
-# Gerekirse kendi yolunla değiştir:
-# CASCADE_PATH = "/usr/share/opencv/haarcascades/haarcascade_frontalface_default.xml"
+# ---------- DETECTOR ----------
+DETECTOR_BACKEND = cfg.DETECTOR_BACKEND
+CASCADE_PATH = cfg.CASCADE_PATH
+MODEL_PATH = cfg.MODEL_PATH
 
-face_cascade = cv2.CascadeClassifier(CASCADE_PATH)
-if face_cascade.empty():
-    raise RuntimeError(f"Yüz cascade yüklenemedi: {CASCADE_PATH}")
+# YuNet scaleFactor / minNeighbors kullanmaz, factory atar
+face_detector = create_detector(
+    DETECTOR_BACKEND,
+    cascade_path=CASCADE_PATH,
+    model_path=MODEL_PATH,
+    scaleFactor=1.1,
+    minNeighbors=3,
+)
 
 # ---------- SERVO SETTINGS ----------
 kit = ServoKit(channels=16)
 
-NECK_YAW_CH = 1    # sağ-sol
-NECK_TILT_CH = 0   # yukarı-aşağı
+NECK_YAW_CH = cfg.NECK_YAW_CH    # sağ-sol
+NECK_TILT_CH = cfg.NECK_TILT_CH  # yukarı-aşağı
 
-# YAW: 90 = sol, 135 = orta, 180 = sağ
-YAW_MIN = 90
-YAW_MAX = 180
-YAW_CENTER = 135
+YAW_MIN = cfg.YAW_MIN
+YAW_MAX = cfg.YAW_MAX
+YAW_CENTER = cfg.YAW_CENTER
 
-# TILT: ayarlanabilir güvenli aralık
-TILT_MIN = 60
-TILT_MAX = 120
-TILT_CENTER = 90
+TILT_MIN = cfg.TILT_MIN
+TILT_MAX = cfg.TILT_MAX
+TILT_CENTER = cfg.TILT_CENTER
 
 for ch in [NECK_YAW_CH, NECK_TILT_CH]:
     kit.servo[ch].set_pulse_width_range(500, 2500)
@@ -142,11 +151,9 @@ while True:
     # Detection için küçült
     small_gray = cv2.resize(gray, (0, 0), fx=DOWNSCALE, fy=DOWNSCALE)
 
-    faces = face_cascade.detectMultiScale(
-        small_gray,
-        scaleFactor=1.1,
-        minNeighbors=3,
-        minSize=(40, 40)
+    faces = face_detector.detect(
+        frame if face_detector.uses_color else small_gray,
+        min_size=(40, 40)
     )
 
     target_center = None
@@ -157,7 +164,7 @@ while True:
 
         # En büyük yüzü seç
         largest = max(faces, key=lambda f: f[2] * f[3])
-        (x, y, w, h) = largest
+        (x, y, w, h, score) = largest
 
         x = int(x / DOWNSCALE)
         y = int(y / DOWNSCALE)
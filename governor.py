@@ -0,0 +1,236 @@
+import glob
+import os
+import time
+
+from metrics import Histogram
+
+# ---------- PERFORMANCE GOVERNOR ----------
+# Döngü gecikmesi, CPU yükü ve sıcaklığa göre detection ölçeğini, detection aralığını ve
+# kamera FPS'ini basamaklar arasında aşağı / yukarı kaydırır. Amaç: takipte gecikme
+# target_ms altında kalsın, Pi öğleden sonra throttle'a girmesin.
+#
+# Her profil (idle / scanning / tracking) kendi izin verilen basamak aralığında kendi
+# seviyesini hatırlar: kimse yokken ucuz çalışılır, yüz gelince tracking'in (gerekirse
+# sıcaklık yüzünden düşürülmüş) seviyesine hemen dönülür.
+#
+# Basamaklar ve profiller config'ten gelir (GOVERNOR_SCALE_STEPS / _DETECT_EVERY / _FPS,
+# GOVERNOR_TRACKING / _SCANNING / _IDLE):
+#
+#   levels = make_levels(cfg.GOVERNOR_SCALE_STEPS, cfg.GOVERNOR_DETECT_EVERY, cfg.GOVERNOR_FPS,
+#                        min_scale=0.7)
+#   profiles = {"tracking": cfg.GOVERNOR_TRACKING, ...}
+#   gov = Governor(create_sensors("system"), levels, profiles, target_ms=60)
+#   gov.frame(frame_ms)                       # her frame, işleme süresi
+#   level = gov.update(now, "tracking")       # seviye değiştiyse dict, yoksa None
+#
+# Kararlar interval saniyede bir verilir. Baskı varsa (p95 > target, sıcak, CPU dolu)
+# bir basamak aşağı; hepsi rahatsa ve son değişiklikten beri hold saniye geçtiyse bir
+# basamak yukarı (salınım olmasın).
+#
+# Kamera çözünürlüğü değişmez (kamerayı yeniden açmak gerekirdi): "scale" detection'ın
+# pyramid ölçeğini çarpar. Küçük ölçekte uzaktaki küçük yüzler kaçabilir: kullanan taraf
+# min_scale'i (en küçük yüz detector penceresine inerken) verir, basamaklar o paya bölünür.
+
+
+def make_levels(scale_steps, detect_every, fps, min_scale=0.0):
+    """Config'teki paralel listeler → ağırdan hafife [{"scale", "detect_every", "fps"}, ...].
+
+    scale_steps 0..1: 1.0 ile min_scale arasındaki payın ne kadarının kullanılacağı
+    (min_scale ≥ 1 ise pay yok, her basamak tam ölçek)."""
+    if not len(scale_steps) == len(detect_every) == len(fps):
+        raise ValueError(f"Governor basamakları aynı uzunlukta olmalı: scale_steps {len(scale_steps)}, "
+                         f"detect_every {len(detect_every)}, fps {len(fps)}")
+    headroom = 1.0 - min(1.0, max(0.0, min_scale))
+    return [{"scale": round(1.0 - min(1.0, max(0.0, s)) * headroom, 2), "detect_every": max(1, d), "fps": f}
+            for s, d, f in zip(scale_steps, detect_every, fps)]
+
+
+def check_profiles(levels, profiles):
+    """Profil → (en ağır, en hafif) basamak aralıkları geçerli mi."""
+    for name, (lo, hi) in profiles.items():
+        if not 0 <= lo <= hi < len(levels):
+            raise ValueError(f"Governor profili {name}: ({lo}, {hi}) 0..{len(levels) - 1} içinde olmalı")
+    return profiles
+
+
+# ---------- SENSORS ----------
+
+class SystemSensors:
+    """/sys/class/thermal ve /proc/stat. Okunamayan değer None (ör. dizüstünde sıcaklık)."""
+
+    def __init__(self, zone=None):
+        self.zone = zone or self._find_zone()
+        self._last_stat = None
+
+    @staticmethod
+    def _find_zone():
+        zones = sorted(glob.glob("/sys/class/thermal/thermal_zone*"))
+        for zone in zones:
+            try:
+                with open(os.path.join(zone, "type")) as f:
+                    if "cpu" in f.read():
+                        return zone
+            except OSError:
+                pass
+        return zones[0] if zones else None
+
+    def temperature(self):
+        """°C"""
+        if self.zone is None:
+            return None
+        try:
+            with open(os.path.join(self.zone, "temp")) as f:
+                return int(f.read().strip()) / 1000.0
+        except (OSError, ValueError):
+            return None
+
+    def cpu_load(self):
+        """Son çağrıdan beri tüm çekirdeklerde meşgul oranı (0-1)."""
+        try:
+            with open("/proc/stat") as f:
+                values = [int(v) for v in f.readline().split()[1:]]
+        except (OSError, ValueError):
+            return None
+        idle = values[3] + (values[4] if len(values) > 4 else 0)   # idle + iowait
+        total = sum(values)
+        last, self._last_stat = self._last_stat, (idle, total)
+        if last is None or total == last[1]:
+            return None
+        return 1.0 - (idle - last[0]) / (total - last[1])
+
+
+class SimulatedSensors:
+    """Donanımsız test: sıcaklık yüke göre birinci dereceden ısınır / soğur.
+
+    load verilmezse bu sürecin CPU kullanımı (process_time / duvar saati) yük sayılır.
+    load ve temp attribute'ları testte elle de değiştirilebilir.
+    """
+
+    def __init__(self, ambient=45.0, heat=40.0, tau=60.0, load=None, clock=time.monotonic):
+        self.ambient = ambient      # boştaki sıcaklık
+        self.heat = heat            # tam yükte ambient'ın bu kadar üstüne çıkar
+        self.tau = tau              # zaman sabiti (saniye)
+        self.load = load
+        self.clock = clock
+        self.temp = ambient
+        self._load = 0.0
+        self._last = None
+        self._temp_time = None
+
+    def _measure_load(self):
+        now, cpu = self.clock(), time.process_time()
+        last, self._last = self._last, (now, cpu)
+        if last is None or now == last[0]:
+            return 0.0
+        return min(1.0, (cpu - last[1]) / (now - last[0]))
+
+    def cpu_load(self):
+        self._load = self.load if self.load is not None else self._measure_load()
+        return self._load
+
+    def temperature(self):
+        now = self.clock()
+        last, self._temp_time = self._temp_time, now
+        if last is not None:
+            target = self.ambient + self.heat * self._load
+            self.temp += (target - self.temp) * min(1.0, (now - last) / self.tau)
+        return self.temp
+
+
+def create_sensors(name="system", **params):
+    sensors = {
+        "system": SystemSensors,
+        "sim": SimulatedSensors,
+    }
+    if name not in sensors:
+        raise ValueError(f"Bilinmeyen sensör kaynağı: {name} (seçenekler: {', '.join(sensors)})")
+    return sensors[name](**params)
+
+
+# ---------- GOVERNOR ----------
+
+class Governor:
+    def __init__(self, sensors, levels, profiles, target_ms=60.0, temp_high=75.0, temp_low=68.0,
+                 cpu_high=0.9, cpu_low=0.6, interval=2.0, hold=6.0):
+        self.sensors = sensors
+        self.levels_table = levels                          # ağırdan hafife basamaklar
+        self.profiles = check_profiles(levels, profiles)    # profil → (en ağır, en hafif)
+        self.target_ms = target_ms      # frame işleme süresinin p95'i bunun altında kalsın
+        self.temp_high = temp_high      # üstünde hafiflet (Pi 4: 80 °C'de throttle)
+        self.temp_low = temp_low        # altına inmeden ağırlaştırma
+        self.cpu_high = cpu_high
+        self.cpu_low = cpu_low
+        self.interval = interval
+        self.hold = hold
+
+        self.levels = {name: lo for name, (lo, hi) in profiles.items()}
+        self.profile = None
+        self.window = Histogram()
+        self.temperature = None
+        self.load = None
+        self.changes = 0
+        self._next_decision = None
+        self._last_change = None
+
+    @property
+    def level(self):
+        return self.levels_table[self.levels[self.profile or "tracking"]]
+
+    def frame(self, frame_ms):
+        self.window.add(frame_ms)
+
+    def _pressure(self, p95):
+        """(hafiflet, ağırlaştırabilir, sebep)"""
+        reasons = []
+        if p95 > self.target_ms:
+            reasons.append(f"p95 {p95:.0f} ms")
+        if self.temperature is not None and self.temperature >= self.temp_high:
+            reasons.append(f"{self.temperature:.0f} °C")
+        if self.load is not None and self.load >= self.cpu_high:
+            reasons.append(f"CPU %{100 * self.load:.0f}")
+        if reasons:
+            return True, False, ", ".join(reasons)
+
+        relaxed = p95 < 0.7 * self.target_ms
+        relaxed = relaxed and (self.temperature is None or self.temperature <= self.temp_low)
+        relaxed = relaxed and (self.load is None or self.load <= self.cpu_low)
+        return False, relaxed, "rahat"
+
+    def update(self, now, profile):
+        """Profil değiştiyse ya da karar zamanıysa seviyeyi günceller. Değiştiyse yeni seviye (dict)."""
+        changed = profile != self.profile
+        self.profile = profile
+        if self._next_decision is None:
+            self._next_decision = now + self.interval
+            self._last_change = now
+            return self.level if changed else None
+
+        if now >= self._next_decision:
+            self._next_decision = now + self.interval
+            self.load = self.sensors.cpu_load()
+            self.temperature = self.sensors.temperature()
+            p95 = self.window.percentile(95) if self.window.count else 0.0
+            self.window = Histogram()
+
+            lo, hi = self.profiles[profile]
+            current = self.levels[profile]
+            lighten, heavier, reason = self._pressure(p95)
+            if lighten and current < hi:
+                self.levels[profile] = current + 1
+            elif heavier and current > lo and now - self._last_change >= self.hold:
+                self.levels[profile] = current - 1
+
+            if self.levels[profile] != current:
+                self._last_change = now
+                self.changes += 1
+                changed = True
+                print(f"Governor: {profile} seviye {current} → {self.levels[profile]} ({reason}) "
+                      f"{self.level}")
+
+        return self.level if changed else None
+
+    def report(self):
+        temp = f"{self.temperature:.0f} °C" if self.temperature is not None else "sıcaklık yok"
+        load = f"CPU %{100 * self.load:.0f}" if self.load is not None else "CPU ?"
+        return f"{self.profile} seviye {self.levels.get(self.profile)}, {temp}, {load}, " \
+               f"{self.changes} değişiklik"
@@ -1,18 +1,25 @@
-from adafruit_servokit import ServoKit
 import time
 
+from config import load_config
+from servo_driver import create_servo_driver
+
 # ---------- AYARLAR ----------
-JAW_CH = 4
+# Kanal, aralık ve servo backend ortak config'ten; bulunan aralığı piaget.toml'a
+# JAW_CLOSED_ANGLE / JAW_OPEN_ANGLE olarak yaz
+cfg = load_config()
+JAW_CH = cfg.JAW_CH
 
 # Güvenli deneme aralığı (mekaniğe göre istersen daralt)
-MIN_ANGLE = 60
-MAX_ANGLE = 120
+MIN_ANGLE = cfg.JAW_CLOSED_ANGLE
+MAX_ANGLE = cfg.JAW_OPEN_ANGLE
 
 # Varsayılan başlangıç açısı (emin değilsen 90 yaz)
 DEFAULT_START_ANGLE = 90
 
-kit = ServoKit(channels=16)
-kit.servo[JAW_CH].set_pulse_width_range(500, 2500)
+SERVO_BACKEND = cfg.SERVO_BACKEND   # donanımsız denemek için PIAGET_SERVO_BACKEND=sim
+
+servos = create_servo_driver(SERVO_BACKEND)
+servos.setup(JAW_CH, 500, 2500)
 
 
 def clamp(val, lo, hi):
@@ -37,7 +44,7 @@ def main():
 
     angle = clamp(angle, MIN_ANGLE, MAX_ANGLE)
     print(f"Başlangıç açısı {angle}° olarak ayarlandı.")
-    kit.servo[JAW_CH].angle = angle
+    servos.set_angle(JAW_CH, angle)
     time.sleep(0.5)
 
     print()
@@ -76,7 +83,7 @@ def main():
                 print(f"Sınır nedeniyle açı {angle}°'ye kısıtlandı.")
 
             print(f"-> Yeni açı: {angle}°")
-            kit.servo[JAW_CH].angle = angle
+            servos.set_angle(JAW_CH, angle)
             time.sleep(0.1)
 
     except KeyboardInterrupt:
@@ -0,0 +1,161 @@
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+
+from audio_engine import load_wav
+
+# ---------- LIP SYNC ----------
+# Her WAV için RMS zarfı (0-1, ENVELOPE_FPS örnek/sn) önceden hesaplanır ve WAV'ın
+# yanına <isim>.env.npz olarak kaydedilir. Çalma sırasında çene açısı bu tablodan
+# okunur: runtime maliyeti bir index hesabı, detection ile CPU için yarışmaz.
+#
+# Önceden hesaplamak için: python lip_sync.py piaget_*.wav
+
+ENVELOPE_FPS = 50       # 20 ms pencereler (servo yazım hızıyla aynı)
+NOISE_GATE = 0.12       # bunun altı "ağız kapalı"
+ATTACK = 0.6            # açılma hızı (0-1, frame başı)
+RELEASE = 0.25          # kapanma hızı; ağız heceler arasında tamamen kapanıp titremesin
+
+
+def compute_envelope(samples, rate, fps=ENVELOPE_FPS):
+    """int16 mono sample'lar → float32 (N,) 0-1 arası çene açıklığı."""
+    hop = max(1, rate // fps)
+    n = (len(samples) + hop - 1) // hop
+    if n == 0:
+        return np.zeros(0, dtype=np.float32)
+
+    padded = np.zeros(n * hop, dtype=np.float32)
+    padded[:len(samples)] = samples
+    rms = np.sqrt(np.mean(padded.reshape(n, hop) ** 2, axis=1))
+
+    # Sesin genel seviyesinden bağımsız olsun: tepe yerine %95'lik dilime göre normalize
+    ref = np.percentile(rms, 95)
+    if ref <= 0:
+        return np.zeros(n, dtype=np.float32)
+    level = np.clip(rms / ref, 0.0, 1.0)
+    level = np.clip((level - NOISE_GATE) / (1.0 - NOISE_GATE), 0.0, 1.0)
+
+    # Hızlı açıl, yavaş kapan
+    env = np.empty(n, dtype=np.float32)
+    value = 0.0
+    for i, target in enumerate(level):
+        k = ATTACK if target > value else RELEASE
+        value += k * (target - value)
+        env[i] = value
+    return env
+
+
+def envelope_path(wav_path):
+    return os.path.splitext(wav_path)[0] + ".env.npz"
+
+
+def load_envelope(wav_path, fps=ENVELOPE_FPS):
+    """Cache'teki zarfı döndürür; WAV değişmişse (boyut / mtime) ya da yoksa yeniden hesaplar."""
+    st = os.stat(wav_path)
+    cache = envelope_path(wav_path)
+
+    if os.path.exists(cache):
+        try:
+            data = np.load(cache)
+            if (int(data["fps"]) == fps and int(data["wav_size"]) == st.st_size
+                    and int(data["wav_mtime_ns"]) == st.st_mtime_ns):
+                return data["envelope"]
+        except (OSError, KeyError, ValueError):
+            pass
+
+    samples, rate = load_wav(wav_path)
+    env = compute_envelope(samples, rate, fps)
+    try:
+        np.savez(cache, envelope=env, fps=fps, wav_size=st.st_size, wav_mtime_ns=st.st_mtime_ns)
+    except OSError as e:
+        print(f"Envelope cache yazılamadı ({cache}):", e)
+    return env
+
+
+class JawAnimator:
+    """AudioEngine'de çalan klibin zarfını takip ederek çene servosunu sürer.
+
+    closed_angle / open_angle jaw_calibration.py ile bulunan güvenli aralıkta olmalı
+    (mekaniğe göre closed > open da olabilir). lead: servo gecikmesi için ne kadar
+    önden gidilsin (saniye). Ses çıkış gecikmesi engine'in sink'inden alınır.
+    """
+
+    def __init__(self, driver, channel, engine, closed_angle=60, open_angle=120,
+                 rate_hz=ENVELOPE_FPS, lead=0.03, fps=ENVELOPE_FPS):
+        self.driver = driver
+        self.channel = channel
+        self.engine = engine
+        self.closed_angle = closed_angle
+        self.open_angle = open_angle
+        self.period = 1.0 / rate_hz
+        self.lead = lead
+        self.fps = fps
+        self.envelopes = [load_envelope(clip.name, fps) for clip in engine.clips]
+
+        self._running = False
+        self._thread = None
+        self.ticks = 0
+
+    def angle_at(self, index, position):
+        """Klip index'i ve klip içindeki saniye → çene açısı."""
+        if index is None:
+            return self.closed_angle
+        # Engine'in pozisyonu render edilen sample; hoparlörden çıkan daha geride
+        t = position - self.engine.sink.latency + self.lead
+        env = self.envelopes[index]
+        i = int(t * self.fps)
+        value = float(env[i]) if 0 <= i < len(env) else 0.0
+        return self.closed_angle + value * (self.open_angle - self.closed_angle)
+
+    def start(self):
+        if self._running:
+            return self
+        self.driver.set_angle(self.channel, self.closed_angle)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="JawAnimator", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        next_tick = time.perf_counter()
+        while self._running:
+            angle = self.angle_at(*self.engine.playing())
+            # Değişmeyen açı driver'da atlanır: sessizken I2C trafiği yok
+            self.driver.set_angles({self.channel: round(angle, 1)})
+            self.ticks += 1
+
+            next_tick += self.period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.driver.set_angle(self.channel, self.closed_angle)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WAV dosyaları için lip-sync zarflarını önceden hesapla")
+    parser.add_argument("wavs", nargs="+")
+    parser.add_argument("--fps", type=int, default=ENVELOPE_FPS)
+    args = parser.parse_args()
+
+    for path in args.wavs:
+        t0 = time.perf_counter()
+        env = load_envelope(path, args.fps)
+        dt = (time.perf_counter() - t0) * 1000
+        open_ratio = float((env > 0.05).mean()) if len(env) else 0.0
+        print(f"{path}: {len(env)} frame ({len(env) / args.fps:.2f} sn), "
+              f"ağız açık %{open_ratio * 100:.0f}, {dt:.1f} ms → {envelope_path(path)}")
+
+
+if __name__ == "__main__":
+    main()
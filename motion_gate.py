@@ -0,0 +1,94 @@
+import cv2
+import numpy as np
+
+# ---------- MOTION GATE ----------
+# Standda kimse yokken cascade'i her framede çalıştırmamak için ucuz hareket kontrolü.
+# Küçük (ör. 80x60) gri frame'de yavaş güncellenen bir arka plan tutulur; yeterince
+# piksel değişmediyse detection atlanır.
+#
+# Kafa hareket ederken tüm görüntü kayar (ego-motion), fark anlamsızdır: gate sadece
+# servo hareketlerinin arasında çalışır. Hareket sırasında ve hareketten sonraki
+# settle süresinde detection hep çalışır, durunca arka plan yeni görüntüden yeniden
+# öğrenilir. Scan'in adım + bekleme şeklinde ilerlemesi bu yüzden (SCAN_DWELL).
+#
+#   gate = MotionGate()
+#   small = pyramid.level(0.25)
+#   if gate.update(small, now, moving=servo_moving):
+#       faces = detect(...)
+#
+# Kişi çok yavaş yaklaşıp arka plana karışmasın diye max_skip saniyede bir detection
+# yine de çalışır.
+
+
+class MotionGate:
+    def __init__(self, threshold=18, min_area=0.004, learn_rate=0.05, settle=0.3, max_skip=2.0):
+        self.threshold = threshold      # piksel farkı (0-255), altı gürültü sayılır
+        self.min_area = min_area        # değişen piksel oranı, üstü "hareket var"
+        self.learn_rate = learn_rate    # arka plan güncelleme hızı (durağan framelerde)
+        self.settle = settle            # servo durduktan sonra bu kadar saniye gate kapalı
+        self.max_skip = max_skip        # en fazla bu kadar saniye üst üste atla
+
+        self.background = None
+        self._background8 = None
+        self._diff = None
+        self._mask = None
+        self._moved_at = None
+        self._last_detect = None
+        self.last_changed = 0.0         # son karşılaştırmada değişen piksel oranı
+
+        self.frames = 0
+        self.skipped = 0
+
+    def reset(self):
+        """Arka planı unutur (görüntü değişti: kafa döndü, çözünürlük değişti)."""
+        self.background = None
+
+    def _allocate(self, small):
+        self.background = small.astype(np.float32)
+        self._background8 = np.empty_like(small)
+        self._diff = np.empty_like(small)
+        self._mask = np.empty_like(small)
+
+    def update(self, small, now, moving=False):
+        """small: küçültülmüş gri frame. True → bu framede detection çalıştır."""
+        self.frames += 1
+
+        if moving:
+            self._moved_at = now
+            self.reset()
+            return self._run(now)
+
+        if self._moved_at is not None and now - self._moved_at < self.settle:
+            return self._run(now)
+
+        if self.background is None or self.background.shape != small.shape:
+            # Yeni görüntü: bir kere bak, sonrasını buna göre karşılaştır
+            self._allocate(small)
+            return self._run(now)
+
+        cv2.convertScaleAbs(self.background, dst=self._background8)
+        cv2.absdiff(small, self._background8, dst=self._diff)
+        cv2.threshold(self._diff, self.threshold, 255, cv2.THRESH_BINARY, dst=self._mask)
+        self.last_changed = cv2.countNonZero(self._mask) / self._mask.size
+
+        if self.last_changed >= self.min_area:
+            # Hareket var: arka planı güncelleme, kişi arka plana karışmasın
+            return self._run(now)
+
+        cv2.accumulateWeighted(small, self.background, self.learn_rate)
+        if self._last_detect is None or now - self._last_detect >= self.max_skip:
+            return self._run(now)
+
+        self.skipped += 1
+        return False
+
+    def _run(self, now):
+        self._last_detect = now
+        return True
+
+    @property
+    def skip_ratio(self):
+        return self.skipped / self.frames if self.frames else 0.0
+
+    def report(self):
+        return f"motion gate: %{100.0 * self.skip_ratio:.0f} frame atlandı ({self.skipped}/{self.frames})"
@@ -0,0 +1,119 @@
+import numpy as np
+
+from face_filter import iou_matrix
+
+# ---------- MULTI-FACE TRACKER ----------
+# Her framede "en büyük yüz" yerine kalıcı ID'li track'ler:
+#  - eşleştirme: IoU, IoU tutmazsa merkez mesafesi (hızlı hareket / küçük kutular için)
+#  - doğum: min_hits kez görülen detection onaylı track olur
+#  - ölüm: max_age saniye görülmeyen track silinir
+#  - hedef: mevcut hedef yaşadığı sürece değişmez (kafa kişiler arasında zıplamasın)
+
+
+class Track:
+    def __init__(self, track_id, box, t):
+        self.id = track_id
+        self.box = box            # (x, y, w, h) int
+        self.first_seen = t
+        self.last_seen = t
+        self.hits = 1
+        self.confirmed = False
+        self.greeted = False
+
+    @property
+    def center(self):
+        x, y, w, h = self.box
+        return (x + w // 2, y + h // 2)
+
+    @property
+    def area(self):
+        return self.box[2] * self.box[3]
+
+
+class MultiFaceTracker:
+    def __init__(self, iou_threshold=0.3, max_center_dist=0.8, min_hits=2, max_age=1.0):
+        self.iou_threshold = iou_threshold
+        self.max_center_dist = max_center_dist   # track boyutuna oranla
+        self.min_hits = min_hits
+        self.max_age = max_age                   # saniye
+        self.tracks = []
+        self.target = None
+        self.target_switches = 0
+        self._next_id = 1
+
+    def _associate(self, boxes):
+        """(eşleşen (track_idx, det_idx) listesi, eşleşmeyen detection index'leri)."""
+        n_tracks, n_dets = len(self.tracks), len(boxes)
+        if n_tracks == 0 or n_dets == 0:
+            return [], list(range(n_dets))
+
+        track_boxes = np.array([tr.box for tr in self.tracks], dtype=np.float32)
+        det_boxes = boxes[:, :4].astype(np.float32)
+
+        # IoU yetmezse merkez mesafesine göre skor (0-1 arası, IoU'dan düşük öncelikli)
+        ious = iou_matrix(track_boxes, det_boxes)
+        tc = track_boxes[:, :2] + track_boxes[:, 2:4] / 2
+        dc = det_boxes[:, :2] + det_boxes[:, 2:4] / 2
+        dist = np.linalg.norm(tc[:, None, :] - dc[None, :, :], axis=2)
+        size = np.maximum(track_boxes[:, 2:3], track_boxes[:, 3:4])
+        near = 1.0 - dist / (self.max_center_dist * size)
+
+        score = np.where(ious >= self.iou_threshold, 1.0 + ious, np.clip(near, 0, None) * 0.99)
+
+        # Greedy: en yüksek skordan başla, her track / detection bir kere
+        matches = []
+        used_t = np.zeros(n_tracks, dtype=bool)
+        used_d = np.zeros(n_dets, dtype=bool)
+        for flat in np.argsort(-score, axis=None):
+            ti, di = divmod(int(flat), n_dets)
+            if score[ti, di] <= 0:
+                break
+            if used_t[ti] or used_d[di]:
+                continue
+            used_t[ti] = used_d[di] = True
+            matches.append((ti, di))
+
+        return matches, [d for d in range(n_dets) if not used_d[d]]
+
+    def update(self, faces, t):
+        """faces: (N, 4+) [x, y, w, h, ...] detection array. Onaylı track listesini döndürür."""
+        boxes = np.asarray(faces, dtype=np.float32)
+        if boxes.size == 0:
+            boxes = np.empty((0, 4), dtype=np.float32)
+        matches, unmatched = self._associate(boxes)
+
+        for ti, di in matches:
+            tr = self.tracks[ti]
+            tr.box = tuple(int(v) for v in boxes[di, :4])
+            tr.last_seen = t
+            tr.hits += 1
+            if tr.hits >= self.min_hits:
+                tr.confirmed = True
+
+        for di in unmatched:
+            tr = Track(self._next_id, tuple(int(v) for v in boxes[di, :4]), t)
+            tr.confirmed = self.min_hits <= 1
+            self._next_id += 1
+            self.tracks.append(tr)
+
+        # Ölüm: max_age saniyedir görülmeyenler. Detect-then-track modunda hedef dışındaki
+        # yüzler sadece detection framelerinde görüldüğü için hemen silinmemeli.
+        self.tracks = [tr for tr in self.tracks if t - tr.last_seen <= self.max_age]
+
+        self._select_target()
+        return [tr for tr in self.tracks if tr.confirmed]
+
+    def _select_target(self):
+        if self.target is not None and self.target in self.tracks:
+            return
+        confirmed = [tr for tr in self.tracks if tr.confirmed]
+        new_target = max(confirmed, key=lambda tr: tr.area) if confirmed else None
+        if new_target is not None and self.target is not None:
+            self.target_switches += 1
+        self.target = new_target
+
+    def visible_target(self, t):
+        """Hedef bu framede görüldüyse onu döndürür (yaşayan ama görülmeyen hedef için None)."""
+        if self.target is not None and self.target.last_seen == t:
+            return self.target
+        return None
@@ -0,0 +1,195 @@
+# ---------- NECK CONTROLLERS ----------
+# Yüzün ekran merkezine piksel hatasından yeni yaw / tilt açısı üretir.
+# Hepsi aynı arayüz: update(error_x, error_y, yaw, tilt, dt) -> (yaw, tilt)
+# error_x: sağ +, sol -   error_y: aşağı +, yukarı -   dt: saniye
+
+
+def clamp(value, lo, hi):
+    return max(lo, min(hi, value))
+
+
+class NeckController:
+    name = "base"
+
+    def __init__(self, yaw_limits=(90, 180), tilt_limits=(60, 120)):
+        self.yaw_limits = yaw_limits
+        self.tilt_limits = tilt_limits
+
+    def update(self, error_x, error_y, yaw, tilt, dt):
+        raise NotImplementedError
+
+    def reset(self):
+        """Yüz kaybolunca çağrılır (integral vs. sıfırlansın)."""
+        pass
+
+
+class RuleBasedController(NeckController):
+    """face_track.py'deki eski dead-zone + sabit adım mantığı. dt'yi kullanmaz (frame başı adım)."""
+
+    name = "rule"
+
+    def __init__(self, yaw_limits=(90, 180), tilt_limits=(60, 120),
+                 dead_zone_x=(35, 120), dead_zone_y=(18, 60),
+                 yaw_steps=(2, 5), tilt_steps=(2, 4)):
+        super().__init__(yaw_limits, tilt_limits)
+        self.dead_zone_x = dead_zone_x   # (küçük, büyük)
+        self.dead_zone_y = dead_zone_y
+        self.yaw_steps = yaw_steps       # (küçük adım, büyük adım)
+        self.tilt_steps = tilt_steps
+
+    @staticmethod
+    def _axis(error, angle, dead_zone, steps, limits):
+        abs_e = abs(error)
+        if abs_e <= dead_zone[0]:
+            return angle
+        step = steps[1] if abs_e > dead_zone[1] else steps[0]
+        direction = 1 if error > 0 else -1
+        return clamp(angle + direction * step, limits[0], limits[1])
+
+    def update(self, error_x, error_y, yaw, tilt, dt):
+        yaw = self._axis(error_x, yaw, self.dead_zone_x, self.yaw_steps, self.yaw_limits)
+        tilt = self._axis(error_y, tilt, self.dead_zone_y, self.tilt_steps, self.tilt_limits)
+        return yaw, tilt
+
+
+class PIDAxis:
+    """Tek eksen PID. Çıkış açısal hız (derece/saniye), açı = açı + hız * dt.
+
+    - anti-windup: integral sınırlı, çıkış doyumdayken aynı yönde integral birikmez
+    - slew limit: hız max_speed ile, hız değişimi max_accel ile sınırlı
+    """
+
+    def __init__(self, kp, ki=0.0, kd=0.0, dead_band=0.0, i_limit=50.0,
+                 max_speed=150.0, max_accel=1500.0):
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.dead_band = dead_band
+        self.i_limit = i_limit
+        self.max_speed = max_speed
+        self.max_accel = max_accel
+        self.reset()
+
+    def reset(self):
+        self.integral = 0.0
+        self.prev_error = None
+        self.velocity = 0.0
+
+    def update(self, error, angle, limits, dt):
+        if abs(error) <= self.dead_band:
+            error = 0.0
+
+        derivative = 0.0
+        if self.prev_error is not None and dt > 0:
+            derivative = (error - self.prev_error) / dt
+        self.prev_error = error
+
+        velocity = self.kp * error + self.ki * self.integral + self.kd * derivative
+
+        # Slew limit: önce ivme, sonra hız
+        max_dv = self.max_accel * dt
+        velocity = clamp(velocity, self.velocity - max_dv, self.velocity + max_dv)
+        velocity = clamp(velocity, -self.max_speed, self.max_speed)
+
+        new_angle = angle + velocity * dt
+        saturated = new_angle <= limits[0] or new_angle >= limits[1]
+        new_angle = clamp(new_angle, limits[0], limits[1])
+        if saturated:
+            velocity = 0.0
+
+        # Anti-windup: doyumdaysak ve hata aynı yöne itiyorsa integrale ekleme
+        pushing_out = saturated and (error > 0) == (new_angle >= limits[1])
+        if not pushing_out:
+            self.integral = clamp(self.integral + error * dt, -self.i_limit, self.i_limit)
+
+        self.velocity = velocity
+        return new_angle
+
+
+class PIDController(NeckController):
+    """Zaman tabanlı PID: yakınsama hızı FPS'e bağlı değil."""
+
+    name = "pid"
+
+    # Kamera ~60° yatay görüş / 320 px ≈ 0.19 °/px; kp=0.6 hatayı ~0.3 sn'de kapatır
+    def __init__(self, yaw_limits=(90, 180), tilt_limits=(60, 120),
+                 yaw_gains=(0.6, 0.05, 0.02), tilt_gains=(0.6, 0.05, 0.02),
+                 dead_band_x=10, dead_band_y=8, max_speed=150.0, max_accel=1500.0,
+                 max_dt=0.2):
+        super().__init__(yaw_limits, tilt_limits)
+        self.max_dt = max_dt   # uzun takılmalardan sonra dev bir adım atılmasın
+        self.yaw = PIDAxis(*yaw_gains, dead_band=dead_band_x,
+                           max_speed=max_speed, max_accel=max_accel)
+        self.tilt = PIDAxis(*tilt_gains, dead_band=dead_band_y,
+                            max_speed=max_speed, max_accel=max_accel)
+
+    def update(self, error_x, error_y, yaw, tilt, dt):
+        dt = clamp(dt, 0.0, self.max_dt)
+        yaw = self.yaw.update(error_x, yaw, self.yaw_limits, dt)
+        tilt = self.tilt.update(error_y, tilt, self.tilt_limits, dt)
+        return yaw, tilt
+
+    def reset(self):
+        self.yaw.reset()
+        self.tilt.reset()
+
+
+CONTROLLERS = {
+    "rule": RuleBasedController,
+    "pid": PIDController,
+}
+
+
+def create_controller(name="rule", **params):
+    """Config'teki isimle controller oluşturur: "rule" ya da "pid"."""
+    if name not in CONTROLLERS:
+        raise ValueError(f"Bilinmeyen controller: {name} (seçenekler: {', '.join(CONTROLLERS)})")
+    return CONTROLLERS[name](**params)
+
+
+# ---------- SIMULATED COMPARISON ----------
+
+def simulate(controller, fps, face_yaw=165.0, start_yaw=135.0, deg_per_px=0.19,
+             center_tolerance=35, settle_frames=5, max_time=5.0):
+    """Sabit duran bir yüzü sim servo ile ortalamaya çalışır.
+
+    (ortalanma süresi sn, frame sayısı, servo yazım sayısı) döndürür; ortalayamazsa süre None.
+    """
+    from servo_driver import SimServoDriver
+
+    t = [0.0]
+    servos = SimServoDriver(clock=lambda: t[0])
+    yaw, tilt = start_yaw, 90.0
+    servos.set_angles({1: yaw, 0: tilt})
+    controller.reset()
+
+    dt = 1.0 / fps
+    centered = 0
+    frames = 0
+    while t[0] < max_time:
+        frames += 1
+        error_x = (face_yaw - yaw) / deg_per_px
+        if abs(error_x) <= center_tolerance:
+            centered += 1
+            if centered >= settle_frames:
+                # Süre, hatanın tolerans içine ilk girdiği an
+                return t[0] - (settle_frames - 1) * dt, frames, servos.writes
+        else:
+            centered = 0
+        yaw, tilt = controller.update(error_x, 0.0, yaw, tilt, dt)
+        servos.set_angles({1: yaw, 0: tilt})
+        t[0] += dt
+    return None, frames, servos.writes
+
+
+def main():
+    print(f"{'controller':<12}{'fps':>5}{'süre (sn)':>12}{'frame':>8}{'yazım':>8}")
+    for name in CONTROLLERS:
+        for fps in (10, 15, 30):
+            settle, frames, writes = simulate(create_controller(name), fps)
+            settle_txt = f"{settle:.2f}" if settle is not None else "-"
+            print(f"{name:<12}{fps:>5}{settle_txt:>12}{frames:>8}{writes:>8}")
+
+
+if __name__ == "__main__":
+    main()
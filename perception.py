@@ -0,0 +1,129 @@
+from behaviour import Percept
+from face_estimator import create_estimator
+from face_filter import filter_faces
+from multi_track import MultiFaceTracker
+from neck_control import create_controller
+
+# ---------- SHARED PERCEPTION ----------
+# face_track.py (tek döngü) ve Piaget.py (asyncio runtime) aynı vision → kontrol zincirini
+# kullanır: controller / estimator seçimi, arama bandı, detection filtreleri ve
+# hedef track + tahmini merkez burada, ikisi de cfg'den okur.
+#
+#   perception = Perception(cfg)
+#   tracks, target, center = perception.update(faces, frame_time, now)
+#   head.update(now, perception.percept(target, center, frame_time))
+
+
+def make_controller(cfg):
+    """"rule": dead-zone + sabit adım (frame başı), "pid": zaman tabanlı PID (FPS'ten bağımsız)."""
+    if cfg.CONTROLLER == "pid":
+        return create_controller(
+            "pid",
+            yaw_limits=(cfg.YAW_MIN, cfg.YAW_MAX),
+            tilt_limits=(cfg.TILT_MIN, cfg.TILT_MAX),
+            yaw_gains=cfg.PID_YAW_GAINS,
+            tilt_gains=cfg.PID_TILT_GAINS,
+            max_speed=cfg.PID_MAX_SPEED,
+        )
+    return create_controller(
+        "rule",
+        yaw_limits=(cfg.YAW_MIN, cfg.YAW_MAX),
+        tilt_limits=(cfg.TILT_MIN, cfg.TILT_MAX),
+        dead_zone_x=(cfg.DEAD_ZONE_SMALL_X, cfg.DEAD_ZONE_LARGE_X),
+        dead_zone_y=(cfg.DEAD_ZONE_SMALL_Y, cfg.DEAD_ZONE_LARGE_Y),
+        yaw_steps=(cfg.YAW_STEP_SMALL, cfg.YAW_STEP_LARGE),
+        tilt_steps=(cfg.TILT_STEP_SMALL, cfg.TILT_STEP_LARGE),
+    )
+
+
+def make_estimator(cfg):
+    """Yüz merkezi tahmini.
+    "kalman": sabit hız modeli, gecikmeyi ileri tahminle telafi eder, kısa kayıplarda tahminle devam eder
+    "average": eski davranış, son FACE_SMOOTH_WINDOW merkezin ortalaması"""
+    if cfg.ESTIMATOR == "kalman":
+        return create_estimator("kalman", max_coast=cfg.MAX_COAST, bounds=(cfg.WIDTH, cfg.HEIGHT))
+    return create_estimator("average", window=cfg.FACE_SMOOTH_WINDOW)
+
+
+def uses_face_filters(cfg):
+    """Flamaları / posterleri elemek için ek filtreler.
+    DNN detector posterlere takılmıyor, el ayarlı filtrelere gerek yok."""
+    return cfg.DETECTOR_BACKEND != "yunet"
+
+
+def search_top_y(cfg):
+    """Üst bant detection'a hiç girmez. Merkezi bandın hemen altında olan yüzler
+    kesilmesin diye arama, bandın MIN_FACE_SIZE/2 kadar üstünden başlar."""
+    if not uses_face_filters(cfg):
+        return 0
+    return max(0, int(cfg.HEIGHT * cfg.TOP_IGNORE_RATIO) - cfg.MIN_FACE_SIZE // 2)
+
+
+def filter_detections(cfg, faces_raw):
+    """Ham detector kutuları → int32 (N, 6) [x, y, w, h, cx, cy], ek filtrelerle."""
+    if not uses_face_filters(cfg):
+        return filter_faces(faces_raw)
+
+    # Arama bandın biraz üstünden başladığı için merkez kontrolü hâlâ gerekli
+    return filter_faces(
+        faces_raw,
+        min_area=cfg.MIN_FACE_AREA,
+        max_area=int(cfg.WIDTH * cfg.HEIGHT * cfg.MAX_FACE_RATIO),
+        min_aspect=cfg.MIN_ASPECT,
+        max_aspect=cfg.MAX_ASPECT,
+        top_ignore_y=int(cfg.HEIGHT * cfg.TOP_IGNORE_RATIO),
+    )
+
+
+class Perception:
+    """Detection → kalıcı ID'li track'ler, hedef kişi ve servo gecikmesine göre tahmini merkez."""
+
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.people = MultiFaceTracker(
+            iou_threshold=cfg.TRACK_IOU_THRESHOLD,
+            min_hits=cfg.TRACK_MIN_HITS,
+            max_age=cfg.TRACK_MAX_AGE,
+        )
+        self.estimator = make_estimator(cfg)
+        self.last_target_id = None
+        self.last_face_size = None   # son seçilen yüzün (w, h)'si
+
+    def update(self, faces, t, now):
+        """t: yüzlerin görüldüğü an, now: şimdi. (onaylı track'ler, hedef, tahmini merkez)."""
+        cfg = self.cfg
+        # Kalıcı ID'li track'ler; hedef yaşadığı sürece değişmez
+        tracks = self.people.update(faces, t)
+        target = self.people.visible_target(t)
+
+        if target is not None:
+            _, _, w, h = target.box
+            self.last_face_size = (w, h)
+            # Hedef kişi değişti → eski kişinin hızıyla tahmin yapma
+            if target.id != self.last_target_id:
+                self.estimator.reset()
+                self.last_target_id = target.id
+            # Tahmine ekle, servo hareketinin gerçekleşeceği ana göre hedefle
+            self.estimator.update(*target.center, t)
+            center = self.estimator.predict(now + cfg.PREDICT_LATENCY)
+        else:
+            # Yüz yok → kısa kayıpta tahminle takibe devam, uzarsa tahmini sıfırla
+            center = self.estimator.coast(now, ahead=cfg.PREDICT_LATENCY)
+        return tracks, target, center
+
+    def percept(self, target, center, t):
+        """Behaviour'a verilecek Percept: ekran merkezine hata ve yeni aday var mı."""
+        error = None
+        if center is not None:
+            # Ekran merkezine hata: sağ +, sol -; aşağı +, yukarı -
+            error = (center[0] - self.cfg.WIDTH // 2, center[1] - self.cfg.HEIGHT // 2)
+        candidates = any(not tr.confirmed and tr.last_seen == t for tr in self.people.tracks)
+        return Percept(target, center, candidates, error)
+
+    def retune(self):
+        """Hot reload: değişen track / tahmin ayarlarını çalışan nesnelere uygular."""
+        self.people.iou_threshold = self.cfg.TRACK_IOU_THRESHOLD
+        self.people.min_hits = self.cfg.TRACK_MIN_HITS
+        self.people.max_age = self.cfg.TRACK_MAX_AGE
+        if hasattr(self.estimator, "max_coast"):
+            self.estimator.max_coast = self.cfg.MAX_COAST
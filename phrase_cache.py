@@ -0,0 +1,212 @@
+import hashlib
+import io
+import json
+import os
+import shutil
+import subprocess
+
+import numpy as np
+
+from audio_engine import DEFAULT_RATE, load_wav, write_wav
+
+# ---------- TTS PHRASE CACHE ----------
+# Cümle → içerik hash'li WAV dosyası. Manifest (cache klasöründe manifest.json)
+# hangi cümlenin hangi backend / dil ile hangi dosyaya sentezlendiğini tutar.
+# Sentez sadece batch aşamasında (evde, internet varken) yapılır; robot sahada
+# sadece cache'teki hazır PCM WAV'ları çalar.
+#
+# Backend'ler:
+#   "gtts":   Google TTS (pip install gTTS + ffmpeg, internet gerekir), MP3 → PCM
+#   "espeak": espeak-ng (offline, apt install espeak-ng)
+#   "tone":   sentetik "konuşma" (offline, bağımlılıksız; test için)
+
+CACHE_DIR = "tts_cache"
+MANIFEST_NAME = "manifest.json"
+
+
+def phrase_key(text, backend, lang, rate):
+    """Cümle + sentez ayarlarından kısa içerik hash'i (dosya adı)."""
+    raw = json.dumps([text.strip(), backend, lang, rate], ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def load_phrases(path):
+    """Satır başına bir cümle; boş satırlar ve # ile başlayanlar atlanır."""
+    phrases = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                phrases.append(line)
+    return phrases
+
+
+# ---------- BACKENDS ----------
+# synthesize(text, lang, rate) → int16 mono sample'lar (rate'te)
+
+def decode_audio(data, rate):
+    """Herhangi bir ses formatını (MP3 vb.) ffmpeg ile int16 mono PCM'e çevirir."""
+    if shutil.which("ffmpeg") is None:
+        raise RuntimeError("ffmpeg bulunamadı (apt install ffmpeg)")
+    proc = subprocess.run(
+        ["ffmpeg", "-loglevel", "error", "-i", "pipe:0",
+         "-f", "s16le", "-ac", "1", "-ar", str(rate), "pipe:1"],
+        input=data,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=True,
+    )
+    return np.frombuffer(proc.stdout, dtype="<i2").copy()
+
+
+class GTTSBackend:
+    name = "gtts"
+
+    def __init__(self, tld="com"):
+        from gtts import gTTS
+
+        self._gTTS = gTTS
+        self.tld = tld
+
+    def synthesize(self, text, lang, rate):
+        buf = io.BytesIO()
+        self._gTTS(text, lang=lang, tld=self.tld).write_to_fp(buf)
+        return decode_audio(buf.getvalue(), rate)
+
+
+class EspeakBackend:
+    name = "espeak"
+
+    def __init__(self, speed=150):
+        self.binary = shutil.which("espeak-ng") or shutil.which("espeak")
+        if self.binary is None:
+            raise RuntimeError("espeak-ng bulunamadı (apt install espeak-ng)")
+        self.speed = speed
+
+    def synthesize(self, text, lang, rate):
+        proc = subprocess.run(
+            [self.binary, "--stdout", "-v", lang, "-s", str(self.speed), text],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+        samples, _ = load_wav(io.BytesIO(proc.stdout), rate)
+        return samples
+
+
+class ToneBackend:
+    """Kelime başına bir "hece" tonu: metne göre deterministik, uzunluğu metinle orantılı.
+    Pipeline'ı (cache, lip-sync, çalma) ağ ve TTS motoru olmadan denemek için."""
+
+    name = "tone"
+
+    def synthesize(self, text, lang, rate):
+        words = text.split() or [text]
+        seed = int(hashlib.sha1(text.encode("utf-8")).hexdigest()[:8], 16)
+        rng = np.random.default_rng(seed)
+
+        parts = []
+        for word in words:
+            dur = 0.08 + 0.06 * len(word)
+            t = np.arange(int(dur * rate)) / rate
+            freq = rng.uniform(140, 260)
+            shape = np.sin(np.pi * t / dur) ** 0.5   # yumuşak açılıp kapanan hece
+            parts.append(0.5 * shape * np.sin(2 * np.pi * freq * t))
+            parts.append(np.zeros(int(0.06 * rate)))  # kelime arası sessizlik
+
+        audio = np.concatenate(parts)
+        return (audio * 32767).astype(np.int16)
+
+
+BACKENDS = {
+    "gtts": GTTSBackend,
+    "espeak": EspeakBackend,
+    "tone": ToneBackend,
+}
+
+
+def create_tts_backend(name="gtts", **params):
+    if name not in BACKENDS:
+        raise ValueError(f"Bilinmeyen TTS backend: {name} (seçenekler: {', '.join(BACKENDS)})")
+    return BACKENDS[name](**params)
+
+
+# ---------- CACHE ----------
+
+class PhraseCache:
+    def __init__(self, directory=CACHE_DIR, rate=DEFAULT_RATE):
+        self.directory = directory
+        self.rate = rate
+        self.manifest_path = os.path.join(directory, MANIFEST_NAME)
+        self.entries = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding="utf-8") as f:
+                self.entries = json.load(f).get("entries", {})
+
+    def _save_manifest(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"rate": self.rate, "entries": self.entries}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.manifest_path)
+
+    def _find(self, text, backend, lang):
+        key = phrase_key(text, backend, lang, self.rate)
+        entry = self.entries.get(key)
+        if entry is None:
+            return key, None
+        path = os.path.join(self.directory, entry["file"])
+        return key, path if os.path.exists(path) else None
+
+    def path(self, text, backend="gtts", lang="en"):
+        """Cache'teki WAV'ın yolu, yoksa None. Runtime'da sentez yapılmaz."""
+        return self._find(text, backend, lang)[1]
+
+    def files(self, phrases, backend="gtts", lang="en"):
+        """Cache'te olan cümlelerin WAV yolları (sırayla); eksikler uyarıyla atlanır."""
+        paths = []
+        for text in phrases:
+            path = self.path(text, backend, lang)
+            if path is None:
+                print(f"TTS cache'te yok, atlanıyor: {text!r}")
+            else:
+                paths.append(path)
+        return paths
+
+    def missing(self, phrases, backend="gtts", lang="en"):
+        return [text for text in phrases if self.path(text, backend, lang) is None]
+
+    def build(self, phrases, backend, lang="en"):
+        """Eksik cümleleri sentezler. backend: create_tts_backend() nesnesi.
+        (üretilen, hata veren) sayısını döndürür."""
+        made, failed = 0, 0
+        for text in phrases:
+            key, path = self._find(text, backend.name, lang)
+            if path is not None:
+                continue
+            filename = key + ".wav"
+            target = os.path.join(self.directory, filename)
+            try:
+                samples = backend.synthesize(text, lang, self.rate)
+            except Exception as e:
+                print(f"Sentez hatası ({backend.name}): {text!r}:", e)
+                failed += 1
+                continue
+
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = target + ".tmp"
+            write_wav(tmp, samples, self.rate)
+            os.replace(tmp, target)
+
+            self.entries[key] = {
+                "text": text,
+                "backend": backend.name,
+                "lang": lang,
+                "file": filename,
+                "duration": round(len(samples) / float(self.rate), 3),
+            }
+            # Her cümleden sonra kaydet: yarıda kesilen batch baştan başlamasın
+            self._save_manifest()
+            made += 1
+            print(f"+ {filename} ({self.entries[key]['duration']:.2f} sn): {text}")
+        return made, failed
@@ -0,0 +1,69 @@
+import cv2
+import numpy as np
+
+# ---------- IMAGE PYRAMID ----------
+# Her framede cv2.resize yeni bir array ayırmasın diye gri ton ve küçültülmüş
+# seviyeler önceden ayrılmış buffer'larda tutulur (dst= ile üstüne yazılır).
+
+
+class ImagePyramid:
+    """Gri frame + birkaç ölçekte küçültülmüş kopyası, frame'den frame'e yeniden kullanılır.
+
+    Seviyeler tembel hesaplanır: o framede level(scale) istenmezse resize yapılmaz.
+    Listede olmayan bir ölçek istenirse bir kere ayrılıp eklenir (runtime'da ölçek değişebilir).
+    """
+
+    def __init__(self, scales=(1.0, 0.5), interpolation=cv2.INTER_AREA):
+        self.scales = sorted(set(scales), reverse=True)
+        self.interpolation = interpolation
+        self.gray = None
+        self._shape = None
+        self._buffers = {}
+        self._fresh = set()
+
+    def _ensure(self, height, width):
+        if self._shape == (height, width):
+            return
+        # Çözünürlük değişti (ilk frame ya da kamera başka boyut verdi) → yeniden ayır
+        self._shape = (height, width)
+        self.gray = np.empty((height, width), dtype=np.uint8)
+        self._buffers = {}
+        for scale in self.scales:
+            if scale != 1.0:
+                self._alloc(scale)
+
+    def _alloc(self, scale):
+        h, w = self._shape
+        size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+        self._buffers[scale] = np.empty((size[1], size[0]), dtype=np.uint8)
+
+    def update_bgr(self, frame):
+        """BGR frame'i gri buffer'a çevirir ve seviyeleri geçersiz kılar. Gri frame'i döndürür."""
+        h, w = frame.shape[:2]
+        self._ensure(h, w)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self.gray)
+        self._fresh.clear()
+        return self.gray
+
+    def update(self, gray):
+        """Hazır gri frame'i taban seviye olarak kopyalar."""
+        h, w = gray.shape[:2]
+        self._ensure(h, w)
+        np.copyto(self.gray, gray)
+        self._fresh.clear()
+        return self.gray
+
+    def level(self, scale):
+        """scale oranında küçültülmüş gri frame (1.0 = taban)."""
+        if scale == 1.0:
+            return self.gray
+        if scale not in self._buffers:
+            self.scales = sorted(set(self.scales) | {scale}, reverse=True)
+            self._alloc(scale)
+
+        buf = self._buffers[scale]
+        if scale not in self._fresh:
+            cv2.resize(self.gray, (buf.shape[1], buf.shape[0]), dst=buf,
+                       interpolation=self.interpolation)
+            self._fresh.add(scale)
+        return buf
@@ -0,0 +1,59 @@
+import numpy as np
+
+# ---------- ROI-RESTRICTED SEARCH ----------
+# Bir önceki framede yüz varsa tüm frame yerine sadece onun çevresine bakılır.
+# Üstteki ignore bandı (flamalar) baştan arama alanının dışında tutulur.
+
+
+def full_region(width, height, top_ignore_y=0):
+    """Tam frame arama alanı (x0, y0, x1, y1), üst bant hariç."""
+    return (0, max(0, top_ignore_y), width, height)
+
+
+def search_region(center, face_size, width, height, expand=1.5, top_ignore_y=0):
+    """center çevresinde, yüz boyutunun expand katı pay bırakan arama alanı.
+
+    center: (cx, cy) yumuşatılmış yüz merkezi, face_size: (w, h) son yüz boyutu.
+    """
+    cx, cy = center
+    w, h = face_size
+    half_w = int(w * (0.5 + expand))
+    half_h = int(h * (0.5 + expand))
+
+    x0 = max(0, cx - half_w)
+    y0 = max(0, top_ignore_y, cy - half_h)
+    x1 = min(width, cx + half_w)
+    y1 = min(height, cy + half_h)
+    return (x0, y0, x1, y1)
+
+
+def detect_in_region(detector, image, region, scale=1.0, min_size=(40, 40), max_size=None):
+    """region içinde detector'ı çalıştırır, kutuları tam frame koordinatında döndürür.
+
+    image: frame'in scale oranında küçültülmüş hali (örn. ImagePyramid.level(scale)).
+    region, min_size, max_size tam frame koordinatında verilir.
+    Dönüş: float32 (N, 5) array [x, y, w, h, score].
+    """
+    x0, y0, x1, y1 = region
+    sx0, sy0 = int(x0 * scale), int(y0 * scale)
+    roi = image[sy0:int(y1 * scale), sx0:int(x1 * scale)]
+
+    min_w = int(min_size[0] * scale)
+    min_h = int(min_size[1] * scale)
+    if roi.shape[0] < min_h or roi.shape[1] < min_w:
+        return np.empty((0, 5), dtype=np.float32)
+
+    scaled_max = None
+    if max_size is not None:
+        scaled_max = (int(max_size[0] * scale), int(max_size[1] * scale))
+
+    boxes = detector.detect(roi, min_size=(min_w, min_h), max_size=scaled_max)
+    if len(boxes) == 0:
+        return boxes
+
+    boxes = boxes.copy()
+    boxes[:, 0] += sx0
+    boxes[:, 1] += sy0
+    if scale != 1.0:
+        boxes[:, :4] /= scale
+    return boxes
@@ -0,0 +1,182 @@
+import struct
+import threading
+import time
+
+# ---------- SERVO DRIVER ----------
+# Script'ler kit.servo[ch].angle'a doğrudan yazmak yerine bu katmanı kullanır:
+#  - değişmeyen açılar tekrar yazılmaz (I2C yazımı Pi'de bloklayıcı ve yavaş)
+#  - aynı tick'teki kanallar tek seferde yazılır (PCA9685'te ardışık kanallar tek I2C transaction)
+#  - "sim" backend donanımsız test için açı / zaman geçmişini tutar
+#  - her yazımdan servonun ne zaman varacağı tahmin edilir (settle_remaining): açılışta
+#    sabit bir sleep yerine sadece kalan süre beklenir
+
+DEFAULT_MIN_PULSE = 500
+DEFAULT_MAX_PULSE = 2500
+DEFAULT_ACTUATION_RANGE = 180
+
+# Yüklü bir MG996R ~0.2 s / 60°; başlangıç açısı bilinmiyorsa en kötü mesafe varsayılır
+DEFAULT_SETTLE_SPEED = 250.0   # derece / saniye
+SETTLE_MARGIN = 0.1            # saniye, titreşimin sönmesi için
+
+
+class ServoDriver:
+    """Backend'lerin ortak kısmı: kanal ayarları ve tekrar eden yazımların elenmesi."""
+
+    name = "base"
+
+    def __init__(self):
+        self._ranges = {}
+        self._last = {}
+        self._lock = threading.Lock()
+        self.writes = 0        # backend'e giden kanal yazımı
+        self.skipped = 0       # aynı açı olduğu için atlanan
+        self.transactions = 0  # backend'e giden toplu yazım sayısı
+        self.settle_speed = DEFAULT_SETTLE_SPEED
+        self._settle_until = 0.0
+
+    def setup(self, ch, min_pulse=DEFAULT_MIN_PULSE, max_pulse=DEFAULT_MAX_PULSE,
+              actuation_range=DEFAULT_ACTUATION_RANGE):
+        self._ranges[ch] = (min_pulse, max_pulse, actuation_range)
+        self._last.pop(ch, None)
+
+    def angle(self, ch):
+        """Kanala en son yazılan açı (hiç yazılmadıysa None)."""
+        return self._last.get(ch)
+
+    def set_angle(self, ch, angle):
+        self.set_angles({ch: angle})
+
+    def set_angles(self, angles):
+        """{kanal: açı} yazar. Değişmeyenleri atlar, kalanları tek batch'te gönderir."""
+        with self._lock:
+            changed = {}
+            for ch, angle in angles.items():
+                if ch not in self._ranges:
+                    self.setup(ch)
+                angle = max(0.0, min(float(self._ranges[ch][2]), float(angle)))
+                if self._last.get(ch) == angle:
+                    self.skipped += 1
+                    continue
+                changed[ch] = angle
+
+            if not changed:
+                return
+            self._write(changed)
+            self._track_settle(changed)
+            self._last.update(changed)
+            self.writes += len(changed)
+            self.transactions += 1
+
+    def _track_settle(self, angles):
+        travel = 0.0
+        for ch, angle in angles.items():
+            last = self._last.get(ch)
+            if last is None:
+                last = 0.0 if angle > self._ranges[ch][2] / 2 else float(self._ranges[ch][2])
+            travel = max(travel, abs(angle - last))
+        until = time.monotonic() + travel / self.settle_speed + SETTLE_MARGIN
+        self._settle_until = max(self._settle_until, until)
+
+    def settle_remaining(self):
+        """Son yazılan açılara varılması için tahmini kalan süre (saniye, 0 = durdu)."""
+        return max(0.0, self._settle_until - time.monotonic())
+
+    def _write(self, angles):
+        raise NotImplementedError
+
+    def release(self):
+        pass
+
+
+class PCA9685Driver(ServoDriver):
+    """Gerçek donanım: Adafruit PCA9685 (ServoKit'in kullandığı kart).
+
+    Açı → 12-bit PWM sayacı hesabı adafruit_motor.servo ile aynı. Ardışık kanallar
+    (ör. NECK_TILT_CH=0, NECK_YAW_CH=1) register auto-increment ile tek yazımda gider.
+    """
+
+    name = "pca9685"
+
+    LED0_ON_L = 0x06
+
+    def __init__(self, frequency=50, address=0x40):
+        super().__init__()
+        # Donanım kütüphaneleri sadece gerçek backend kullanılınca yüklensin
+        import board
+        from adafruit_pca9685 import PCA9685
+
+        self.pca = PCA9685(board.I2C(), address=address)
+        # frequency setter MODE1'de auto-increment'i de açar
+        self.pca.frequency = frequency
+        self._frequency = self.pca.frequency
+        self._last_counts = {}
+
+    def _off_count(self, ch, angle):
+        min_pulse, max_pulse, actuation_range = self._ranges[ch]
+        min_duty = int((min_pulse * self._frequency) / 1000000 * 0xFFFF)
+        max_duty = (max_pulse * self._frequency) / 1000000 * 0xFFFF
+        duty = min_duty + int((angle / actuation_range) * int(max_duty - min_duty))
+        return (duty + 1) >> 4
+
+    def _write(self, angles):
+        counts = {}
+        for ch, angle in angles.items():
+            count = self._off_count(ch, angle)
+            # Farklı açı ama aynı 12-bit değer → register'a yazmaya gerek yok
+            if self._last_counts.get(ch) != count:
+                counts[ch] = count
+        if not counts:
+            return
+
+        # Ardışık kanal gruplarını tek transaction'da yaz
+        channels = sorted(counts)
+        runs = [[channels[0]]]
+        for ch in channels[1:]:
+            if ch == runs[-1][-1] + 1:
+                runs[-1].append(ch)
+            else:
+                runs.append([ch])
+
+        with self.pca.i2c_device as i2c:
+            for run in runs:
+                buf = bytearray([self.LED0_ON_L + 4 * run[0]])
+                for ch in run:
+                    buf += struct.pack("<HH", 0, counts[ch])
+                i2c.write(buf)
+        self._last_counts.update(counts)
+
+
+class SimServoDriver(ServoDriver):
+    """Donanımsız backend: yazılan her açıyı zaman damgasıyla kaydeder."""
+
+    name = "sim"
+
+    def __init__(self, clock=time.monotonic, verbose=False):
+        super().__init__()
+        self.clock = clock
+        self.verbose = verbose
+        self.history = []   # [(t, ch, angle), ...]
+
+    def _write(self, angles):
+        t = self.clock()
+        for ch, angle in angles.items():
+            self.history.append((t, ch, angle))
+            if self.verbose:
+                print(f"[sim servo] t={t:.3f} ch={ch} angle={angle:.1f}")
+
+    def trace(self, ch):
+        """Bir kanalın [(t, angle), ...] geçmişi."""
+        return [(t, a) for (t, c, a) in self.history if c == ch]
+
+
+BACKENDS = {
+    "pca9685": PCA9685Driver,
+    "sim": SimServoDriver,
+}
+
+
+def create_servo_driver(backend="pca9685", **params):
+    """Config'teki isimle servo driver oluşturur: "pca9685" ya da "sim"."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Bilinmeyen servo backend: {backend} (seçenekler: {', '.join(BACKENDS)})")
+    return BACKENDS[backend](**params)
@@ -1,6 +1,8 @@
-from adafruit_servokit import ServoKit
 import time
 
+from config import load_config
+from servo_driver import create_servo_driver
+
 # ---------- AYARLAR ----------
 SERVO_CHANNEL = 15   # hangi kanalı test etmek istiyorsan burayı değiştir
 MIN_ANGLE = 85      # önce ÇOK DAR bir aralıktan başlıyoruz
@@ -8,8 +10,10 @@ MAX_ANGLE = 95
 STEP = 1            # her adımda kaç derece oynasın
 DELAY = 0.2         # hareket arası bekleme süresi (saniye)
 
-kit = ServoKit(channels=16)
-kit.servo[SERVO_CHANNEL].set_pulse_width_range(500, 2500)
+SERVO_BACKEND = load_config().SERVO_BACKEND   # donanımsız denemek için PIAGET_SERVO_BACKEND=sim
+
+servos = create_servo_driver(SERVO_BACKEND)
+servos.setup(SERVO_CHANNEL, 500, 2500)
 
 def clamp(val, lo, hi):
     return max(lo, min(hi, val))
@@ -22,7 +26,7 @@ def main():
 
     angle = (MIN_ANGLE + MAX_ANGLE) / 2
     angle = clamp(angle, MIN_ANGLE, MAX_ANGLE)
-    kit.servo[SERVO_CHANNEL].angle = angle
+    servos.set_angle(SERVO_CHANNEL, angle)
     time.sleep(1)
 
     direction = 1
@@ -37,14 +41,14 @@ def main():
                 angle = MIN_ANGLE
                 direction = 1
 
-            kit.servo[SERVO_CHANNEL].angle = angle
+            servos.set_angle(SERVO_CHANNEL, angle)
             print(f"Açı: {angle:.1f}°")
             time.sleep(DELAY)
 
     except KeyboardInterrupt:
         print("\nDurduruldu. Son açı:", angle)
         # İstersen sonunda belli bir açıda bırak:
-        # kit.servo[SERVO_CHANNEL].angle = (MIN_ANGLE + MAX_ANGLE) / 2
+        # servos.set_angle(SERVO_CHANNEL, (MIN_ANGLE + MAX_ANGLE) / 2)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,212 @@
+import argparse
+import json
+import os
+import queue
+import struct
+import threading
+
+import cv2
+import numpy as np
+
+# ---------- SESSION RECORD / REPLAY ----------
+# Bir takip oturumunu klasöre kaydeder:
+#   meta.json      çözünürlük + o anki ayarlar
+#   session.jsonl  frame başına bir satır: {"t", "faces": [[x, y, w, h], ...], "yaw", "tilt", ...}
+#                  (track_replay_test.py'nin detection log formatıyla aynı, doğrudan okunur)
+#   frames.bin     JPEG frame'ler, her biri 4 byte uzunluk + veri
+#
+# Kayıt: JPEG encode ve disk yazımı ayrı thread'de, döngü sadece frame'i kopyalar.
+# Oynatma: FRAME_SOURCE olarak oturum klasörü verilir (python face_track.py sessions/xyz).
+# SessionSource frame'leri beklemeden, kayıttaki zaman damgalarıyla verir; face_track
+# sim servo ve kayıttaki saatle çalışır, aynı kayıt hep aynı servo komutlarını üretir.
+#
+#   python session.py info sessions/xyz
+#   python session.py diff sessions/xyz sessions/xyz_replay
+
+RECORDS_NAME = "session.jsonl"
+FRAMES_NAME = "frames.bin"
+META_NAME = "meta.json"
+
+
+def is_session(path):
+    return isinstance(path, str) and os.path.isfile(os.path.join(path, RECORDS_NAME))
+
+
+def load_records(directory):
+    records = []
+    with open(os.path.join(directory, RECORDS_NAME)) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+    return records
+
+
+def load_meta(directory):
+    path = os.path.join(directory, META_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _jsonable(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (np.integer, np.floating)):
+        return value.item()
+    if isinstance(value, tuple):
+        return list(value)
+    return value
+
+
+class SessionRecorder:
+    """record(t, frame, faces, **state): frame başına bir kayıt. Bloklamaz; writer
+    yetişemezse (kuyruk dolu) frame atlanır ve dropped artar."""
+
+    def __init__(self, directory, meta=None, jpeg_quality=85, queue_size=30):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.jpeg_quality = jpeg_quality
+        self.recorded = 0
+        self.dropped = 0
+
+        with open(os.path.join(directory, META_NAME), "w") as f:
+            json.dump(meta or {}, f, indent=2, default=_jsonable)
+
+        self._records = open(os.path.join(directory, RECORDS_NAME), "w")
+        self._frames = open(os.path.join(directory, FRAMES_NAME), "wb")
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="SessionRecorder", daemon=True)
+        self._thread.start()
+
+    def record(self, t, frame, faces, **state):
+        rec = {"t": t, "faces": [[int(v) for v in f[:4]] for f in faces]}
+        rec.update({k: _jsonable(v) for k, v in state.items()})
+        try:
+            self._queue.put_nowait((rec, frame.copy()))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            rec, frame = item
+            ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+            if not ok:
+                continue
+            data = buf.tobytes()
+            rec["frame"] = self.recorded
+            self._frames.write(struct.pack("<I", len(data)))
+            self._frames.write(data)
+            self._records.write(json.dumps(rec) + "\n")
+            self.recorded += 1
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(timeout=5.0)
+        self._records.close()
+        self._frames.close()
+        print(f"Session: {self.recorded} frame kaydedildi ({self.dropped} atlandı) → {self.directory}")
+
+
+class SessionSource:
+    """Kaydedilmiş oturumu frame kaynağı olarak verir (capture.py kaynaklarıyla aynı arayüz).
+
+    clock(): son okunan frame'in kayıttaki zamanı. Replay'de time.time() yerine kullanılır.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.meta = load_meta(directory)
+        self.records = load_records(directory)
+        self._frames = open(os.path.join(directory, FRAMES_NAME), "rb")
+        self.index = -1
+        self.time = self.records[0]["t"] if self.records else 0.0
+        self.dropped = 0   # FrameGrabber ile aynı sayaçlar; replay'de frame atlanmaz
+
+    @property
+    def captured(self):
+        return self.index + 1
+
+    def isOpened(self):
+        return len(self.records) > 0
+
+    def clock(self):
+        return self.time
+
+    def read(self, image=None):
+        header = self._frames.read(4)
+        if len(header) < 4 or self.index + 1 >= len(self.records):
+            return False, None
+        (size,) = struct.unpack("<I", header)
+        data = np.frombuffer(self._frames.read(size), dtype=np.uint8)
+        frame = cv2.imdecode(data, cv2.IMREAD_COLOR)
+
+        self.index += 1
+        self.time = self.records[self.index]["t"]
+        return frame is not None, frame
+
+    def record(self):
+        """Son okunan frame'in kayıttaki satırı."""
+        return self.records[self.index] if self.index >= 0 else None
+
+    def release(self):
+        self._frames.close()
+
+
+def diff_sessions(a, b, channels=("yaw", "tilt")):
+    """İki oturumu frame frame karşılaştırır (ör. kayıt vs replay, eski vs yeni ayar)."""
+    n = min(len(a), len(b))
+    face_mismatch = sum(1 for i in range(n) if len(a[i]["faces"]) != len(b[i]["faces"]))
+    result = {"frames": n, "length_a": len(a), "length_b": len(b), "face_count_mismatch": face_mismatch}
+
+    for key in channels:
+        va = np.array([r.get(key, np.nan) for r in a[:n]], dtype=np.float64)
+        vb = np.array([r.get(key, np.nan) for r in b[:n]], dtype=np.float64)
+        d = np.abs(va - vb)
+        d = d[~np.isnan(d)]
+        result[key] = {
+            "max_diff": float(d.max()) if len(d) else 0.0,
+            "mean_diff": float(d.mean()) if len(d) else 0.0,
+            "first_diff_frame": int(np.argmax(d > 1e-6)) if np.any(d > 1e-6) else None,
+        }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kaydedilmiş takip oturumları")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_info = sub.add_parser("info", help="oturum özeti")
+    p_info.add_argument("session")
+    p_diff = sub.add_parser("diff", help="iki oturumun servo komutlarını / detection'larını karşılaştır")
+    p_diff.add_argument("a")
+    p_diff.add_argument("b")
+    args = parser.parse_args()
+
+    if args.cmd == "info":
+        records = load_records(args.session)
+        meta = load_meta(args.session)
+        if not records:
+            print("Boş oturum.")
+            return
+        duration = records[-1]["t"] - records[0]["t"]
+        with_face = sum(1 for r in records if r["faces"])
+        print(f"{len(records)} frame, {duration:.1f} sn ({len(records) / max(duration, 1e-6):.1f} FPS)")
+        print(f"Yüz görülen frame: {with_face} (%{100.0 * with_face / len(records):.0f})")
+        if meta:
+            print("Ayarlar:", json.dumps(meta, ensure_ascii=False))
+        return
+
+    result = diff_sessions(load_records(args.a), load_records(args.b))
+    print(json.dumps(result, indent=2))
+    same = all(result[k]["first_diff_frame"] is None for k in ("yaw", "tilt"))
+    same = same and result["face_count_mismatch"] == 0 and result["length_a"] == result["length_b"]
+    print("AYNI" if same else "FARKLI")
+    raise SystemExit(0 if same else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# ---------- PARALLEL STARTUP ----------
+# Kamera açmak, servo kartını (I2C) başlatmak, detector modelini parse etmek ve sesleri
+# yüklemek birbirini beklemez: hepsi açılışta ayrı thread'lerde başlar, sonucu
+# gerektiği yerde alınır. Servolar merkeze giderken sabit time.sleep(1) yerine
+# driver'ın tahmini varış süresi (settle) kadar, o da sadece kalan kısmı beklenir.
+#
+#   startup = Startup()
+#   startup.start("camera", open_source, FRAME_SOURCE, WIDTH, HEIGHT)
+#   startup.start("detector", create_detector, "haar", path=...)
+#   ...
+#   cap = startup.result("camera")            # hazır değilse burada bekler
+#   startup.wait_settled(servos)
+#   print(startup.report())
+#
+# Fork eden şeyler (DetectionPool) startup.close()'tan sonra oluşturulmalı.
+
+
+class Startup:
+    def __init__(self, workers=4, clock=time.perf_counter):
+        self.clock = clock
+        self.started = clock()
+        self.timings = {}        # iş → süre (saniye)
+        self.waits = {}          # iş → ana thread'in sonucu beklediği süre
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="startup")
+        self._jobs = {}
+
+    def _timed(self, name, fn, args, kwargs):
+        t0 = self.clock()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.timings[name] = self.clock() - t0
+
+    def start(self, name, fn, *args, **kwargs):
+        """fn(*args, **kwargs)'i arka planda başlatır."""
+        self._jobs[name] = self._pool.submit(self._timed, name, fn, args, kwargs)
+
+    def result(self, name):
+        """İşin sonucu (bitmediyse bekler; iş hata verdiyse hatayı burada fırlatır)."""
+        t0 = self.clock()
+        try:
+            return self._jobs[name].result()
+        finally:
+            self.waits[name] = self.waits.get(name, 0.0) + self.clock() - t0
+
+    def step(self, name, fn, *args, **kwargs):
+        """Ana thread'de sırayla çalışan bir adımı ölçer."""
+        return self._timed(name, fn, args, kwargs)
+
+    def wait_settled(self, driver):
+        """Servoların son komuta varması için kalan süre kadar bekler."""
+        remaining = driver.settle_remaining()
+        if remaining > 0:
+            time.sleep(remaining)
+        self.timings["settle"] = remaining
+
+    def close(self):
+        """Bitmemiş işleri bekler, thread'leri kapatır."""
+        self._pool.shutdown(wait=True)
+
+    @property
+    def elapsed(self):
+        return self.clock() - self.started
+
+    def report(self):
+        jobs = ", ".join(f"{name} {1000 * t:.0f} ms" for name, t in self.timings.items())
+        waited = sum(self.waits.values())
+        return f"Açılış {self.elapsed:.2f} s ({jobs}; sonuç bekleme {1000 * waited:.0f} ms)"
@@ -0,0 +1,129 @@
+import argparse
+import json
+import time
+
+import numpy as np
+
+from multi_track import MultiFaceTracker
+
+# ---------- MULTI-FACE TRACK REPLAY ----------
+# Kayıtlı detection log'unu (JSONL, satır başına {"t": ..., "faces": [[x, y, w, h], ...]})
+# MultiFaceTracker'dan geçirir: ID sayısı, hedef değişimi ve update maliyeti.
+# Log verilmezse sentetik bir sahne (karşıdan karşıya geçen iki kişi + 12 kişilik grup)
+# üretir ve ID'lerin sabit kaldığını kontrol eder.
+
+
+def load_log(path):
+    frames = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            rec = json.loads(line)
+            faces = np.asarray(rec.get("faces", []), dtype=np.float32).reshape(-1, 4)
+            frames.append((rec["t"], faces, None))
+    return frames
+
+
+def synthetic_log(fps=30):
+    """(t, faces, gt_ids) listesi. gt_ids: her kutunun gerçek kişi numarası."""
+    frames = []
+    rng = np.random.default_rng(0)
+    for i in range(int(6 * fps)):
+        t = i / fps
+        faces, ids = [], []
+
+        # A (büyük, hedef olmalı) soldan sağa, B sağdan sola; t≈1.5'te kesişiyorlar
+        if t < 3.0:
+            ax = 40 + 60 * t
+            bx = 220 - 60 * t
+            faces.append([ax, 100, 60, 60])
+            ids.append(0)
+            # B arada bir kaçırılıyor
+            if i % 7 != 0:
+                faces.append([bx, 120, 45, 45])
+                ids.append(1)
+
+        # A ve B çıktıktan (ve track'leri öldükten) sonra 12 kişilik okul grubu, hafif titreme ile
+        if 4.2 <= t < 6.0:
+            for k in range(12):
+                gx = 10 + (k % 6) * 50 + rng.normal(0, 1.5)
+                gy = 60 + (k // 6) * 80 + rng.normal(0, 1.5)
+                faces.append([gx, gy, 40, 40])
+                ids.append(10 + k)
+
+        frames.append((t, np.asarray(faces, dtype=np.float32).reshape(-1, 4), ids))
+    return frames
+
+
+def replay(frames, tracker):
+    costs = []
+    target_ids = []
+    gt_to_track = {}
+    track_to_gt = {}
+    id_switches = 0
+
+    for t, faces, gt_ids in frames:
+        t0 = time.perf_counter()
+        tracker.update(faces, t)
+        costs.append(time.perf_counter() - t0)
+        target_ids.append(tracker.target.id if tracker.target is not None else None)
+
+        if gt_ids is None:
+            continue
+        # Her detection'ın hangi track'e gittiğini bul (kutusu aynı olan track)
+        for box, gt in zip(faces, gt_ids):
+            box = tuple(int(v) for v in box)
+            for tr in tracker.tracks:
+                if tr.box == box and tr.last_seen == t:
+                    # Kişinin track'i değişti ya da track başka kişiye geçti
+                    if gt in gt_to_track and gt_to_track[gt] != tr.id:
+                        id_switches += 1
+                    if tr.id in track_to_gt and track_to_gt[tr.id] != gt:
+                        id_switches += 1
+                    gt_to_track[gt] = tr.id
+                    track_to_gt[tr.id] = gt
+                    break
+
+    costs = np.asarray(costs) * 1000
+    return {
+        "frames": len(frames),
+        "tracks_created": tracker._next_id - 1,
+        "target_switches": tracker.target_switches,
+        "id_switches": id_switches if frames and frames[0][2] is not None else None,
+        "mean_ms": float(costs.mean()) if len(costs) else 0.0,
+        "max_ms": float(costs.max()) if len(costs) else 0.0,
+        "target_ids": target_ids,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MultiFaceTracker replay testi")
+    parser.add_argument("log", nargs="?", help="detection log (JSONL); verilmezse sentetik sahne")
+    args = parser.parse_args()
+
+    tracker = MultiFaceTracker()
+    frames = load_log(args.log) if args.log else synthetic_log()
+    result = replay(frames, tracker)
+
+    print(f"Frames: {result['frames']}")
+    print(f"Oluşan track: {result['tracks_created']}, hedef değişimi: {result['target_switches']}")
+    print(f"update maliyeti: ort {result['mean_ms']:.3f} ms, max {result['max_ms']:.3f} ms")
+
+    if args.log:
+        return
+
+    # Sentetik sahnede beklenen: 2 + 12 kişi, hiç ID değişimi yok,
+    # A kesişme boyunca hedef kalır (grup gelene kadar tek hedef)
+    print(f"ID değişimi: {result['id_switches']}")
+    first_target = result["target_ids"][5]
+    crossing_ok = all(tid == first_target for tid in result["target_ids"][5:int(3 * 30)])
+
+    ok = result["id_switches"] == 0 and result["tracks_created"] == 14 and crossing_ok
+    print("PASS" if ok else "FAIL")
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()